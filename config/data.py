@@ -1,4 +1,3 @@
-import json
 import os
 
 import gi
@@ -11,6 +10,7 @@ APP_NAME_CAP = "Ax-Shell"
 APP_NAME = APP_NAME_CAP.lower()
 
 CACHE_DIR = str(GLib.get_user_cache_dir()) + f"/{APP_NAME}"
+DATA_DIR = str(GLib.get_user_data_dir()) + f"/{APP_NAME}"
 
 USERNAME = os.getlogin()
 HOSTNAME = os.uname().nodename
@@ -26,32 +26,18 @@ CONFIG_FILE = get_relative_path("../config/config.json")
 MATUGEN_STATE_FILE = os.path.join(CONFIG_DIR, "matugen")
 
 
-def load_config():
-    """Load the configuration from config.json"""
-    config_path = os.path.expanduser(f"~/.config/{APP_NAME_CAP}/config/config.json")
-    config = {}
+# Import defaults from settings_constants to avoid duplication
+from .settings_constants import DEFAULTS
 
-    if os.path.exists(config_path):
-        try:
-            with open(config_path, "r") as f:
-                config = json.load(f)
-        except Exception as e:
-            print(f"Error loading config: {e}")
+# config.json is parsed once, by the service; it needs CONFIG_FILE above
+from services.config import ConfigService
 
-    return config
+_config_service = ConfigService.get_initial()
 
 
-# Import defaults from settings_constants to avoid duplication
-from .settings_constants import DEFAULTS
-
-# Load configuration once and use throughout the module
-config = {}
-if os.path.exists(CONFIG_FILE):
-    try:
-        with open(CONFIG_FILE, "r") as f:
-            config = json.load(f)
-    except Exception as e:
-        print(f"Error loading config file: {e}")
+def load_config():
+    """Return the current configuration, kept in memory and in sync with config.json"""
+    return _config_service.snapshot()
 
 
 def get_default(setting_str: str):
@@ -59,10 +45,12 @@ def get_default(setting_str: str):
 
 
 def _get_config_var(setting_str: str):
-    return config.get(setting_str, get_default(setting_str))
+    return _config_service.get(setting_str, get_default(setting_str))
 
 
-# Set configuration values using defaults from settings_constants
+# Set configuration values using defaults from settings_constants.
+# These are read once at startup; settings that can change at runtime should
+# be read through services.config.ConfigService instead.
 WALLPAPERS_DIR = _get_config_var("wallpapers_dir")
 BAR_POSITION = _get_config_var("bar_position")
 VERTICAL = BAR_POSITION in ["Left", "Right"]
@@ -104,3 +92,4 @@ BAR_METRICS_DISKS = _get_config_var("bar_metrics_disks")
 METRICS_VISIBLE = _get_config_var("metrics_visible")
 METRICS_SMALL_VISIBLE = _get_config_var("metrics_small_visible")
 SELECTED_MONITORS = _get_config_var("selected_monitors")
+NOTIFICATION_HISTORY_LIMIT = _get_config_var("notification_history_limit")
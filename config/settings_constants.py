@@ -99,5 +99,11 @@ DEFAULTS = {
     },
     "limited_apps_history": ["Spotify"],
     "history_ignored_apps": ["Hyprshot"],
+    "notification_rate_limits": {},
+    "notification_history_limit": 50,
+    "visualizer_max_fps": 60,
+    "visualizer_backend": "cava",
+    "visualizer_input": "",
     "selected_monitors": [],
+    "prewarm_modules": [],
 }
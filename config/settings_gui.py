@@ -852,6 +852,46 @@ class HyprConfGUI(Window):
         )
         notif_grid.attach(ignored_apps_hint, 0, 3, 2, 1)
 
+        # History retention
+        history_limit_label = Label(
+            label="History Size:", h_align="start", v_align="center"
+        )
+        notif_grid.attach(history_limit_label, 0, 4, 1, 1)
+        self.history_limit_scale = Scale(
+            min_value=10,
+            max_value=500,
+            value=get_bind_var("notification_history_limit"),
+            increments=(10, 50),
+            draw_value=True,
+            value_position="right",
+            digits=0,
+            h_expand=True,
+        )
+        notif_grid.attach(self.history_limit_scale, 1, 4, 1, 1)
+
+        # Per-app popup rate limits
+        rate_limits_label = Label(
+            label="Popup Rate Limits:", h_align="start", v_align="center"
+        )
+        notif_grid.attach(rate_limits_label, 0, 5, 1, 1)
+
+        rate_limits = get_bind_var("notification_rate_limits")
+        rate_limits_text = ", ".join(
+            f'"{app}": {limit}' for app, limit in rate_limits.items()
+        )
+        self.rate_limits_entry = Entry(
+            text=rate_limits_text,
+            tooltip_text='Enter app names with popups per minute, e.g: "Discord": 10, "Slack": 5',
+            h_expand=True,
+        )
+        notif_grid.attach(self.rate_limits_entry, 1, 5, 1, 1)
+
+        rate_limits_hint = Label(
+            markup='<small>Maximum popups per minute, extra notifications go straight to history (format: "App1": 10, "App2": 5)</small>',
+            h_align="start",
+        )
+        notif_grid.attach(rate_limits_hint, 0, 6, 2, 1)
+
         metrics_header = Label(markup="<b>System Metrics Options</b>", h_align="start")
         vbox.add(metrics_header)
         metrics_grid = Gtk.Grid(
@@ -1135,6 +1175,27 @@ class HyprConfGUI(Window):
         current_bind_vars_snapshot["history_ignored_apps"] = parse_app_list(
             self.ignored_apps_entry.get_text()
         )
+        current_bind_vars_snapshot["notification_history_limit"] = int(
+            self.history_limit_scale.value
+        )
+
+        def parse_rate_limits(text):
+            """Parse comma-separated "App": limit pairs"""
+            limits = {}
+            for item in text.split(","):
+                app, sep, limit = item.rpartition(":")
+                app = app.strip().strip("\"'")
+                if not sep or not app:
+                    continue
+                try:
+                    limits[app] = max(1, int(limit.strip()))
+                except ValueError:
+                    continue
+            return limits
+
+        current_bind_vars_snapshot["notification_rate_limits"] = parse_rate_limits(
+            self.rate_limits_entry.get_text()
+        )
 
         # Save monitor selection
         selected_monitors = []
@@ -1446,6 +1507,13 @@ class HyprConfGUI(Window):
             ignored_apps_list = get_default("history_ignored_apps")
             ignored_apps_text = ", ".join(f'"{app}"' for app in ignored_apps_list)
             self.ignored_apps_entry.set_text(ignored_apps_text)
+            self.history_limit_scale.set_value(
+                get_default("notification_history_limit")
+            )
+            rate_limits = get_default("notification_rate_limits")
+            self.rate_limits_entry.set_text(
+                ", ".join(f'"{app}": {limit}' for app, limit in rate_limits.items())
+            )
 
             # Reset monitor selection
             default_monitors = get_default("selected_monitors")
@@ -87,7 +87,7 @@ def ensure_matugen_config():
             f"{APP_NAME}": {
                 "input_path": f"~/.config/{APP_NAME_CAP}/config/matugen/templates/{APP_NAME}.css",
                 "output_path": f"~/.config/{APP_NAME_CAP}/styles/colors.css",
-                "post_hook": f"fabric-cli exec {APP_NAME} 'app.set_css()' &",
+                "post_hook": f"python -S ~/.config/{APP_NAME_CAP}/scripts/ax_send.py reload-css &",
             },
         },
     }
@@ -254,28 +254,28 @@ exec = uwsm app -- awww-daemon
 exec-once =  wl-paste --type text --watch cliphist store
 exec-once =  wl-paste --type image --watch cliphist store
 
-$fabricSend = fabric-cli exec {APP_NAME}
+$axSend = python -S {home}/.config/{APP_NAME_CAP}/scripts/ax_send.py
 $axMessage = notify-send "Axenide" "FIRE IN THE HOLE‼️🗣️🔥🕳️" -i "{home}/.config/{APP_NAME_CAP}/assets/ax.png" -A "🗣️" -A "🔥" -A "🕳️" -a "Source Code"
 
 bind = {get_bind_var("prefix_restart")}, {get_bind_var("suffix_restart")}, exec, killall {APP_NAME}; uwsm-app $(python {home}/.config/{APP_NAME_CAP}/main.py) # Reload {APP_NAME_CAP}
 bind = {get_bind_var("prefix_axmsg")}, {get_bind_var("suffix_axmsg")}, exec, $axMessage # Message
-bind = {get_bind_var("prefix_dash")}, {get_bind_var("suffix_dash")}, exec, $fabricSend 'notch.open_notch("dashboard")' # Dashboard
-bind = {get_bind_var("prefix_bluetooth")}, {get_bind_var("suffix_bluetooth")}, exec, $fabricSend 'notch.open_notch("bluetooth")' # Bluetooth
-bind = {get_bind_var("prefix_pins")}, {get_bind_var("suffix_pins")}, exec, $fabricSend 'notch.open_notch("pins")' # Pins
-bind = {get_bind_var("prefix_kanban")}, {get_bind_var("suffix_kanban")}, exec, $fabricSend 'notch.open_notch("kanban")' # Kanban
-bind = {get_bind_var("prefix_launcher")}, {get_bind_var("suffix_launcher")}, exec, $fabricSend 'notch.open_notch("launcher")' # App Launcher
-bind = {get_bind_var("prefix_tmux")}, {get_bind_var("suffix_tmux")}, exec, $fabricSend 'notch.open_notch("tmux")' # Tmux
-bind = {get_bind_var("prefix_cliphist")}, {get_bind_var("suffix_cliphist")}, exec, $fabricSend 'notch.open_notch("cliphist")' # Clipboard History
-bind = {get_bind_var("prefix_toolbox")}, {get_bind_var("suffix_toolbox")}, exec, $fabricSend 'notch.open_notch("tools")' # Toolbox
-bind = {get_bind_var("prefix_overview")}, {get_bind_var("suffix_overview")}, exec, $fabricSend 'notch.open_notch("overview")' # Overview
-bind = {get_bind_var("prefix_wallpapers")}, {get_bind_var("suffix_wallpapers")}, exec, $fabricSend 'notch.open_notch("wallpapers")' # Wallpapers
-bind = {get_bind_var("prefix_randwall")}, {get_bind_var("suffix_randwall")}, exec, $fabricSend 'notch.dashboard.wallpapers.set_random_wallpaper(None, external=True)' # Random Wallpaper
-bind = {get_bind_var("prefix_mixer")}, {get_bind_var("suffix_mixer")}, exec, $fabricSend 'notch.open_notch("mixer")' # Audio Mixer
-bind = {get_bind_var("prefix_emoji")}, {get_bind_var("suffix_emoji")}, exec, $fabricSend 'notch.open_notch("emoji")' # Emoji Picker
-bind = {get_bind_var("prefix_power")}, {get_bind_var("suffix_power")}, exec, $fabricSend 'notch.open_notch("power")' # Power Menu
-bind = {get_bind_var("prefix_caffeine")}, {get_bind_var("suffix_caffeine")}, exec, $fabricSend 'notch.dashboard.widgets.buttons.caffeine_button.toggle_inhibit(external=True)' # Toggle Caffeine
-bind = {get_bind_var("prefix_toggle")}, {get_bind_var("suffix_toggle")}, exec, $fabricSend 'from utils.global_keybinds import get_global_keybind_handler; get_global_keybind_handler().toggle_bar()' # Toggle Bar
-bind = {get_bind_var("prefix_css")}, {get_bind_var("suffix_css")}, exec, $fabricSend 'app.set_css()' # Reload CSS
+bind = {get_bind_var("prefix_dash")}, {get_bind_var("suffix_dash")}, exec, $axSend open-notch dashboard # Dashboard
+bind = {get_bind_var("prefix_bluetooth")}, {get_bind_var("suffix_bluetooth")}, exec, $axSend open-notch bluetooth # Bluetooth
+bind = {get_bind_var("prefix_pins")}, {get_bind_var("suffix_pins")}, exec, $axSend open-notch pins # Pins
+bind = {get_bind_var("prefix_kanban")}, {get_bind_var("suffix_kanban")}, exec, $axSend open-notch kanban # Kanban
+bind = {get_bind_var("prefix_launcher")}, {get_bind_var("suffix_launcher")}, exec, $axSend open-notch launcher # App Launcher
+bind = {get_bind_var("prefix_tmux")}, {get_bind_var("suffix_tmux")}, exec, $axSend open-notch tmux # Tmux
+bind = {get_bind_var("prefix_cliphist")}, {get_bind_var("suffix_cliphist")}, exec, $axSend open-notch cliphist # Clipboard History
+bind = {get_bind_var("prefix_toolbox")}, {get_bind_var("suffix_toolbox")}, exec, $axSend open-notch tools # Toolbox
+bind = {get_bind_var("prefix_overview")}, {get_bind_var("suffix_overview")}, exec, $axSend open-notch overview # Overview
+bind = {get_bind_var("prefix_wallpapers")}, {get_bind_var("suffix_wallpapers")}, exec, $axSend open-notch wallpapers # Wallpapers
+bind = {get_bind_var("prefix_randwall")}, {get_bind_var("suffix_randwall")}, exec, $axSend random-wallpaper # Random Wallpaper
+bind = {get_bind_var("prefix_mixer")}, {get_bind_var("suffix_mixer")}, exec, $axSend open-notch mixer # Audio Mixer
+bind = {get_bind_var("prefix_emoji")}, {get_bind_var("suffix_emoji")}, exec, $axSend open-notch emoji # Emoji Picker
+bind = {get_bind_var("prefix_power")}, {get_bind_var("suffix_power")}, exec, $axSend open-notch power # Power Menu
+bind = {get_bind_var("prefix_caffeine")}, {get_bind_var("suffix_caffeine")}, exec, $axSend toggle-caffeine # Toggle Caffeine
+bind = {get_bind_var("prefix_toggle")}, {get_bind_var("suffix_toggle")}, exec, $axSend toggle-bar # Toggle Bar
+bind = {get_bind_var("prefix_css")}, {get_bind_var("suffix_css")}, exec, $axSend reload-css # Reload CSS
 bind = {get_bind_var("prefix_restart_inspector")}, {get_bind_var("suffix_restart_inspector")}, exec, killall {APP_NAME}; uwsm-app $(GTK_DEBUG=interactive python {home}/.config/{APP_NAME_CAP}/main.py) # Restart with inspector
 
 # Wallpapers directory: {get_bind_var("wallpapers_dir")}
@@ -1,5 +1,11 @@
+import json
 import os
 
+from utils import startup_trace
+
+# Opt-in (AX_SHELL_TRACE_STARTUP=1 or --trace-startup); must precede other imports
+startup_trace.install()
+
 import gi
 
 gi.require_version("GLib", "2.0")
@@ -14,7 +20,8 @@ from modules.corners import Corners
 from modules.dock import Dock
 from modules.notch import Notch
 from modules.notifications import NotificationPopup
-from modules.updater import run_updater
+from modules.updater import check_for_updates, run_updater
+from services.scheduler import PeriodicScheduler
 
 fonts_updated_file = f"{CACHE_DIR}/fonts_updated"
 
@@ -38,8 +45,8 @@ if __name__ == "__main__":
     config = load_config()
 
     GLib.idle_add(run_updater)
-    # Every hour
-    GLib.timeout_add(3600000, run_updater)
+    # Every hour, in a thread of the running shell
+    PeriodicScheduler.get_initial().add(check_for_updates, 3600, name="updater")
 
     # Initialize multi-monitor services
     try:
@@ -47,8 +54,9 @@ if __name__ == "__main__":
         from services.monitor_focus import get_monitor_focus_service
         from utils.global_keybinds import init_global_keybind_objects
         
-        monitor_manager = get_monitor_manager()
-        monitor_focus_service = get_monitor_focus_service()
+        with startup_trace.span("monitor services"):
+            monitor_manager = get_monitor_manager()
+            monitor_focus_service = get_monitor_focus_service()
         monitor_manager.set_monitor_focus_service(monitor_focus_service)
         init_global_keybind_objects()
         
@@ -90,6 +98,7 @@ if __name__ == "__main__":
     app_components = []
     corners = None
     notification = None
+    first_bar = None
     
     # Create components for each monitor
     for monitor in monitors:
@@ -97,7 +106,8 @@ if __name__ == "__main__":
         
         # Create corners only for the first monitor (shared across all)
         if monitor_id == 0:
-            corners = Corners()
+            with startup_trace.span("Corners"):
+                corners = Corners()
             # Set corners visibility based on config
             corners_visible = config.get("corners_visible", True)
             corners.set_visible(corners_visible)
@@ -105,14 +115,22 @@ if __name__ == "__main__":
         
         # Create monitor-specific components
         if multi_monitor_enabled:
-            bar = Bar(monitor_id=monitor_id)
-            notch = Notch(monitor_id=monitor_id)
-            dock = Dock(monitor_id=monitor_id)
+            with startup_trace.span("Bar", monitor=monitor_id):
+                bar = Bar(monitor_id=monitor_id)
+            with startup_trace.span("Notch", monitor=monitor_id):
+                notch = Notch(monitor_id=monitor_id)
+            with startup_trace.span("Dock", monitor=monitor_id):
+                dock = Dock(monitor_id=monitor_id)
         else:
             # Single monitor fallback
-            bar = Bar()
-            notch = Notch()
-            dock = Dock()
+            with startup_trace.span("Bar"):
+                bar = Bar()
+            with startup_trace.span("Notch"):
+                notch = Notch()
+            with startup_trace.span("Dock"):
+                dock = Dock()
+        if first_bar is None:
+            first_bar = bar
         
         # Connect bar and notch
         bar.notch = notch
@@ -120,7 +138,8 @@ if __name__ == "__main__":
         
         # Create notification popup for the first monitor only
         if monitor_id == 0:
-            notification = NotificationPopup(widgets=notch.dashboard.widgets)
+            with startup_trace.span("NotificationPopup"):
+                notification = NotificationPopup(widgets=notch.dashboard.widgets)
             app_components.append(notification)
         
         # Register instances in monitor manager if available
@@ -135,8 +154,12 @@ if __name__ == "__main__":
         # Add components to app list
         app_components.extend([bar, notch, dock])
 
+    # The trace ends when the first bar is on screen
+    startup_trace.finish_on_first_frame(first_bar)
+
     # Create the application with all components
-    app = Application(f"{APP_NAME}", *app_components)
+    with startup_trace.span("Application"):
+        app = Application(f"{APP_NAME}", *app_components)
 
     def set_css():
         app.set_stylesheet_from_file(
@@ -145,6 +168,36 @@ if __name__ == "__main__":
 
     app.set_css = set_css
 
-    app.set_css()
+    with startup_trace.span("set_css"):
+        app.set_css()
+
+    # Commands sent by the keybinds through scripts/ax_send.py
+    from services.command_server import CommandServer
+    from utils.global_keybinds import get_global_keybind_handler
+
+    commands = CommandServer.get_initial()
+    commands.register("open-notch", lambda module: notch.open_notch(module))
+    commands.register("close-notch", lambda: notch.close_notch())
+    commands.register("toggle-bar", lambda: get_global_keybind_handler().toggle_bar())
+    commands.register(
+        "random-wallpaper",
+        lambda: notch.dashboard.wallpapers.set_random_wallpaper(None, external=True),
+    )
+    commands.register(
+        "toggle-caffeine",
+        lambda: notch.dashboard.widgets.buttons.caffeine_button.toggle_inhibit(external=True),
+    )
+    commands.register("reload-css", lambda: app.set_css())
+    commands.register(
+        "timer-stats", lambda: json.dumps(PeriodicScheduler.get_initial().stats())
+    )
+
+    # Opt-in (AX_SHELL_DETECT_STALLS=1 or --detect-stalls)
+    from utils import stall_detector
+
+    stall_detector.install()
+    if stall_detector.is_enabled():
+        commands.register("stall-stats", lambda: json.dumps(stall_detector.stats()))
+    commands.start()
 
     app.run()
@@ -1,5 +1,4 @@
 import json
-import os
 
 from fabric.hyprland.service import HyprlandEvent
 from fabric.hyprland.widgets import HyprlandLanguage as Language
@@ -22,6 +21,7 @@ from modules.metrics import Battery, MetricsSmall, NetworkApplet
 from modules.systemprofiles import Systemprofiles
 from modules.systemtray import SystemTray
 from modules.weather import Weather
+from services.config import ConfigService
 from widgets.wayland import WaylandWindow as Window
 
 CHINESE_NUMERALS = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "〇"]
@@ -270,6 +270,14 @@ class Bar(Window):
         self.battery = Battery()
 
         self.apply_component_props()
+        config = ConfigService.get_initial()
+        for component_name in self.component_visibility:
+            config.connect_key(
+                f"bar_{component_name}_visible",
+                lambda visible, name=component_name: self.on_component_visibility_changed(
+                    name, visible
+                ),
+            )
 
         self.rev_right = [
             self.metrics,
@@ -538,6 +546,10 @@ class Bar(Window):
             if component_name in self.component_visibility:
                 widget.set_visible(self.component_visibility[component_name])
 
+    def on_component_visibility_changed(self, component_name, visible):
+        self.component_visibility[component_name] = visible
+        self.apply_component_props()
+
     def toggle_component_visibility(self, component_name):
         components = {
             "button_apps": self.button_apps,
@@ -564,22 +576,10 @@ class Bar(Window):
                 self.component_visibility[component_name]
             )
 
-            config_file = os.path.expanduser(
-                f"~/.config/{data.APP_NAME}/config/config.json"
+            ConfigService.get_initial().set(
+                f"bar_{component_name}_visible",
+                self.component_visibility[component_name],
             )
-            if os.path.exists(config_file):
-                try:
-                    with open(config_file, "r") as f:
-                        config = json.load(f)
-
-                    config[f"bar_{component_name}_visible"] = self.component_visibility[
-                        component_name
-                    ]
-
-                    with open(config_file, "w") as f:
-                        json.dump(config, f, indent=4)
-                except Exception as e:
-                    print(f"Error updating config file: {e}")
 
             return self.component_visibility[component_name]
 
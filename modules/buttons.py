@@ -1,5 +1,3 @@
-import subprocess
-
 import gi
 from fabric.utils.helpers import exec_shell_command_async
 from fabric.widgets.box import Box
@@ -12,6 +10,7 @@ import config.data as data
 gi.require_version('Gtk', '3.0')
 import modules.icons as icons
 from services.network import NetworkClient
+from services.process_watch import ProcessWatcher
 
 
 def add_hover_cursor(widget):
@@ -301,7 +300,7 @@ class NightModeButton(Button):
         add_hover_cursor(self)
 
         self.widgets = [self, self.night_mode_label, self.night_mode_status, self.night_mode_icon]
-        self.check_hyprsunset()
+        ProcessWatcher.get_initial().watch("hyprsunset", self.check_hyprsunset)
 
     def toggle_hyprsunset(self, *args):
         """
@@ -309,19 +308,15 @@ class NightModeButton(Button):
           - If running, kill it and mark as 'Disabled'.
           - If not running, start it and mark as 'Enabled'.
         """
-        GLib.Thread.new("hyprsunset-toggle", self._toggle_hyprsunset_thread, None)
-    
-    def _toggle_hyprsunset_thread(self, user_data):
-        """Background thread to check and toggle hyprsunset without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "hyprsunset"])
+        watcher = ProcessWatcher.get_initial()
+        running = watcher.is_running("hyprsunset")
+        if running:
             exec_shell_command_async("pkill hyprsunset")
-            GLib.idle_add(self.night_mode_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
-        except subprocess.CalledProcessError:
+        else:
             exec_shell_command_async("hyprsunset -t 3500")
-            GLib.idle_add(self.night_mode_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
+        # Shown right away, the watcher puts it back if the spawn or kill failed
+        self.check_hyprsunset(not running)
+        watcher.confirm()
     
     def _add_disabled_style(self):
         """Helper to add disabled style to all widgets."""
@@ -333,21 +328,16 @@ class NightModeButton(Button):
         for widget in self.widgets:
             widget.remove_style_class("disabled")
 
-    def check_hyprsunset(self, *args):
+    def check_hyprsunset(self, running):
         """
         Update the button state based on whether hyprsunset is running.
         """
-        GLib.Thread.new("hyprsunset-check", self._check_hyprsunset_thread, None)
-    
-    def _check_hyprsunset_thread(self, user_data):
-        """Background thread to check hyprsunset status without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "hyprsunset"])
-            GLib.idle_add(self.night_mode_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
-        except subprocess.CalledProcessError:
-            GLib.idle_add(self.night_mode_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
+        if running:
+            self.night_mode_status.set_label("Enabled")
+            self._remove_disabled_style()
+        else:
+            self.night_mode_status.set_label("Disabled")
+            self._add_disabled_style()
 
 class CaffeineButton(Button):
     def __init__(self):
@@ -389,7 +379,7 @@ class CaffeineButton(Button):
         add_hover_cursor(self)
 
         self.widgets = [self, self.caffeine_label, self.caffeine_status, self.caffeine_icon]
-        self.check_inhibit()
+        ProcessWatcher.get_initial().watch("ax-inhibit", self.check_inhibit)
 
     def toggle_inhibit(self, *args, external=False):
         """
@@ -397,24 +387,19 @@ class CaffeineButton(Button):
           - If running, kill it and mark as 'Disabled' (add 'disabled' class).
           - If not running, start it and mark as 'Enabled' (remove 'disabled' class).
         """
-        GLib.Thread.new("caffeine-toggle", self._toggle_inhibit_thread, external)
-    
-    def _toggle_inhibit_thread(self, external):
-        """Background thread to toggle inhibit without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "ax-inhibit"])
+        watcher = ProcessWatcher.get_initial()
+        running = watcher.is_running("ax-inhibit")
+        if running:
             exec_shell_command_async("pkill ax-inhibit")
-            GLib.idle_add(self.caffeine_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
-        except subprocess.CalledProcessError:
+        else:
             exec_shell_command_async(f"python {data.HOME_DIR}/.config/{data.APP_NAME_CAP}/scripts/inhibit.py")
-            GLib.idle_add(self.caffeine_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
+        # Shown right away, the watcher puts it back if the spawn or kill failed
+        self.check_inhibit(not running)
+        watcher.confirm()
 
         if external:
             # Different if enabled or disabled
-            status = "Disabled" if self.caffeine_status.get_label() == "Disabled" else "Enabled"
-            message = "Disabled 💤" if status == "Disabled" else "Enabled ☀️"
+            message = "Disabled 💤" if running else "Enabled ☀️"
             exec_shell_command_async(f"notify-send '☕ Caffeine' '{message}' -a '{data.APP_NAME_CAP}' -e")
     
     def _add_disabled_style(self):
@@ -427,18 +412,14 @@ class CaffeineButton(Button):
         for widget in self.widgets:
             widget.remove_style_class("disabled")
 
-    def check_inhibit(self, *args):
-        GLib.Thread.new("caffeine-check", self._check_inhibit_thread, None)
-    
-    def _check_inhibit_thread(self, user_data):
-        """Background thread to check inhibit status without blocking UI."""
-        try:
-            subprocess.check_output(["pgrep", "ax-inhibit"])
-            GLib.idle_add(self.caffeine_status.set_label, "Enabled")
-            GLib.idle_add(self._remove_disabled_style)
-        except subprocess.CalledProcessError:
-            GLib.idle_add(self.caffeine_status.set_label, "Disabled")
-            GLib.idle_add(self._add_disabled_style)
+    def check_inhibit(self, running):
+        """Update the button state based on whether ax-inhibit is running."""
+        if running:
+            self.caffeine_status.set_label("Enabled")
+            self._remove_disabled_style()
+        else:
+            self.caffeine_status.set_label("Disabled")
+            self._add_disabled_style()
 
 class Buttons(Gtk.Grid):
     def __init__(self, **kwargs):
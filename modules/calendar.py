@@ -7,6 +7,7 @@ from fabric.widgets.centerbox import CenterBox
 from fabric.widgets.label import Label
 
 import modules.icons as icons
+from services.scheduler import PeriodicScheduler
 
 gi.require_version("Gtk", "3.0")
 from gi.repository import GLib, Gtk, Gio
@@ -118,8 +119,10 @@ class Calendar(Gtk.Box):
         return False  # Don't repeat this idle callback
 
     def setup_periodic_update(self):
-        # Check for date changes every second
-        GLib.timeout_add(1000, self.check_date_change)
+        # Check for date changes every second while shown, and when shown
+        PeriodicScheduler.get_initial().add(
+            self.check_date_change, 1, widget=self, name="calendar-date"
+        )
 
     def setup_dbus_listeners(self):
         # Listen for system suspend/resume events
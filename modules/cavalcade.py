@@ -3,21 +3,43 @@ import ctypes
 import os
 import re
 import signal
-import struct
 import subprocess
+import time
 from math import pi
 
 from fabric.utils.helpers import get_relative_path
 from fabric.widgets.overlay import Overlay
-from gi.repository import Gdk, GLib, Gtk
+from gi.repository import Gdk, Gio, GLib, Gtk
 from loguru import logger
 
+from services.config import ConfigService
+from utils.lazy_import import lazy_import
+from utils.spectrum import FFT_SIZE, SpectrumAnalyzer
+
+np = lazy_import("numpy")
+
 
 def get_bars(file_path):
     config = configparser.ConfigParser()
     config.read(file_path)
     return int(config['general']['bars'])
 
+def get_analyzer_settings(file_path):
+    """Read the cava.ini options that the built-in backend understands too."""
+    config = configparser.ConfigParser(inline_comment_prefixes=("#", ";"))
+    config.read(file_path)
+    general = config["general"] if config.has_section("general") else {}
+    smoothing = config["smoothing"] if config.has_section("smoothing") else {}
+    return {
+        "low_cutoff": float(general.get("lower_cutoff_freq", 50)),
+        "high_cutoff": float(general.get("higher_cutoff_freq", 8000)),
+        "framerate": int(general.get("framerate", 60)),
+        "autosens": general.get("autosens", "1") == "1",
+        "sensitivity": float(general.get("sensitivity", 100)) / 100,
+        "integral": float(smoothing.get("integral", 70)) / 100,
+        "gravity": float(smoothing.get("gravity", 100)) / 100,
+    }
+
 CAVA_CONFIG = get_relative_path("../config/cavalcade/cava.ini")
 
 bars = get_bars(CAVA_CONFIG)
@@ -47,7 +69,15 @@ class Cava:
             h(*a, **kw)
 
     def register_handler(self, handler):
+        """Subscribe `handler` to frames; cava runs while anyone is subscribed."""
         self._handlers.append(handler)
+        self.start()
+
+    def unregister_handler(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        if not self._handlers:
+            self.stop()
 
     def __init__(self):
         self.bars = bars
@@ -64,7 +94,14 @@ class Cava:
         self.env["LC_ALL"] = "en_US.UTF-8"  # not sure if it's necessary
 
         is_16bit = True
-        self.byte_type, self.byte_size, self.byte_norm = ("H", 2, 65535) if is_16bit else ("B", 1, 255)
+        self.byte_type, self.byte_size, self.byte_norm = (np.dtype("=u2"), 2, 65535) if is_16bit else (np.dtype("u1"), 1, 255)
+        self.frame_size = self.byte_size * self.bars
+
+        # Bytes of an incomplete frame left over from the last read
+        self._buffer = bytearray()
+        # Newest decoded frame, updated in place and shared with the handlers
+        self.sample = np.zeros(self.bars, dtype=np.float32)
+        self._update_pending = False
 
         if not os.path.exists(self.path):
             os.mkfifo(self.path)
@@ -87,6 +124,8 @@ class Cava:
             logger.exception("Fail to launch cava")
 
     def _start_io_reader(self):
+        if not os.path.exists(self.path):
+            os.mkfifo(self.path)
         # Open FIFO in non-blocking mode for reading
         self.fifo_fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
         # Open dummy write end to prevent getting an EOF on our FIFO
@@ -94,40 +133,51 @@ class Cava:
         self.io_watch_id = GLib.io_add_watch(self.fifo_fd, GLib.IO_IN, self._io_callback)
 
     def _io_callback(self, source, condition):
-        chunk = self.byte_size * self.bars  # number of bytes for given format
-        try:
-            if self.fifo_fd is None:
-                return False
-                
-            data = os.read(self.fifo_fd, chunk)
-        except OSError as e:
-            if e.errno == 11:  # EAGAIN - would block, normal for non-blocking
-                return True
-            elif e.errno == 9:  # EBADF - bad file descriptor
-                GLib.idle_add(self.restart)
-                return False
-            else:
-                return False
-        except Exception:
+        if self.fifo_fd is None:
             return False
-
-        # When no data is read, do not remove the IO watch immediately.
-        if len(data) < chunk:
-            if len(data) == 0:
-                # No data available, continue watching
-                return True
-            else:
-                return True
-
-        try:
-            fmt = self.byte_type * self.bars  # format string for struct.unpack
-            sample = [i / self.byte_norm for i in struct.unpack(fmt, data)]
-            GLib.idle_add(self.data_handler, sample)
-        except (struct.error, Exception):
+        # Drain everything cava wrote since the last wakeup
+        while True:
+            try:
+                data = os.read(self.fifo_fd, 64 * self.frame_size)
+            except OSError as e:
+                if e.errno == 11:  # EAGAIN - would block, pipe is drained
+                    break
+                elif e.errno == 9:  # EBADF - bad file descriptor
+                    GLib.idle_add(self.restart)
+                    return False
+                else:
+                    return False
+            except Exception:
+                return False
+            if not data:
+                break
+            self._buffer += data
+            if len(data) < 64 * self.frame_size:
+                break
+
+        frames = len(self._buffer) // self.frame_size
+        if frames == 0:
             return True
-            
+
+        # Only the newest complete frame matters, older ones are stale
+        end = frames * self.frame_size
+        frame = np.frombuffer(
+            self._buffer, dtype=self.byte_type, count=self.bars, offset=end - self.frame_size
+        )
+        np.multiply(frame, 1 / self.byte_norm, out=self.sample, casting="unsafe")
+        del frame
+        del self._buffer[:end]
+
+        if not self._update_pending:
+            self._update_pending = True
+            GLib.idle_add(self._publish)
         return True
 
+    def _publish(self):
+        self._update_pending = False
+        self.data_handler(self.sample)
+        return False
+
     def _on_stop(self):
         if self.state == self.RESTARTING:
             self.start()
@@ -151,15 +201,35 @@ class Cava:
         elif self.state == self.NONE:
             self.start()
 
+    def stop(self):
+        """Stop cava while nobody listens, keeping the FIFO for the next start"""
+        if not self._started:
+            return
+        self._started = False
+        self.state = self.NONE
+        self._stop_io_reader()
+        self._kill_process()
+
     def close(self):
         """Stop cava process"""
         self.state = self.CLOSING
-        
+        self._started = False
+        self._stop_io_reader()
+        self._kill_process()
+
+        # Remove FIFO file
+        if os.path.exists(self.path):
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def _stop_io_reader(self):
         # Stop IO watch first
         if self.io_watch_id:
             GLib.source_remove(self.io_watch_id)
             self.io_watch_id = None
-            
+
         # Close file descriptors safely
         if self.fifo_fd is not None:
             try:
@@ -168,7 +238,7 @@ class Cava:
                 pass
             finally:
                 self.fifo_fd = None
-                
+
         if self.fifo_dummy_fd is not None:
             try:
                 os.close(self.fifo_dummy_fd)
@@ -176,7 +246,9 @@ class Cava:
                 pass
             finally:
                 self.fifo_dummy_fd = None
-        
+        self._buffer.clear()
+
+    def _kill_process(self):
         # Kill process if still running
         if self.process and self.process.poll() is None:
             try:
@@ -186,13 +258,163 @@ class Cava:
                 self.process.kill()
             except Exception:
                 pass
-        
-        # Remove FIFO file
-        if os.path.exists(self.path):
+
+class PcmSpectrum:
+    """
+    Built-in visualizer backend, a drop-in replacement for Cava.
+    Reads raw s16le mono PCM and computes the bars in-process with NumPy.
+
+    The input is either `parec` recording the default output's monitor
+    (empty `source`) or the path of a FIFO fed by anything else, e.g. a
+    sine sweep for testing:
+
+        sox -n -r 44100 -c 1 -b 16 -e signed -t raw - synth 10 sine 50:8000 > FIFO
+    """
+    RATE = 44100
+
+    def __init__(self, source=""):
+        self.bars = bars
+        self.source = source
+        self.settings = get_analyzer_settings(CAVA_CONFIG)
+        self._handlers = []
+        self._started = False
+        self.process = None
+        self.fd = None
+        self.dummy_fd = None
+        self.io_watch_id = None
+        self.timer_id = None
+
+        self.analyzer = None
+        # Newest FFT_SIZE samples and an odd byte left over from the last read
+        self._samples = np.zeros(FFT_SIZE, dtype=np.float32)
+        self._leftover = b""
+        self._fresh = False
+        self.sample = np.zeros(self.bars, dtype=np.float32)
+
+    def data_handler(self, *a, **kw):
+        """Call all registered handlers with the provided arguments."""
+        for h in self._handlers:
+            h(*a, **kw)
+
+    def register_handler(self, handler):
+        """Subscribe `handler` to frames; the backend runs while anyone is subscribed."""
+        self._handlers.append(handler)
+        self.start()
+
+    def unregister_handler(self, handler):
+        if handler in self._handlers:
+            self._handlers.remove(handler)
+        if not self._handlers:
+            self.stop()
+
+    def start(self):
+        if self._started:
+            return
+        try:
+            if self.source:
+                if not os.path.exists(self.source):
+                    os.mkfifo(self.source)
+                self.fd = os.open(self.source, os.O_RDONLY | os.O_NONBLOCK)
+                # Keep a writer open so the FIFO doesn't report EOF between writers
+                self.dummy_fd = os.open(self.source, os.O_WRONLY | os.O_NONBLOCK)
+            else:
+                self.process = subprocess.Popen(
+                    [
+                        "parec", "--raw", "--format=s16le", "--channels=1",
+                        f"--rate={self.RATE}", "--latency-msec=20",
+                        "-d", "@DEFAULT_MONITOR@",
+                    ],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    preexec_fn=set_death_signal,
+                )
+                self.fd = self.process.stdout.fileno()
+                os.set_blocking(self.fd, False)
+        except Exception:
+            logger.exception("Fail to open visualizer input")
+            self.stop()
+            return
+
+        self.analyzer = SpectrumAnalyzer(self.bars, rate=self.RATE, **self.settings)
+        self.io_watch_id = GLib.io_add_watch(self.fd, GLib.IO_IN | GLib.IO_HUP, self._io_callback)
+        self.timer_id = GLib.timeout_add(1000 // max(self.settings["framerate"], 1), self._on_frame)
+        self._started = True
+
+    def _io_callback(self, source, condition):
+        chunks = []
+        while True:
             try:
-                os.remove(self.path)
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
             except OSError:
-                pass
+                # Removed by returning False, stop() must not remove it again
+                self.io_watch_id = None
+                GLib.timeout_add_seconds(2, self.restart)
+                return False
+            if not data:
+                if condition & GLib.IO_HUP:
+                    # Input went away (e.g. parec exited); retry later
+                    self.io_watch_id = None
+                    GLib.timeout_add_seconds(2, self.restart)
+                    return False
+                break
+            chunks.append(data)
+        if not chunks:
+            return True
+
+        data = self._leftover + b"".join(chunks)
+        usable = len(data) - len(data) % 2
+        self._leftover = data[usable:]
+        # Only the newest FFT_SIZE samples are ever analyzed
+        start = max(0, usable - FFT_SIZE * 2)
+        new = np.frombuffer(data, dtype="<i2", count=(usable - start) // 2, offset=start)
+        if len(new) == 0:
+            # A single odd byte, kept for the next read
+            return True
+        self._samples = np.roll(self._samples, -len(new))
+        self._samples[-len(new):] = new / 32768
+        self._fresh = True
+        return True
+
+    def _on_frame(self):
+        if self._fresh:
+            self._fresh = False
+            self.sample[:] = self.analyzer.process(self._samples)
+            self.data_handler(self.sample)
+        return True
+
+    def restart(self):
+        self.stop()
+        if self._handlers:
+            self.start()
+        return False
+
+    def stop(self):
+        self._started = False
+        self._fresh = False
+        for source_id in (self.io_watch_id, self.timer_id):
+            if source_id:
+                GLib.source_remove(source_id)
+        self.io_watch_id = self.timer_id = None
+        if self.process:
+            if self.process.poll() is None:
+                self.process.kill()
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+        else:
+            for fd in (self.fd, self.dummy_fd):
+                if fd is not None:
+                    try:
+                        os.close(fd)
+                    except OSError:
+                        pass
+        self.fd = self.dummy_fd = None
+        self._leftover = b""
+
+    def close(self):
+        self.stop()
 
 class AttributeDict(dict):
     """Dictionary with keys as attributes. Does nothing but easy reading"""
@@ -208,8 +430,6 @@ class Spectrum:
         self.silence_value = 0
         self.audio_sample = []
         self.color = None
-        self._cached_color = None
-        self._color_file_mtime = 0
 
         self.area = Gtk.DrawingArea()
         self.area.connect("draw", self.redraw)
@@ -222,9 +442,28 @@ class Spectrum:
         self.silence = 10
         self.max_height = 12
 
+        # Frame rate governor
+        config = ConfigService.get_initial()
+        self.frame_interval = self._get_frame_interval(config.get_int("visualizer_max_fps"))
+        config.connect_key("visualizer_max_fps", self._on_max_fps_changed)
+        self._last_frame = 0
+        self._frame_timeout_id = None
+
         self.area.connect("configure-event", self.size_update)
         self.color_update()
 
+        # Follow theme changes without polling the color file every frame
+        color_file = Gio.File.new_for_path(get_relative_path("../styles/colors.css"))
+        self._color_monitor = color_file.monitor_file(Gio.FileMonitorFlags.NONE, None)
+        self._color_monitor.connect("changed", self._on_color_file_changed)
+
+    @staticmethod
+    def _get_frame_interval(max_fps):
+        return 1 / max(max_fps, 1)
+
+    def _on_max_fps_changed(self, max_fps):
+        self.frame_interval = self._get_frame_interval(max_fps)
+
     def is_silence(self, value):
         """Check if volume level critically low during last iterations"""
         self.silence_value = 0 if value > 0 else self.silence_value + 1
@@ -232,36 +471,48 @@ class Spectrum:
 
     def update(self, data):
         """Audio data processing"""
-        self.color_update_cached()
         self.audio_sample = data
         if not self.is_silence(self.audio_sample[0]):
-            self.area.queue_draw()
+            self.queue_frame()
         elif self.silence_value == (self.silence + 1):
-            self.audio_sample = [0] * self.sizes.number
-            self.area.queue_draw()
+            self.audio_sample = np.zeros(len(data), dtype=np.float32)
+            self.queue_frame()
+
+    def queue_frame(self):
+        """Queue a redraw, at most one per frame interval"""
+        if self._frame_timeout_id is not None:
+            # A redraw is already scheduled and will pick up the newest sample
+            return
+        wait = self._last_frame + self.frame_interval - time.monotonic()
+        if wait <= 0:
+            self._draw_frame()
+        else:
+            self._frame_timeout_id = GLib.timeout_add(int(wait * 1000) + 1, self._draw_frame)
+
+    def _draw_frame(self):
+        self._frame_timeout_id = None
+        self._last_frame = time.monotonic()
+        self.area.queue_draw()
+        return False
 
     def redraw(self, widget, cr):
         """Draw spectrum graph"""
+        if not self.sizes.get("bar_x") or len(self.audio_sample) == 0:
+            return
         cr.set_source_rgba(*self.color)
-        dx = 3
-
-        center_y = self.sizes.area.height / 2  # center vertical of the drawing area
-        for i, value in enumerate(self.audio_sample):
-            width = self.sizes.area.width / self.sizes.number - self.sizes.padding
-            radius = width / 2
-            height = max(self.sizes.bar.height * min(value, 1), self.sizes.zero) / 2
-            if height == self.sizes.zero / 2 + 1:
-                height *= 0.5
-
-            height = min(height, self.max_height)
-
-            # Draw rectangle and arcs for rounded ends
-            cr.rectangle(dx, center_y - height, width, height * 2)
-            cr.arc(dx + radius, center_y - height, radius, 0, 2 * pi)
-            cr.arc(dx + radius, center_y + height, radius, 0, 2 * pi)
 
+        heights = np.maximum(self.sizes.bar.height * np.minimum(self.audio_sample, 1), self.sizes.zero) / 2
+        heights[heights == self.sizes.zero / 2 + 1] *= 0.5
+        np.minimum(heights, self.max_height, out=heights)
+
+        center_y = self.sizes.center_y
+        radius = self.sizes.radius
+        for x, height in zip(self.sizes.bar_x, heights.tolist()):
+            # One capsule per bar: the rectangle with rounded ends
+            cr.new_sub_path()
+            cr.arc(x, center_y - height, radius, pi, 0)
+            cr.arc(x, center_y + height, radius, 0, pi)
             cr.close_path()
-            dx += width + self.sizes.padding
         cr.fill()
 
     def size_update(self, *args):
@@ -277,33 +528,20 @@ class Spectrum:
         self.sizes.bar.width = max(int(tw / self.sizes.number), 1)
         self.sizes.bar.height = self.sizes.area.height
 
-    def color_update_cached(self):
-        """Set drawing color with caching to avoid file reads on every frame"""
-        color_file = get_relative_path("../styles/colors.css")
-        try:
-            # Check if file has been modified
-            current_mtime = os.path.getmtime(color_file)
-            if current_mtime != self._color_file_mtime or self._cached_color is None:
-                self._color_file_mtime = current_mtime
-                
-                color = "#a5c8ff"  # default value
-                with open(color_file, "r") as f:
-                    content = f.read()
-                    m = re.search(r"--primary:\s*(#[0-9a-fA-F]{6})", content)
-                    if m:
-                        color = m.group(1)
-                
-                red = int(color[1:3], 16) / 255
-                green = int(color[3:5], 16) / 255
-                blue = int(color[5:7], 16) / 255
-                self._cached_color = Gdk.RGBA(red=red, green=green, blue=blue, alpha=1.0)
-                
-            self.color = self._cached_color
-        except Exception:
-            if self._cached_color is None:
-                # Fallback to default color
-                self._cached_color = Gdk.RGBA(red=0.647, green=0.784, blue=1.0, alpha=1.0)
-                self.color = self._cached_color
+        # Per-bar geometry only depends on the size, so it is computed here once
+        width = self.sizes.area.width / self.sizes.number - self.sizes.padding
+        self.sizes.radius = width / 2
+        self.sizes.center_y = self.sizes.area.height / 2
+        dx = 3 + np.arange(self.sizes.number) * (width + self.sizes.padding)
+        self.sizes.bar_x = (dx + self.sizes.radius).tolist()
+
+    def _on_color_file_changed(self, monitor, file, other_file, event_type):
+        if event_type in (
+            Gio.FileMonitorEvent.CHANGES_DONE_HINT,
+            Gio.FileMonitorEvent.CREATED,
+        ):
+            self.color_update()
+            self.area.queue_draw()
 
     def color_update(self):
         """Set drawing color according to current settings by reading primary color from CSS"""
@@ -325,9 +563,13 @@ class Spectrum:
 _instances = {}
 
 
-def getCava() -> Cava:
+def getCava() -> Cava | PcmSpectrum:
     if "cava" not in _instances:
-        _instances["cava"] = Cava()
+        config = ConfigService.get_initial()
+        if config.get_str("visualizer_backend") == "builtin":
+            _instances["cava"] = PcmSpectrum(config.get_str("visualizer_input"))
+        else:
+            _instances["cava"] = Cava()
     return _instances["cava"]
 
 
@@ -338,9 +580,11 @@ class SpectrumRender:
 
         self.draw = Spectrum()
         self.cava = getCava()
-        self.cava.register_handler(self.draw.update)
 
-        self.cava.start()
+        # Only listen to cava while the spectrum is on screen; a closed notch
+        # or another page of the player stack unmaps it
+        self.draw.area.connect("map", lambda *_: self.cava.register_handler(self.draw.update))
+        self.draw.area.connect("unmap", lambda *_: self.cava.unregister_handler(self.draw.update))
 
     def get_spectrum_box(self):
         # Get the spectrum box
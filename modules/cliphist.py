@@ -16,6 +16,9 @@ from gi.repository import Gdk, GdkPixbuf, GLib
 
 import modules.icons as icons
 
+# Decoded image previews by cliphist id, shared by the clipboard history of every monitor
+_image_cache = {}
+
 
 class ClipHistory(Box):
     def __init__(self, **kwargs):
@@ -27,7 +30,7 @@ class ClipHistory(Box):
         )
 
         self.tmp_dir = tempfile.mkdtemp(prefix="cliphist-")
-        self.image_cache = {}
+        self.image_cache = _image_cache
         
         self.notch = kwargs["notch"]
         self.selected_index = -1
@@ -390,6 +393,8 @@ class ClipHistory(Box):
         """Background thread worker for clearing clipboard history"""
         try:
             subprocess.run(["cliphist", "wipe"], check=True)
+            # Ids start over after a wipe
+            self.image_cache.clear()
             self._pending_updates = True
             if not self._loading:
                 GLib.Thread.new("cliphist-loader", self._load_clipboard_items_thread, None)
@@ -514,6 +519,5 @@ class ClipHistory(Box):
             if hasattr(self, 'tmp_dir') and os.path.exists(self.tmp_dir):
                 import shutil
                 shutil.rmtree(self.tmp_dir)
-            self.image_cache.clear()
         except Exception as e:
             print(f"Error cleaning up temporary files: {e}", file=sys.stderr)
@@ -136,10 +136,7 @@ class BrightnessSlider(Scale):
         self.set_value(self.client.screen_brightness)
         self.add_style_class("brightness")
 
-        self._pending_value = None
-        self._update_source_id = None
         self._updating_from_brightness = False
-        self._debounce_timeout = 100
 
         self.connect("change-value", self.on_scale_move)
         self.client.connect("screen", self.on_brightness_changed)
@@ -147,26 +144,12 @@ class BrightnessSlider(Scale):
     def on_scale_move(self, widget, scroll, moved_pos):
         if self._updating_from_brightness:
             return False
-        self._pending_value = moved_pos
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        self._update_source_id = GLib.timeout_add(
-            self._debounce_timeout, self._update_brightness_callback
-        )
+        # Applied while dragging; the service only sends the latest value
+        # once the write in flight completes
+        if moved_pos != self.client.screen_brightness:
+            self.client.screen_brightness = moved_pos
         return False
 
-    def _update_brightness_callback(self):
-        if self._pending_value is not None:
-            value_to_set = self._pending_value
-            self._pending_value = None
-            if value_to_set != self.client.screen_brightness:
-                self.client.screen_brightness = value_to_set
-            self._update_source_id = None
-            return False
-        else:
-            self._update_source_id = None
-            return False
-
     def on_brightness_changed(self, client, _):
         self._updating_from_brightness = True
         self.set_value(self.client.screen_brightness)
@@ -174,11 +157,6 @@ class BrightnessSlider(Scale):
         percentage = int((self.client.screen_brightness / self.client.max_screen) * 100)
         self.set_tooltip_text(f"{percentage}%")
 
-    def destroy(self):
-        if self._update_source_id is not None:
-            GLib.source_remove(self._update_source_id)
-        super().destroy()
-
 
 class BrightnessSmall(Box):
     def __init__(self, **kwargs):
@@ -20,9 +20,33 @@ from modules.pins import Pins
 from modules.tracker import Tracker
 from modules.wallpapers import WallpaperSelector
 from modules.widgets import Widgets
+from utils.lazy_modules import LazyModules, lazy_module
 
 
 class Dashboard(Box):
+    """Dashboard shared by the notches of every monitor.
+
+    Only one notch is open at a time, so a single dashboard (and a single
+    set of wallpaper, tracker, kanban and notification history backends)
+    moves into whichever notch opens it; see `Notch.claim_dashboard`.
+    """
+
+    instance = None
+
+    # Every section but the widgets one is built the first time it's shown
+    pins = lazy_module("pins", "sections")
+    kanban = lazy_module("kanban", "sections")
+    tracker = lazy_module("tracker", "sections")
+    wallpapers = lazy_module("wallpapers", "sections")
+    mixer = lazy_module("mixer", "sections")
+
+    @staticmethod
+    def get_initial(notch):
+        """Singleton to get the Dashboard, built for the first notch."""
+        if Dashboard.instance is None:
+            Dashboard.instance = Dashboard(notch=notch)
+        return Dashboard.instance
+
     def __init__(self, **kwargs):
         super().__init__(
             name="dashboard",
@@ -38,11 +62,6 @@ class Dashboard(Box):
         self.notch = kwargs["notch"]
 
         self.widgets = Widgets(notch=self.notch)
-        self.pins = Pins()
-        self.kanban = Kanban()
-        self.tracker = Tracker()
-        self.wallpapers = WallpaperSelector()
-        self.mixer = Mixer()
 
         self.stack = Stack(
             name="stack",
@@ -62,11 +81,15 @@ class Dashboard(Box):
         )
 
         self.stack.add_titled(self.widgets, "widgets", "Widgets")
-        self.stack.add_titled(self.tracker, "tracker", "Tracker")
-        self.stack.add_titled(self.pins, "pins", "Pins")
-        self.stack.add_titled(self.kanban, "kanban", "Kanban")
-        self.stack.add_titled(self.wallpapers, "wallpapers", "Wallpapers")
-        self.stack.add_titled(self.mixer, "mixer", "Mixer")
+        self.sections = LazyModules(self.stack, titled=True)
+        self.sections.register("tracker", Tracker, "Tracker")
+        self.sections.register("pins", Pins, "Pins")
+        self.sections.register("kanban", Kanban, "Kanban")
+        self.sections.register("wallpapers", WallpaperSelector, "Wallpapers")
+        self.sections.register("mixer", Mixer, "Mixer")
+        # Built right away: it restores the running timer and schedules
+        # the saved reminders, which must fire even if it is never opened
+        self.sections.get("tracker")
 
         self.switcher.set_stack(self.stack)
         self.switcher.set_hexpand(True)
@@ -83,6 +106,10 @@ class Dashboard(Box):
             or data.PANEL_POSITION in ["Start", "End"]
         ):
             GLib.idle_add(self._setup_switcher_icons)
+            # Swapping a placeholder for its section recreates the switcher button
+            self.sections.connect_built(
+                lambda *_: GLib.idle_add(self._setup_switcher_icons)
+            )
 
         # Close on right click if the event isn't handled
         self.connect(
@@ -144,7 +171,7 @@ class Dashboard(Box):
 
     def on_visible_child_changed(self, stack, param):
         visible = stack.get_visible_child()
-        if visible == self.wallpapers:
+        if visible is not None and visible == self.sections.peek("wallpapers"):
             self.wallpapers.search_entry.set_text("")
             self.wallpapers.search_entry.grab_focus()
 
@@ -152,13 +179,5 @@ class Dashboard(Box):
         """Navigate to a specific section in the dashboard."""
         if section_name == "widgets":
             self.stack.set_visible_child(self.widgets)
-        elif section_name == "pins":
-            self.stack.set_visible_child(self.pins)
-        elif section_name == "kanban":
-            self.stack.set_visible_child(self.kanban)
-        elif section_name == "tracker":
-            self.stack.set_visible_child(self.tracker)
-        elif section_name == "wallpapers":
-            self.stack.set_visible_child(self.wallpapers)
-        elif section_name == "mixer":
-            self.stack.set_visible_child(self.mixer)
+        elif section_name in self.sections:
+            self.stack.set_visible_child(self.sections.get(section_name))
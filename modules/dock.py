@@ -15,6 +15,8 @@ from gi.repository import Gdk, GLib, Gtk
 
 import config.data as data
 from modules.corners import MyCorner
+from services.config import ConfigService
+from services.scheduler import PeriodicScheduler
 from utils.icon_resolver import IconResolver
 from widgets.wayland import WaylandWindow as Window
 
@@ -285,12 +287,13 @@ class Dock(Window):
         self.view.connect("drag-begin", self.on_drag_begin)
         self.view.connect("drag-end", self.on_drag_end)
 
+        scheduler = PeriodicScheduler.get_initial()
         if self.conn.ready:
             self.update_dock()
-            if not self.integrated_mode: GLib.timeout_add(500, self.check_occlusion_state)
+            if not self.integrated_mode: scheduler.add(self.check_occlusion_state, 0.5, name="dock-occlusion")
         else:
             self.conn.connect("event::ready", self.update_dock)
-            if not self.integrated_mode: self.conn.connect("event::ready", lambda *args: GLib.timeout_add(250, self.check_occlusion_state))
+            if not self.integrated_mode: self.conn.connect("event::ready", lambda *args: scheduler.add(self.check_occlusion_state, 0.5, name="dock-occlusion"))
 
         # Listen to window events to update dock when apps open/close
         self.conn.connect("event::openwindow", self.update_dock)
@@ -299,7 +302,10 @@ class Dock(Window):
         if not self.integrated_mode:
             self.conn.connect("event::workspace", self.check_hide)
         
-        GLib.timeout_add_seconds(2, self.check_config_change)
+        if not self.integrated_mode:
+            ConfigService.get_initial().connect_key(
+                "dock_always_show", lambda *_: self.on_always_show_changed()
+            )
             
     def _build_app_identifiers_map(self):
         identifiers = {}
@@ -754,20 +760,11 @@ class Dock(Window):
                 self.check_occlusion_state()
 
         GLib.idle_add(process_drag_end)
-    def check_config_change(self):
-        new_config = read_config()
-        if not self.integrated_mode:
-            new_always_show = data.DOCK_ALWAYS_SHOW 
-            if self.always_show != new_always_show:
-                self.always_show = new_always_show
-                self.check_occlusion_state() 
-
-        if new_config.get("pinned_apps", []) != self.config.get("pinned_apps", []):
-            self.config = new_config
-            self.pinned = self.config.get("pinned_apps", [])
-            self.update_app_map()
-            self.update_dock()
-        return True 
+    def on_always_show_changed(self):
+        new_always_show = ConfigService.get_initial().get_bool("dock_always_show")
+        if self.always_show != new_always_show:
+            self.always_show = new_always_show
+            self.check_occlusion_state()
 
     def update_pinned_apps_file(self):
         config_path = get_relative_path("../config/dock.json")
@@ -800,6 +797,9 @@ class Dock(Window):
         file_updated = self.update_pinned_apps_file()
         if file_updated and not skip_update:
             self.update_dock()
+        if file_updated:
+            # The docks of the other monitors reload the pinned apps
+            Dock.notify_config_change()
 
     @staticmethod
     def notify_config_change():
@@ -811,7 +811,7 @@ class Dock(Window):
         
         if not self.integrated_mode:
             previous_always_show = self.always_show
-            self.always_show = data.DOCK_ALWAYS_SHOW 
+            self.always_show = ConfigService.get_initial().get_bool("dock_always_show")
             
             if previous_always_show != self.always_show:
                 self.check_occlusion_state() 
@@ -1,9 +1,6 @@
-import os
 import subprocess
 
-import ijson
 from fabric.utils import remove_handler
-from fabric.utils.helpers import get_relative_path
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.entry import Entry
@@ -13,12 +10,14 @@ from gi.repository import Gdk
 
 import config.data as data
 import modules.icons as icons
+from utils.emoji_index import EmojiIndex
 
 vertical_mode = data.PANEL_THEME == "Panel" and (data.BAR_POSITION in ["Left", "Right"] or data.PANEL_POSITION in ["Start", "End"])
 
 emoji_rows = 3 if not vertical_mode else 9
 emoji_columns = 9 if not vertical_mode else 5
 
+
 class EmojiPicker(Box):
     def __init__(self, **kwargs):
         super().__init__(
@@ -36,7 +35,7 @@ class EmojiPicker(Box):
         self.total_pages = 0
 
         self._arranger_handler: int = 0
-        self._all_emojis = self._load_emoji_data()
+        self.index = EmojiIndex.get_initial()
 
         self.stack = Stack(
             name="viewport",
@@ -85,18 +84,6 @@ class EmojiPicker(Box):
         self.add(self.picker_box)
         self.show_all()
 
-    def _load_emoji_data(self):
-        emoji_data = {}
-        emoji_file_path = get_relative_path("../assets/emoji.json")
-        if not os.path.exists(emoji_file_path):
-            print(f"Emoji JSON file not found at: {emoji_file_path}")
-            return {}
-
-        with open(emoji_file_path, 'r') as f:
-            for emoji_char, emoji_info in ijson.kvitems(f, ''):
-                emoji_data[emoji_char] = emoji_info
-        return emoji_data
-
     def close_picker(self):
         self.stack.children = []
         self.selected_index = -1
@@ -114,11 +101,7 @@ class EmojiPicker(Box):
         self.selected_index = -1
         self.current_page_index = 0
 
-        self.filtered_emojis = [
-            (emoji_char, emoji_info)
-            for emoji_char, emoji_info in self._all_emojis.items()
-            if query.casefold() in (emoji_info.get("name", "") + " " + emoji_info.get("group", "")).casefold()
-        ]
+        self.filtered_emojis = self.index.search(query)
         self.total_pages = (len(self.filtered_emojis) + self.emojis_per_page - 1) // self.emojis_per_page if self.filtered_emojis else 0
 
         self.load_page(self.current_page_index)
@@ -140,12 +123,14 @@ class EmojiPicker(Box):
         grid_box = Box(name="emoji-grid-box", orientation="v", spacing=2)
 
         row_box = None
-        for i, (emoji_char, emoji_info) in enumerate(page_emojis):
+        for i, emoji_id in enumerate(page_emojis):
             if i % emoji_columns == 0:
                 row_box = Box(name="emoji-row-box", orientation="h", spacing=2)
                 grid_box.add(row_box)
             if row_box is not None:
-                row_box.add(self.bake_emoji_slot(emoji_char, emoji_info))
+                row_box.add(
+                    self.bake_emoji_slot(self.index.chars[emoji_id], self.index.names[emoji_id])
+                )
         page_box.add(grid_box)
         self.stack.add_named(page_box, f"page-{page_index}")
         self.stack.set_visible_child_name(f"page-{page_index}")
@@ -164,7 +149,7 @@ class EmojiPicker(Box):
     def resize_viewport(self):
         return False
 
-    def bake_emoji_slot(self, emoji_char: str, emoji_info: dict, **kwargs) -> Button:
+    def bake_emoji_slot(self, emoji_char: str, emoji_name: str, **kwargs) -> Button:
         button = Button(
             name="emoji-slot-button",
             child=Box(
@@ -183,7 +168,7 @@ class EmojiPicker(Box):
                     ),
                 ],
             ),
-            tooltip_text=emoji_info.get("name", "Unknown"),
+            tooltip_text=emoji_name or "Unknown",
             on_clicked=lambda *_: (self.copy_emoji_to_clipboard(emoji_char), self.close_picker()),
             **kwargs,
         )
@@ -317,5 +302,6 @@ class EmojiPicker(Box):
     def copy_emoji_to_clipboard(self, emoji_char: str):
         try:
             subprocess.run(["wl-copy"], input=emoji_char.encode('utf-8'), check=True)
+            self.index.mark_used(emoji_char)
         except subprocess.CalledProcessError as e:
             print(f"Clipboard copy failed: {e}")
@@ -6,7 +6,6 @@ import re
 import subprocess
 from collections.abc import Iterator
 
-import numpy as np
 from fabric.utils import (DesktopApp, exec_shell_command_async,
                           get_desktop_applications, idle_add, remove_handler)
 from fabric.utils.helpers import get_relative_path
@@ -23,6 +22,10 @@ import modules.icons as icons
 from modules.dock import Dock
 from modules.updater import run_updater
 from utils.conversion import Conversion
+from utils.lazy_import import lazy_import, load
+
+# Only the calculator needs numpy
+np = lazy_import("numpy")
 
 tooltip_settings = f"<b>Open {data.APP_NAME_CAP} Settings</b>"
 tooltip_close = "<b>Close</b>"
@@ -592,6 +595,8 @@ class AppLauncher(Box):
             # Update the history entry
             GLib.idle_add(self._update_conversion_result, text, result_str)
 
+        # Not imported by the thread, lazy imports are not thread-safe
+        load(lazy_import("requests"))
         GLib.Thread.new("conversion", do_conversion, None)
 
     def _update_conversion_result(self, text, result_str):
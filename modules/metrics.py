@@ -3,7 +3,6 @@ import logging
 import subprocess
 import time
 
-import psutil
 from fabric.core.fabricator import Fabricator
 from fabric.utils.helpers import invoke_repeater
 from fabric.widgets.box import Box
@@ -20,6 +19,10 @@ import config.data as data
 from modules.upower.upower import UPowerManager
 import modules.icons as icons
 from services.network import NetworkClient
+from services.scheduler import PeriodicScheduler
+from utils.lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,16 @@ class MetricsProvider:
     Class responsible for obtaining centralized CPU, memory, disk usage, and battery metrics.
     It updates periodically so that all widgets querying it display the same values.
     """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the MetricsProvider, created by the first widget that needs it."""
+        if MetricsProvider.instance is None:
+            MetricsProvider.instance = MetricsProvider()
+        return MetricsProvider.instance
+
     def __init__(self):
         self.gpu = []
         self.cpu = 0.0
@@ -41,21 +54,17 @@ class MetricsProvider:
         self.bat_time = 0
 
         self._gpu_update_running = False
-        self._gpu_update_counter = 0
+        self._gpu_info = None
 
-        GLib.timeout_add_seconds(2, self._update)
+        scheduler = PeriodicScheduler.get_initial()
+        scheduler.add(self._update, 2, name="metrics")
+        scheduler.add(self._update_gpu, 10, name="metrics-gpu")
 
     def _update(self):
         self.cpu = psutil.cpu_percent(interval=0)
         self.mem = psutil.virtual_memory().percent
         self.disk = [psutil.disk_usage(path).percent for path in data.BAR_METRICS_DISKS]
 
-        self._gpu_update_counter += 1
-        if self._gpu_update_counter >= 5:  # Update GPU every 10 seconds (5 * 2s)
-            self._gpu_update_counter = 0
-            if not self._gpu_update_running:
-                self._start_gpu_update_async()
-
         battery = self.upower.get_full_device_information(self.display_device)
         if battery is None:
             self.bat_percent = 0.0
@@ -68,6 +77,11 @@ class MetricsProvider:
 
         return True
 
+    def _update_gpu(self):
+        if not self._gpu_update_running:
+            self._start_gpu_update_async()
+        return True
+
     def _start_gpu_update_async(self):
         """Starts a new GLib thread to run nvtop in the background."""
         self._gpu_update_running = True
@@ -136,6 +150,12 @@ class MetricsProvider:
         return (self.bat_percent, self.bat_charging, self.bat_time)
 
     def get_gpu_info(self):
+        # The devices don't change at runtime: probe once for every bar and dashboard
+        if self._gpu_info is None:
+            self._gpu_info = self._probe_gpus()
+        return self._gpu_info
+
+    def _probe_gpus(self):
         try:
             result = subprocess.check_output(["nvtop", "-s"], text=True, timeout=5)
             return json.loads(result)
@@ -155,7 +175,6 @@ class MetricsProvider:
             logger.error(f"Unexpected error during GPU init: {e}")
             return []
 
-shared_provider = MetricsProvider()
 
 class SingularMetric:
     def __init__(self, id, name, icon):
@@ -200,7 +219,7 @@ class Metrics(Box):
         disks = [SingularMetric("disk", f"DISK ({path})" if len(data.BAR_METRICS_DISKS) != 1 else "DISK", icons.disk)
                  for path in data.BAR_METRICS_DISKS] if visible.get('disk', True) else []
 
-        gpu_info = shared_provider.get_gpu_info()
+        gpu_info = MetricsProvider.get_initial().get_gpu_info()
         gpus = [SingularMetric(f"gpu", f"GPU ({v['device_name']})" if len(gpu_info) != 1 else "GPU", icons.gpu)
                 for v in gpu_info] if visible.get('gpu', True) else []
 
@@ -225,10 +244,12 @@ class Metrics(Box):
         for x in self.scales:
             self.add(x)
 
-        GLib.timeout_add_seconds(2, self.update_status)
+        PeriodicScheduler.get_initial().add(
+            self.update_status, 2, widget=self, name="metrics-dashboard"
+        )
 
     def update_status(self):
-        cpu, mem, disks, gpus = shared_provider.get_metrics()
+        cpu, mem, disks, gpus = MetricsProvider.get_initial().get_metrics()
 
         if self.cpu:
             self.cpu.usage.value = cpu / 100.0
@@ -296,7 +317,7 @@ class MetricsSmall(Button):
         disks = [SingularMetricSmall("disk", f"DISK ({path})" if len(data.BAR_METRICS_DISKS) != 1 else "DISK", icons.disk)
                  for path in data.BAR_METRICS_DISKS] if visible.get('disk', True) else []
 
-        gpu_info = shared_provider.get_gpu_info()
+        gpu_info = MetricsProvider.get_initial().get_gpu_info()
         gpus = [SingularMetricSmall(f"gpu", f"GPU ({v['device_name']})" if len(gpu_info) != 1 else "GPU", icons.gpu)
                 for v in gpu_info] if visible.get('gpu', True) else []
 
@@ -322,7 +343,9 @@ class MetricsSmall(Button):
         self.connect("enter-notify-event", self.on_mouse_enter)
         self.connect("leave-notify-event", self.on_mouse_leave)
 
-        GLib.timeout_add_seconds(2, self.update_metrics)
+        PeriodicScheduler.get_initial().add(
+            self.update_metrics, 2, widget=self, name="metrics-small"
+        )
 
         self.hide_timer = None
         self.hover_counter = 0
@@ -368,7 +391,7 @@ class MetricsSmall(Button):
             return False
 
     def update_metrics(self):
-        cpu, mem, disks, gpus = shared_provider.get_metrics()
+        cpu, mem, disks, gpus = MetricsProvider.get_initial().get_metrics()
 
         if self.cpu:
             self.cpu.circle.set_value(cpu / 100.0)
@@ -442,14 +465,14 @@ class Battery(Button):
         self.connect("leave-notify-event", self.on_mouse_leave)
 
         self.batt_fabricator = Fabricator(
-            poll_from=lambda v: shared_provider.get_battery(),
+            poll_from=lambda v: MetricsProvider.get_initial().get_battery(),
             on_changed=lambda f, v: self.update_battery,
             interval=1000,
             stream=False,
             default_value=0
         )
         self.batt_fabricator.changed.connect(self.update_battery)
-        GLib.idle_add(self.update_battery, None, shared_provider.get_battery())
+        GLib.idle_add(self.update_battery, None, MetricsProvider.get_initial().get_battery())
 
         self.hide_timer = None
         self.hover_counter = 0
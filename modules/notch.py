@@ -20,12 +20,24 @@ from modules.player import PlayerSmall
 from modules.power import PowerMenu
 from modules.tmux import TmuxManager
 from modules.tools import Toolbox
+from services.config import ConfigService
+from services.scheduler import PeriodicScheduler
 from utils.icon_resolver import IconResolver
+from utils.lazy_modules import LazyModules, lazy_module
 from utils.occlusion import check_occlusion
 from widgets.wayland import WaylandWindow as Window
 
 
 class Notch(Window):
+    # Built the first time they are opened
+    launcher = lazy_module("launcher")
+    overview = lazy_module("overview")
+    emoji = lazy_module("emoji")
+    power = lazy_module("power")
+    tmux = lazy_module("tmux")
+    cliphist = lazy_module("cliphist")
+    tools = lazy_module("tools")
+
     def __init__(self, monitor_id: int = 0, **kwargs):
         self.monitor_id = monitor_id
         self.monitor_manager = None
@@ -160,7 +172,7 @@ class Notch(Window):
         self._all_apps = get_desktop_applications()
         self.app_identifiers = self._build_app_identifiers_map()
 
-        self.dashboard = Dashboard(notch=self)
+        self.dashboard = Dashboard.get_initial(self)
         self.nhistory = self.dashboard.widgets.notification_history
 
         self.applet_stack = self.dashboard.widgets.applet_stack
@@ -170,13 +182,6 @@ class Notch(Window):
         self.btdevices.set_visible(False)
         self.nwconnections.set_visible(False)
 
-        self.launcher = AppLauncher(notch=self)
-        self.overview = Overview(monitor_id=monitor_id)
-        self.emoji = EmojiPicker(notch=self)
-        self.power = PowerMenu(notch=self)
-        self.tmux = TmuxManager(notch=self)
-        self.cliphist = ClipHistory(notch=self)
-
         # Audio service initialization
         self.audio = Audio()
 
@@ -341,7 +346,6 @@ class Notch(Window):
         self.compact.connect("enter-notify-event", self.on_button_enter)
         self.compact.connect("leave-notify-event", self.on_button_leave)
 
-        self.tools = Toolbox(notch=self)
         self.stack = Stack(
             name="notch-content",
             v_expand=True,
@@ -354,16 +358,11 @@ class Notch(Window):
             transition_duration=250,
             children=[
                 self.compact,
-                self.launcher,
-                self.dashboard,
-                self.overview,
-                self.emoji,
-                self.power,
-                self.tools,
-                self.tmux,
-                self.cliphist,
             ],
         )
+        # The dashboard starts in the first notch and moves when another opens it
+        if self.dashboard.get_parent() is None:
+            self.claim_dashboard()
 
         if data.PANEL_THEME == "Panel":
             self.stack.add_style_class("panel")
@@ -375,17 +374,26 @@ class Notch(Window):
             data.PANEL_POSITION in ["Start", "End"] and data.PANEL_THEME == "Panel"
         ):
             self.compact.set_size_request(260, 40)
-            self.launcher.set_size_request(320, 635)
-            self.tmux.set_size_request(320, 635)
-            self.cliphist.set_size_request(320, 635)
             self.dashboard.set_size_request(410, 900)
+            list_size = (320, 635)
 
         else:
             self.compact.set_size_request(260, 40)
-            self.launcher.set_size_request(480, 244)
-            self.tmux.set_size_request(480, 244)
-            self.cliphist.set_size_request(480, 244)
             self.dashboard.set_size_request(1093, 472)
+            list_size = (480, 244)
+
+        def sized(widget):
+            widget.set_size_request(*list_size)
+            return widget
+
+        self.modules = LazyModules(self.stack)
+        self.modules.register("launcher", lambda: sized(AppLauncher(notch=self)))
+        self.modules.register("overview", lambda: Overview(monitor_id=monitor_id))
+        self.modules.register("emoji", lambda: EmojiPicker(notch=self))
+        self.modules.register("power", lambda: PowerMenu(notch=self))
+        self.modules.register("tools", lambda: Toolbox(notch=self))
+        self.modules.register("tmux", lambda: sized(TmuxManager(notch=self)))
+        self.modules.register("cliphist", lambda: sized(ClipHistory(notch=self)))
 
         self.stack.set_interpolate_size(True)
         self.stack.set_homogeneous(False)
@@ -487,6 +495,10 @@ class Notch(Window):
             self.add(self.notch_wrap)
         self.show_all()
 
+        prewarm = ConfigService.get_initial().get_list("prewarm_modules")
+        if prewarm:
+            self._prewarm_handler = self.connect("draw", self._on_first_draw, prewarm)
+
         # Connect audio signals after a short delay
         GLib.timeout_add(100, self._connect_audio_signals)
 
@@ -510,7 +522,9 @@ class Notch(Window):
         self._current_window_class = self._get_current_window_class()
 
         # Always enable occlusion detection for fullscreen windows
-        GLib.timeout_add(500, self._check_occlusion)
+        self._occlusion_job = PeriodicScheduler.get_initial().add(
+            self._check_occlusion, 0.5, name="notch-occlusion"
+        )
 
         if data.PANEL_THEME == "Notch":
             self.notch_revealer.set_reveal_child(True)
@@ -800,6 +814,13 @@ class Notch(Window):
             window.set_cursor(None)
         return True
 
+    def _on_first_draw(self, widget, cr, names):
+        """Build the modules listed in `prewarm_modules` once the notch is on screen."""
+        self.disconnect(self._prewarm_handler)
+        self.modules.prewarm(names)
+        self.dashboard.sections.prewarm(names)
+        return False
+
     def _on_realize(self, widget):
         """Ensure the notch window is raised above the bar."""
         self.get_window().raise_()
@@ -911,8 +932,19 @@ class Notch(Window):
 
         self._focused_monitor_result = None
     
+    def claim_dashboard(self):
+        """Move the shared dashboard into this notch."""
+        parent = self.dashboard.get_parent()
+        if parent is self.stack:
+            return
+        if parent is not None:
+            parent.remove(self.dashboard)
+        self.stack.add_named(self.dashboard, "dashboard")
+        self.dashboard.notch = self
+        self.dashboard.widgets.notch = self
+
     def _open_notch_internal(self, widget_name: str):
-        
+        self.claim_dashboard()
         self.notch_revealer.set_reveal_child(True)
         self.notch_box.add_style_class("open")
         self.stack.add_style_class("open")
@@ -961,18 +993,11 @@ class Notch(Window):
                 self.applet_stack.set_visible_child(self.nhistory)
                 return
 
-        dashboard_sections_map = {
-            "pins": self.dashboard.pins,
-            "kanban": self.dashboard.kanban,
-            "wallpapers": self.dashboard.wallpapers,
-            "mixer": self.dashboard.mixer,
-        }
-        if widget_name in dashboard_sections_map:
-            section_widget_instance = dashboard_sections_map[widget_name]
-
+        dashboard_sections = ["pins", "kanban", "wallpapers", "mixer"]
+        if widget_name in dashboard_sections:
             if (
                 is_dashboard_currently_visible
-                and self.dashboard.stack.get_visible_child() == section_widget_instance
+                and self.dashboard.stack.get_visible_child_name() == widget_name
             ):
                 self.close_notch()
                 return
@@ -983,43 +1008,40 @@ class Notch(Window):
 
         hide_bar_revealers = False
 
+        # Modules are only built when opened, so every reference is deferred
         widget_configs = {
-            "tmux": {"instance": self.tmux, "action": self.tmux.open_manager},
-            "cliphist": {
-                "instance": self.cliphist,
-                "action": lambda: GLib.idle_add(self.cliphist.open),
-            },
+            "tmux": {"action": lambda: self.tmux.open_manager()},
+            "cliphist": {"action": lambda: GLib.idle_add(self.cliphist.open)},
             "launcher": {
-                "instance": self.launcher,
-                "action": self.launcher.open_launcher,
+                "action": lambda: self.launcher.open_launcher(),
                 "focus": lambda: (
                     self.launcher.search_entry.set_text(""),
                     self.launcher.search_entry.grab_focus(),
                 ),
             },
             "emoji": {
-                "instance": self.emoji,
-                "action": self.emoji.open_picker,
+                "action": lambda: self.emoji.open_picker(),
                 "focus": lambda: (
                     self.emoji.search_entry.set_text(""),
                     self.emoji.search_entry.grab_focus(),
                 ),
             },
-            "overview": {"instance": self.overview, "hide_revealers": True},
-            "power": {"instance": self.power},
-            "tools": {"instance": self.tools},
+            "overview": {"hide_revealers": True},
+            "power": {},
+            "tools": {},
         }
 
         if widget_name in widget_configs:
             config = widget_configs[widget_name]
-            target_widget_on_stack = config["instance"]
             action_on_open = config.get("action")
             focus_action = config.get("focus")
             hide_bar_revealers = config.get("hide_revealers", False)
 
-            if current_stack_child == target_widget_on_stack:
+            opened = self.modules.peek(widget_name)
+            if opened is not None and current_stack_child == opened:
                 self.close_notch()
                 return
+            target_widget_on_stack = self.modules.get(widget_name)
         else:
             target_widget_on_stack = self.dashboard
             hide_bar_revealers = True
@@ -1039,7 +1061,7 @@ class Notch(Window):
             elif widget_name == "network_applet":
                 self.dashboard.go_to_section("widgets")
                 self.applet_stack.set_visible_child(self.nwconnections)
-            elif widget_name in dashboard_sections_map:
+            elif widget_name in dashboard_sections:
                 self.dashboard.go_to_section(widget_name)
             elif widget_name == "dashboard":
                 self.dashboard.go_to_section("widgets")
@@ -1232,9 +1254,9 @@ class Notch(Window):
         self._forced_occlusion = True
         self._prevent_occlusion = False
         self.notch_revealer.set_reveal_child(False)
-        # Start occlusion check timer if in vertical mode (left/right)
+        # Check right away instead of at the next tick if in vertical mode (left/right)
         if data.BAR_POSITION in ["Left", "Right"]:
-            GLib.timeout_add(100, self._check_occlusion)
+            self._occlusion_job.run_now()
     
     def restore_from_occlusion(self):
         """Restore notch from occlusion mode."""
@@ -1327,16 +1349,7 @@ class Notch(Window):
             "tmux",
         ]:
             self.stack.remove_style_class(style)
-        for w in [
-            self.launcher,
-            self.dashboard,
-            self.overview,
-            self.emoji,
-            self.power,
-            self.tools,
-            self.tmux,
-            self.cliphist,
-        ]:
+        for w in [self.dashboard, *self.modules.built()]:
             w.remove_style_class("open")
 
         self.stack.add_style_class("launcher")
@@ -1424,7 +1437,7 @@ class Notch(Window):
             self.stack.get_visible_child() == self.dashboard
             and self.dashboard.stack.get_visible_child() == self.dashboard.widgets
         ):
-            if self.stack.get_visible_child() == self.launcher:
+            if self.stack.get_visible_child() == self.modules.peek("launcher"):
                 return False
 
             keyval = event.keyval
@@ -1,7 +1,8 @@
-import json
 import locale
 import os
+import time
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
 
 from fabric.notifications.service import Notification, NotificationAction, Notifications
@@ -17,49 +18,50 @@ from loguru import logger
 
 import config.data as data
 import modules.icons as icons
+from services.config import ConfigService
+from services.notification_images import NotificationImageCache
+from services.notification_store import NotificationStore
 from widgets.image import CustomImage
 from widgets.wayland import WaylandWindow as Window
 
-PERSISTENT_DIR = f"/tmp/{data.APP_NAME}/notifications"
-PERSISTENT_HISTORY_FILE = os.path.join(PERSISTENT_DIR, "notification_history.json")
+HISTORY_PAGE_SIZE = 15
+# Distance from the bottom of the history (px) at which the next page loads
+HISTORY_LOAD_MORE_THRESHOLD = 200
+# Notifications from one app following its last popup within this window
+# (ms) are stacked
+BURST_WINDOW_MS = 300
+# Period (seconds) for the per-app popup rate limits
+RATE_LIMIT_WINDOW = 60
 
 
 # Get configurable app lists from settings
 def get_limited_apps_history():
-    config = data.load_config()
-    return config.get("limited_apps_history", ["Spotify"])
+    return ConfigService.get_initial().get_list("limited_apps_history")
 
 
 def get_history_ignored_apps():
-    config = data.load_config()
-    return config.get("history_ignored_apps", ["Hyprshot"])
+    return ConfigService.get_initial().get_list("history_ignored_apps")
+
+
+def get_notification_rate_limits():
+    return ConfigService.get_initial().get_dict("notification_rate_limits")
 
 
 def cache_notification_pixbuf(notification_box):
     """
-    Saves a scaled pixbuf (48x48) in the cache directory and returns the cache file path.
+    Stores the notification image in the shared image cache and returns its path.
+    Identical images share one file.
     """
     notification = notification_box.notification
     if notification.image_pixbuf:
-        os.makedirs(PERSISTENT_DIR, exist_ok=True)
-        cache_file = os.path.join(
-            PERSISTENT_DIR, f"notification_{notification_box.uuid}.png"
-        )
-        logger.debug(
-            f"Caching image for notification {notification.id} to: {cache_file}"
+        cache_file = NotificationImageCache.get_initial().acquire(
+            notification.image_pixbuf
         )
-        try:
-            scaled = notification.image_pixbuf.scale_simple(
-                48, 48, GdkPixbuf.InterpType.BILINEAR
-            )
-            scaled.savev(cache_file, "png", [], [])
-            logger.info(
-                f"Successfully cached image for notification {notification.id} to: {cache_file}"
+        if cache_file:
+            logger.debug(
+                f"Cached image for notification {notification.id} at: {cache_file}"
             )
-            return cache_file
-        except Exception as e:
-            logger.error(f"Error caching image for notification {notification.id}: {e}")
-            return None
+        return cache_file
     else:
         logger.debug(f"Notification {notification.id} has no image_pixbuf to cache.")
         return None
@@ -76,25 +78,15 @@ def load_scaled_pixbuf(notification_box, width, height):
         )
         return None
 
-    pixbuf = None
     if (
         hasattr(notification_box, "cached_image_path")
         and notification_box.cached_image_path
         and os.path.exists(notification_box.cached_image_path)
     ):
         try:
-            logger.debug(
-                f"Attempting to load cached image from: {notification_box.cached_image_path} for notification {notification.id}"
+            return NotificationImageCache.get_initial().load(
+                notification_box.cached_image_path, width, height
             )
-            pixbuf = GdkPixbuf.Pixbuf.new_from_file(notification_box.cached_image_path)
-            if pixbuf:
-                pixbuf = pixbuf.scale_simple(
-                    width, height, GdkPixbuf.InterpType.BILINEAR
-                )
-                logger.info(
-                    f"Successfully loaded cached image from: {notification_box.cached_image_path} for notification {notification.id}"
-                )
-            return pixbuf
         except Exception as e:
             logger.error(
                 f"Error loading cached image from {notification_box.cached_image_path} for notification {notification.id}: {e}"
@@ -196,6 +188,10 @@ class NotificationBox(Box):
         self._timeout_id = None
         self._container = None
         self.cached_image_path = None
+        # Whether the image reference belongs to a history entry
+        self.image_in_history = False
+        # Earlier notifications of the same burst, stacked under this one
+        self.grouped = []
 
         if self.timeout_ms > 0:
             self.start_timeout()
@@ -232,6 +228,12 @@ class NotificationBox(Box):
     def set_is_history(self, is_history):
         self._is_history = is_history
 
+    def set_grouped(self, notifications):
+        """Stack earlier notifications of a burst under this one."""
+        self.grouped = list(notifications)
+        self.group_count_label.set_markup(f"+{len(self.grouped)}")
+        self.group_count_label.set_visible(bool(self.grouped))
+
     def set_container(self, container):
         self._container = container
 
@@ -294,6 +296,9 @@ class NotificationBox(Box):
             max_chars_width=16,
             ellipsization="end",
         )
+        # Shown by set_grouped when earlier notifications are stacked here
+        self.group_count_label = Label(name="notification-group-count")
+        self.group_count_label.set_no_show_all(True)
         self.notification_body_label = (
             Label(
                 markup=notification.body,
@@ -327,6 +332,7 @@ class NotificationBox(Box):
                             v_align="center",
                         ),
                         self.notification_app_name_label_content,
+                        self.group_count_label,
                     ],
                 ),
                 self.notification_body_label,
@@ -412,19 +418,9 @@ class NotificationBox(Box):
         logger.debug(
             f"NotificationBox destroy called for notification: {self.notification.id}, from_history_delete: {from_history_delete}, is_history: {self._is_history}"
         )
-        if (
-            hasattr(self, "cached_image_path")
-            and self.cached_image_path
-            and os.path.exists(self.cached_image_path)
-            and (not self._is_history or from_history_delete)
-        ):
-            try:
-                os.remove(self.cached_image_path)
-                logger.info(f"Deleted cached image: {self.cached_image_path}")
-            except Exception as e:
-                logger.error(
-                    f"Error deleting cached image {self.cached_image_path}: {e}"
-                )
+        # History references are released by NotificationHistory with the entry
+        if not self._destroyed and self.cached_image_path and not self.image_in_history:
+            NotificationImageCache.get_initial().release(self.cached_image_path)
         self._destroyed = True
         self.stop_timeout()
         super().destroy()
@@ -526,10 +522,21 @@ class NotificationHistory(Box):
             children=[self.notifications_list, self.no_notifications_box],
         )
         self.scrolled_window.add_with_viewport(self.scrolled_window_viewport_box)
-        self.persistent_notifications = []
+        self.store = NotificationStore.get_initial()
+        self.image_cache = NotificationImageCache.get_initial()
+        self.store.connect_compacted(self.image_cache.sync_history)
+        # Date separators by day, and notes whose widgets were released
+        # when the panel was hidden (newest first, older than all rendered)
+        self._separators = {}
+        self._unrendered_notes = []
+        self._load_more_id = None
+        vadjustment = self.scrolled_window.get_vadjustment()
+        vadjustment.connect("value-changed", self._on_scroll)
+        vadjustment.connect("changed", self._on_scroll)
+        self.connect("unmap", lambda *_: self._release_offscreen())
         self.add(self.history_header)
         self.add(self.scrolled_window)
-        GLib.idle_add(self._load_persistent_history().__next__)
+        GLib.idle_add(self._load_persistent_history)
 
     def get_ordinal(self, n):
         if 11 <= (n % 100) <= 13:
@@ -590,34 +597,93 @@ class NotificationHistory(Box):
         )
 
     def rebuild_with_separators(self):
-        GLib.idle_add(self._do_rebuild_with_separators)
+        """Refresh separator labels ("Today" becomes "Yesterday" at midnight)."""
+        for day, separator in self._separators.items():
+            label = separator.get_children()[0]
+            label.set_label(
+                self.get_date_header(datetime.combine(day, datetime.min.time()))
+            )
 
-    def _do_rebuild_with_separators(self):
-        children = list(self.notifications_list.get_children())
-        for child in children:
-            self.notifications_list.remove(child)
+    def _attach_container(self, container, at_top=False):
+        """Place a container under its date separator without rebuilding the list.
 
-        current_date_header = None
-        last_date_header = None
-        for container in sorted(
-            self.containers, key=lambda x: x.arrival_time, reverse=True
+        New notifications go on top; pages of older history are appended.
+        """
+        day = container.arrival_time.date()
+        separator = self._separators.get(day)
+        if separator is None:
+            separator = self.create_date_separator(
+                self.get_date_header(container.arrival_time)
+            )
+            self._separators[day] = separator
+            self.notifications_list.add(separator)
+            if at_top:
+                self.notifications_list.reorder_child(separator, 0)
+        self.notifications_list.add(container)
+        if at_top:
+            self.containers.insert(0, container)
+            position = self.notifications_list.get_children().index(separator) + 1
+            self.notifications_list.reorder_child(container, position)
+        else:
+            self.containers.append(container)
+        separator.show_all()
+        container.show_all()
+        self.update_no_notifications_label_visibility()
+
+    def _detach_container(self, container):
+        """Remove a container and its date separator if it was the last of its day."""
+        if container in self.containers:
+            self.containers.remove(container)
+        if container.get_parent() is self.notifications_list:
+            self.notifications_list.remove(container)
+        day = container.arrival_time.date()
+        if not any(c.arrival_time.date() == day for c in self.containers):
+            separator = self._separators.pop(day, None)
+            if separator is not None:
+                self.notifications_list.remove(separator)
+                separator.destroy()
+        self.update_no_notifications_label_visibility()
+        # Refill from older history when deletions leave the page short
+        if (
+            len(self.containers) < HISTORY_PAGE_SIZE
+            and self._load_more_id is None
+            and self._has_more()
         ):
-            arrival_time = container.arrival_time
-            date_header = self.get_date_header(arrival_time)
-            if date_header != current_date_header:
-                sep = self.create_date_separator(date_header)
-                self.notifications_list.add(sep)
-                current_date_header = date_header
-                last_date_header = date_header
-            self.notifications_list.add(container)
-
-        if not self.containers and last_date_header:
-            for child in list(self.notifications_list.get_children()):
-                if child.get_name() == "notif-date-sep":
-                    self.notifications_list.remove(child)
-
-        self.notifications_list.show_all()
+            self._load_more_id = GLib.idle_add(self._load_next_page)
+
+    def _has_more(self):
+        return bool(self._unrendered_notes) or not self.store.exhausted
+
+    def _on_scroll(self, adjustment):
+        near_bottom = (
+            adjustment.get_value() + adjustment.get_page_size()
+            >= adjustment.get_upper() - HISTORY_LOAD_MORE_THRESHOLD
+        )
+        if near_bottom and self._load_more_id is None and self._has_more():
+            self._load_more_id = GLib.idle_add(self._load_next_page)
+
+    def _load_next_page(self):
+        self._load_more_id = None
+        notes = self._unrendered_notes[:HISTORY_PAGE_SIZE]
+        del self._unrendered_notes[:HISTORY_PAGE_SIZE]
+        if len(notes) < HISTORY_PAGE_SIZE:
+            notes += self.store.load_page(HISTORY_PAGE_SIZE - len(notes))
+        for note in notes:
+            self._add_historical_notification(note)
         self.update_no_notifications_label_visibility()
+        return False
+
+    def _release_offscreen(self):
+        """Drop widgets beyond the first page while hidden; their notes stay in memory."""
+        extra = self.containers[HISTORY_PAGE_SIZE:]
+        if not extra:
+            return
+        self._unrendered_notes = [
+            note for c in extra for note in self._container_notes(c)
+        ] + self._unrendered_notes
+        for container in extra:
+            self._detach_container(container)
+            container.destroy()
 
     def on_do_not_disturb_changed(self, switch, pspec):
         self.do_not_disturb_enabled = switch.get_active()
@@ -626,6 +692,9 @@ class NotificationHistory(Box):
         )
 
     def clear_history(self, *args):
+        if self._load_more_id is not None:
+            GLib.source_remove(self._load_more_id)
+            self._load_more_id = None
         for child in self.notifications_list.get_children()[:]:
             container = child
             notif_box = (
@@ -638,70 +707,29 @@ class NotificationHistory(Box):
             self.notifications_list.remove(child)
             child.destroy()
 
-        if os.path.exists(PERSISTENT_HISTORY_FILE):
-            try:
-                os.remove(PERSISTENT_HISTORY_FILE)
-                logger.info("Notification history cleared and persistent file deleted.")
-            except Exception as e:
-                logger.error(f"Error deleting persistent history file: {e}")
-        self.persistent_notifications = []
+        self.image_cache.clear_history(self.store.clear())
+        logger.info("Notification history cleared.")
         self.containers = []
-        self.rebuild_with_separators()
+        self._separators = {}
+        self._unrendered_notes = []
+        self.update_no_notifications_label_visibility()
 
     def _load_persistent_history(self):
-        if not os.path.exists(PERSISTENT_DIR):
-            os.makedirs(PERSISTENT_DIR, exist_ok=True)
-        if os.path.exists(PERSISTENT_HISTORY_FILE):
-            try:
-                with open(PERSISTENT_HISTORY_FILE, "r") as f:
-                    self.persistent_notifications = json.load(f)
-                for note in reversed(self.persistent_notifications):
-                    self._add_historical_notification(note)
-                    yield True
-            except Exception as e:
-                logger.error(f"Error loading persistent history: {e}")
-        GLib.idle_add(self.update_no_notifications_label_visibility)
-        self._cleanup_orphan_cached_images()
+        # Only the most recent page; older pages load when scrolled into view
+        self._load_next_page()
         self.schedule_midnight_update()
-
-    def _save_persistent_history(self):
-        try:
-            with open(PERSISTENT_HISTORY_FILE, "w") as f:
-                json.dump(self.persistent_notifications, f)
-        except Exception as e:
-            logger.error(f"Error saving persistent history: {e}")
+        return False
 
     def delete_historical_notification(self, note_id, container):
         if hasattr(container, "notification_box"):
             notif_box = container.notification_box
             notif_box.destroy(from_history_delete=True)
 
-        target_note_id_str = str(note_id)
-
-        new_persistent_notifications = []
-        removed_from_list = False
-        for note_in_list in self.persistent_notifications:
-            current_note_id_str = str(note_in_list.get("id"))
-            if current_note_id_str == target_note_id_str:
-                removed_from_list = True
-
-                continue
-            new_persistent_notifications.append(note_in_list)
-
-        if removed_from_list:
-            self.persistent_notifications = new_persistent_notifications
-            logger.info(
-                f"Notification with ID {target_note_id_str} was marked for removal from persistent_notifications list."
-            )
-        else:
-            logger.warning(
-                f"Notification with ID {target_note_id_str} was NOT found in persistent_notifications list. The list remains unchanged."
-            )
-
-        self._save_persistent_history()
+        self._release_image(container.note)
+        self.store.delete([note_id])
+        logger.info(f"Notification with ID {note_id} removed from history.")
+        self._detach_container(container)
         container.destroy()
-        self.containers = [c for c in self.containers if c != container]
-        self.rebuild_with_separators()
 
     def _add_historical_notification(self, note):
         hist_notif = HistoricalNotification(
@@ -717,6 +745,7 @@ class NotificationHistory(Box):
         hist_box = NotificationBox(hist_notif, timeout_ms=0)
         hist_box.uuid = hist_notif.id
         hist_box.cached_image_path = hist_notif.cached_image_path
+        hist_box.image_in_history = True
         hist_box.set_is_history(True)
         for child in hist_box.get_children():
             if child.get_name() == "notification-action-buttons":
@@ -728,6 +757,7 @@ class NotificationHistory(Box):
             h_expand=True,
         )
         container.notification_box = hist_box
+        container.note = note
         try:
             arrival = datetime.fromisoformat(hist_notif.timestamp)
         except Exception:
@@ -837,9 +867,8 @@ class NotificationHistory(Box):
             ],
         )
         container.add(content_box)
-        self.containers.insert(0, container)
-        self.rebuild_with_separators()
-        self.update_no_notifications_label_visibility()
+        # Pages arrive newest first, so older notes go to the end
+        self._attach_container(container)
 
     def add_notification(self, notification_box):
         app_name = notification_box.notification.app_name
@@ -853,37 +882,27 @@ class NotificationHistory(Box):
         if app_name in get_limited_apps_history():
             self.clear_history_for_app(app_name)
 
-        if len(self.containers) >= 50:
-            oldest_container = self.containers.pop()
-            if (
-                hasattr(oldest_container, "notification_box")
-                and hasattr(oldest_container.notification_box, "cached_image_path")
-                and oldest_container.notification_box.cached_image_path
-                and os.path.exists(oldest_container.notification_box.cached_image_path)
-            ):
-                try:
-                    os.remove(oldest_container.notification_box.cached_image_path)
-                    logger.info(
-                        f"Deleted cached image of oldest notification due to history limit: {oldest_container.notification_box.cached_image_path}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error deleting cached image of oldest notification: {e}"
-                    )
+        if len(self.containers) >= data.NOTIFICATION_HISTORY_LIMIT:
+            oldest_container = self.containers[-1]
+            self._detach_container(oldest_container)
+            for note in self._container_notes(oldest_container):
+                self._release_image(note)
             oldest_container.destroy()
 
         def on_container_destroy(container):
+            if container not in self.containers:
+                return
             if (
                 hasattr(container, "_timestamp_timer_id")
                 and container._timestamp_timer_id
             ):
                 GLib.source_remove(container._timestamp_timer_id)
-            if hasattr(container, "notification_box"):
-                notif_box = container.notification_box
+            notes = self._container_notes(container)
+            for note in notes:
+                self._release_image(note)
+            self.store.delete([note["id"] for note in notes])
+            self._detach_container(container)
             container.destroy()
-            self.containers.remove(container)
-            self.rebuild_with_separators()
-            self.update_no_notifications_label_visibility()
 
         container = Box(
             name="notification-container",
@@ -1000,67 +1019,70 @@ class NotificationHistory(Box):
             "clicked", lambda *_: on_container_destroy(container)
         )
         container.add(hist_box)
-        self.containers.insert(0, container)
-        self.rebuild_with_separators()
-        self._append_persistent_notification(notification_box, container.arrival_time)
-        self.update_no_notifications_label_visibility()
+        # Stacked notifications are stored individually, oldest first
+        container.group_notes = []
+        if app_name not in get_limited_apps_history():
+            for notification in notification_box.grouped:
+                note = self._append_grouped_notification(
+                    notification, container.arrival_time
+                )
+                container.group_notes.insert(0, note)
+        if container.group_notes:
+            self.current_notif_summary_box.add(
+                Label(
+                    name="notification-group-count",
+                    markup=f"+{len(container.group_notes)}",
+                )
+            )
+        container.note = self._append_persistent_notification(
+            notification_box, container.arrival_time
+        )
+        self._attach_container(container, at_top=True)
 
-    def _append_persistent_notification(self, notification_box, arrival_time):
+    def _persist_notification(self, note_id, notification, arrival_time, image_path):
         note = {
-            "id": notification_box.uuid,
-            "app_icon": notification_box.notification.app_icon,
-            "summary": notification_box.notification.summary,
-            "body": notification_box.notification.body,
-            "app_name": notification_box.notification.app_name,
+            "id": note_id,
+            "app_icon": notification.app_icon,
+            "summary": notification.summary,
+            "body": notification.body,
+            "app_name": notification.app_name,
             "timestamp": arrival_time.isoformat(),
-            "cached_image_path": notification_box.cached_image_path,
+            "cached_image_path": image_path,
         }
-        self.persistent_notifications.insert(0, note)
-        self.persistent_notifications = self.persistent_notifications[:50]
-        self._save_persistent_history()
-
-    def _cleanup_orphan_cached_images(self):
-        logger.debug("Starting orphan cached image cleanup.")
-        if not os.path.exists(PERSISTENT_DIR):
-            logger.debug("Cache directory does not exist, skipping cleanup.")
-            return
+        self.store.append(note)
+        # The image now belongs to the history entry, not to the popup
+        self.image_cache.promote(image_path, note_id)
+        return note
 
-        cached_files = [
-            f
-            for f in os.listdir(PERSISTENT_DIR)
-            if f.startswith("notification_") and f.endswith(".png")
-        ]
-        if not cached_files:
-            logger.debug("No cached image files found, skipping cleanup.")
-            return
+    def _append_persistent_notification(self, notification_box, arrival_time):
+        note = self._persist_notification(
+            notification_box.uuid,
+            notification_box.notification,
+            arrival_time,
+            notification_box.cached_image_path,
+        )
+        notification_box.image_in_history = True
+        return note
 
-        history_uuids = {
-            note.get("id") for note in self.persistent_notifications if note.get("id")
-        }
-        deleted_count = 0
-        for cached_file in cached_files:
-            try:
-                uuid_from_filename = cached_file[len("notification_") : -len(".png")]
-                if uuid_from_filename not in history_uuids:
-                    cache_file_path = os.path.join(PERSISTENT_DIR, cached_file)
-                    os.remove(cache_file_path)
-                    logger.info(f"Deleted orphan cached image: {cache_file_path}")
-                    deleted_count += 1
-                else:
-                    logger.debug(
-                        f"Cached image {cached_file} found in history, keeping it."
-                    )
-            except Exception as e:
-                logger.error(
-                    f"Error processing cached file {cached_file} during cleanup: {e}"
-                )
+    def _append_grouped_notification(self, notification, arrival_time):
+        """Persist a stacked notification without building a widget for it."""
+        image_path = (
+            self.image_cache.acquire(notification.image_pixbuf)
+            if notification.image_pixbuf
+            else None
+        )
+        return self._persist_notification(
+            str(uuid.uuid4()), notification, arrival_time, image_path
+        )
 
-        if deleted_count > 0:
-            logger.info(
-                f"Orphan cached image cleanup finished. Deleted {deleted_count} images."
-            )
-        else:
-            logger.info("Orphan cached image cleanup finished. No orphan images found.")
+    @staticmethod
+    def _container_notes(container):
+        return [container.note, *getattr(container, "group_notes", [])]
+
+    def _release_image(self, note):
+        self.image_cache.release(
+            note.get("cached_image_path"), from_history=True, note_id=note.get("id")
+        )
 
     def update_no_notifications_label_visibility(self):
         has_notifications = bool(self.containers)
@@ -1070,44 +1092,29 @@ class NotificationHistory(Box):
     def clear_history_for_app(self, app_name):
         """Clears all notifications in history for a specific app."""
         containers_to_remove = []
-        persistent_notes_to_remove_ids = set()
         for container in list(self.containers):
             if (
                 hasattr(container, "notification_box")
                 and container.notification_box.notification.app_name == app_name
             ):
                 containers_to_remove.append(container)
-                persistent_notes_to_remove_ids.add(container.notification_box.uuid)
 
         for container in containers_to_remove:
-            if (
-                hasattr(container, "notification_box")
-                and hasattr(container.notification_box, "cached_image_path")
-                and container.notification_box.cached_image_path
-                and os.path.exists(container.notification_box.cached_image_path)
-            ):
-                try:
-                    os.remove(container.notification_box.cached_image_path)
-                    logger.info(
-                        f"Deleted cached image of replaced history notification: {container.notification_box.cached_image_path}"
-                    )
-                except Exception as e:
-                    logger.error(
-                        f"Error deleting cached image of replaced history notification: {e}"
-                    )
-            self.containers.remove(container)
-            self.notifications_list.remove(container)
+            for note in self._container_notes(container):
+                self._release_image(note)
+            self._detach_container(container)
             container.notification_box.destroy(from_history_delete=True)
             container.destroy()
 
-        self.persistent_notifications = [
-            note
-            for note in self.persistent_notifications
-            if note.get("id") not in persistent_notes_to_remove_ids
-        ]
-        self._save_persistent_history()
-        self.rebuild_with_separators()
-        self.update_no_notifications_label_visibility()
+        # A single tombstone also covers pages that were never rendered
+        remaining = []
+        for note in self._unrendered_notes:
+            if note.get("app_name") == app_name:
+                self._release_image(note)
+            else:
+                remaining.append(note)
+        self._unrendered_notes = remaining
+        self.store.delete_app(app_name)
 
 
 class NotificationContainer(Box):
@@ -1192,26 +1199,76 @@ class NotificationContainer(Box):
         self.current_index = 0
         self.update_navigation_buttons()
         self._destroyed_notifications = set()
+        # app name -> notifications that followed its popup in the current
+        # burst window
+        self._incoming = {}
+        self._ingest_id = None
+        # app name -> monotonic times of recent popups, for rate limiting
+        self._popup_times = {}
 
     def on_new_notification(self, fabric_notif, id):
+        notification = fabric_notif.get_notification_from_id(id)
+        followers = self._incoming.get(notification.app_name)
+        if followers is None:
+            # The first one of a burst pops up right away
+            self._incoming[notification.app_name] = []
+            self._show_notification(notification, [])
+        else:
+            followers.append(notification)
+        if self._ingest_id is None:
+            self._ingest_id = GLib.timeout_add(BURST_WINDOW_MS, self._flush_incoming)
+
+    def _flush_incoming(self):
+        self._ingest_id = None
+        incoming, self._incoming = self._incoming, {}
+        for notifications in incoming.values():
+            if notifications:
+                self._show_notification(notifications[-1], notifications[:-1])
+        return False
+
+    @staticmethod
+    def _close_grouped(grouped):
+        # Folded into a newer one, so their senders learn they are gone
+        for notification in grouped:
+            notification.close("undefined")
+
+    def _allow_popup(self, app_name):
+        limit = get_notification_rate_limits().get(app_name)
+        if not limit:
+            return True
+        now = time.monotonic()
+        times = self._popup_times.setdefault(app_name, deque())
+        while times and now - times[0] > RATE_LIMIT_WINDOW:
+            times.popleft()
+        if len(times) >= limit:
+            return False
+        times.append(now)
+        return True
+
+    def _show_notification(self, notification, grouped):
+        """Show `notification` with the earlier ones of its burst stacked under it."""
         notification_history_instance = self.notification_history
+        app_name = notification.app_name
+        new_box = NotificationBox(notification)
+        new_box.set_grouped(grouped)
         if notification_history_instance.do_not_disturb_enabled:
             logger.info(
                 "Do Not Disturb mode enabled: adding notification directly to history."
             )
-            notification = fabric_notif.get_notification_from_id(id)
-            new_box = NotificationBox(notification)
-            if notification.image_pixbuf:
-                cache_notification_pixbuf(new_box)
             notification_history_instance.add_notification(new_box)
+            self._close_grouped(grouped)
+            return
+        if not self._allow_popup(app_name):
+            logger.info(
+                f"Popup rate limit reached for {app_name}: adding notification directly to history."
+            )
+            notification_history_instance.add_notification(new_box)
+            self._close_grouped(grouped)
             return
 
-        notification = fabric_notif.get_notification_from_id(id)
-        new_box = NotificationBox(notification)
         new_box.set_container(self)
         notification.connect("closed", self.on_notification_closed)
 
-        app_name = notification.app_name
         if app_name in get_limited_apps_history():
             notification_history_instance.clear_history_for_app(app_name)
 
@@ -1228,7 +1285,7 @@ class NotificationContainer(Box):
                 self.stack.remove(old_notification_box)
                 old_notification_box.destroy()
 
-                self.stack.add_named(new_box, str(id))
+                self.stack.add_named(new_box, str(notification.id))
                 self.notifications.append(new_box)
                 self.current_index = len(self.notifications) - 1
                 self.stack.set_visible_child(new_box)
@@ -1240,7 +1297,7 @@ class NotificationContainer(Box):
                     self.notifications.pop(0)
                     if self.current_index > 0:
                         self.current_index -= 1
-                self.stack.add_named(new_box, str(id))
+                self.stack.add_named(new_box, str(notification.id))
                 self.notifications.append(new_box)
                 self.current_index = len(self.notifications) - 1
                 self.stack.set_visible_child(new_box)
@@ -1252,7 +1309,7 @@ class NotificationContainer(Box):
                 self.notifications.pop(0)
                 if self.current_index > 0:
                     self.current_index -= 1
-            self.stack.add_named(new_box, str(id))
+            self.stack.add_named(new_box, str(notification.id))
             self.notifications.append(new_box)
             self.current_index = len(self.notifications) - 1
             self.stack.set_visible_child(new_box)
@@ -1262,6 +1319,7 @@ class NotificationContainer(Box):
         self.main_revealer.show_all()
         self.main_revealer.set_reveal_child(True)
         self.update_navigation_buttons()
+        self._close_grouped(grouped)
 
     def show_previous(self, *args):
         if self.current_index > 0:
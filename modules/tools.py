@@ -1,15 +1,18 @@
+import json
 import os
-import subprocess
 
+from fabric.hyprland.widgets import get_hyprland_connection
 from fabric.utils.helpers import exec_shell_command_async, get_relative_path
 from fabric.widgets.box import Box
 from fabric.widgets.button import Button
 from fabric.widgets.label import Label
-from gi.repository import Gdk, GLib
+from gi.repository import Gdk
 from loguru import logger
 
 import config.data as data
 import modules.icons as icons
+from services.process_watch import ProcessWatcher
+from services.scheduler import PeriodicScheduler
 
 SCREENSHOT_SCRIPT = get_relative_path("../scripts/screenshot.sh")
 POMODORO_SCRIPT = get_relative_path("../scripts/pomodoro.sh")
@@ -232,9 +235,13 @@ class Toolbox(Box):
 
         self.show_all()
 
-        self.recorder_timer_id = GLib.timeout_add_seconds(2, self.update_screenrecord_state)
-        self.gamemode_updater = GLib.timeout_add_seconds(2, self.gamemode_check)
-        self.pomodoro_updater = GLib.timeout_add_seconds(2, self.pomodoro_check)
+        processes = ProcessWatcher.get_initial()
+        processes.watch("gpu-screen-recorder", self._update_screenrecord_ui, full=True)
+        processes.watch("pomodoro.sh", self._update_pomodoro_ui, full=True)
+        # Only polled while the toolbox is on screen, and right when it shows up
+        self.gamemode_job = PeriodicScheduler.get_initial().add(
+            self.gamemode_check, 2, widget=self, name="toolbox-gamemode"
+        )
 
     def close_menu(self):
         self.notch.close_notch()
@@ -324,30 +331,14 @@ class Toolbox(Box):
         exec_shell_command_async(f"bash -c 'nohup bash {POMODORO_SCRIPT} > /dev/null 2>&1 & disown'")
         self.close_menu()
 
-    def pomodoro_check(self):
-        """Check pomodoro status using proper background threading"""
-        GLib.Thread.new("pomodoro-check", self._pomodoro_check_thread, None)
-        return True
-    
-    def _pomodoro_check_thread(self, user_data):
-        """Background thread to check pomodoro status"""
-        try:
-            result = subprocess.run("pgrep -f pomodoro.sh", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            running = result.returncode == 0
-        except Exception:
-            running = False
-
-        GLib.idle_add(self._update_pomodoro_ui, running)
-    
     def _update_pomodoro_ui(self, running):
-        """Update pomodoro UI from main thread"""
+        """Update pomodoro UI when pomodoro.sh starts or exits"""
         if running:
             self.btn_pomodoro.get_child().set_markup(icons.timer_on)
             self.btn_pomodoro.add_style_class("pomodoro")
         else:
             self.btn_pomodoro.get_child().set_markup(icons.timer_off)
             self.btn_pomodoro.remove_style_class("pomodoro")
-        return False
 
     def ocr(self, *args):
         exec_shell_command_async(f"bash {OCR_SCRIPT} s")
@@ -359,19 +350,15 @@ class Toolbox(Box):
         self.close_menu()
 
     def gamemode_check(self):
-        """Check gamemode status using proper background threading"""
-        GLib.Thread.new("gamemode-check", self._gamemode_check_thread, None)
-        return True
-    
-    def _gamemode_check_thread(self, user_data):
-        """Background thread to check gamemode status"""
+        """Check gamemode status, i.e. animations disabled (see gamemode.sh), over the Hyprland socket"""
         try:
-            result = subprocess.run(f"bash {GAMEMODE_SCRIPT} check", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            enabled = result.stdout == b't\n'
+            reply = get_hyprland_connection().send_command("j/getoption animations:enabled").reply
+            enabled = json.loads(reply.decode()).get("int") == 0
         except Exception:
             enabled = False
 
-        GLib.idle_add(self._update_gamemode_ui, enabled)
+        self._update_gamemode_ui(enabled)
+        return True
     
     def _update_gamemode_ui(self, enabled):
         """Update gamemode UI from main thread"""
@@ -379,7 +366,6 @@ class Toolbox(Box):
             self.btn_gamemode.get_child().set_markup(icons.gamemode_off)
         else:
             self.btn_gamemode.get_child().set_markup(icons.gamemode)
-        return False
 
     def colorpicker(self, button, event):
         if event.type == Gdk.EventType.BUTTON_PRESS:
@@ -409,30 +395,14 @@ class Toolbox(Box):
             return True
         return False
 
-    def update_screenrecord_state(self):
-        """Check screen recording status using proper background threading"""
-        GLib.Thread.new("screenrecord-check", self._screenrecord_check_thread, None)
-        return True
-    
-    def _screenrecord_check_thread(self, user_data):
-        """Background thread to check screen recording status"""
-        try:
-            result = subprocess.run("pgrep -f gpu-screen-recorder", shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-            running = result.returncode == 0
-        except Exception:
-            running = False
-
-        GLib.idle_add(self._update_screenrecord_ui, running)
-    
     def _update_screenrecord_ui(self, running):
-        """Update screen recording UI from main thread"""
+        """Update screen recording UI when gpu-screen-recorder starts or exits"""
         if running:
             self.btn_screenrecord.get_child().set_markup(icons.stop)
             self.btn_screenrecord.add_style_class("recording")
         else:
             self.btn_screenrecord.get_child().set_markup(icons.screenrecord)
             self.btn_screenrecord.remove_style_class("recording")
-        return False
 
     def open_screenshots_folder(self, *args):
         screenshots_dir = os.path.join(os.environ.get('XDG_PICTURES_DIR', 
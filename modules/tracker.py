@@ -15,6 +15,7 @@ from fabric.widgets.entry import Entry
 from fabric.widgets.eventbox import EventBox
 
 import modules.icons as icons
+from services.scheduler import PeriodicScheduler
 
 gi.require_version('Gtk', '3.0')
 from gi.repository import GLib, Gtk
@@ -39,14 +40,14 @@ class Tracker(Box):
         self.time_logs = []
         self.reminders = []
         self.active_timer = None
-        self.timer_source_id = None
+        self.timer_job = None
         self.is_timer_running = False
         self.next_task_id = 1  # Never reuse task IDs
         self.selected_task_id = None
         self.reminder_source_ids = {}
         self.last_tick_time = None
         self._suppress_combo_handler = False
-        self.reminder_tick_id = None
+        self.reminder_tick_job = None
         
         self.load_state()
         self._ensure_active_task_valid()
@@ -432,7 +433,7 @@ class Tracker(Box):
                 self.active_timer = None
                 self.is_timer_running = False
                 self.selected_task_id = None
-                self.timer_source_id = None
+                self.timer_job = None
                 try:
                     self.send_notification('Tracker', 'Saved timer cleared because its task is missing')
                 except Exception:
@@ -487,9 +488,9 @@ class Tracker(Box):
     
     def pause_timer(self):
         """Pause timer."""
-        if self.timer_source_id:
-            GLib.source_remove(self.timer_source_id)
-            self.timer_source_id = None
+        if self.timer_job:
+            self.timer_job.remove()
+            self.timer_job = None
         
         if self.active_timer and self.active_timer.get('start_time'):
             start = datetime.fromisoformat(self.active_timer['start_time'])
@@ -506,9 +507,9 @@ class Tracker(Box):
     def stop_timer(self):
         """Stop timer and log time."""
         # Stop the timer loop first
-        if self.timer_source_id:
-            GLib.source_remove(self.timer_source_id)
-            self.timer_source_id = None
+        if self.timer_job:
+            self.timer_job.remove()
+            self.timer_job = None
         
         if self.active_timer:
             # Calculate duration
@@ -566,9 +567,9 @@ class Tracker(Box):
     
     def start_timer_loop(self):
         """Start timer update loop."""
-        if self.timer_source_id:
-            GLib.source_remove(self.timer_source_id)
-            self.timer_source_id = None
+        if self.timer_job:
+            self.timer_job.remove()
+            self.timer_job = None
         self.last_tick_time = datetime.now()
         
         def tick():
@@ -611,7 +612,15 @@ class Tracker(Box):
             self.timer_display.set_label(f"{mins}:{secs:02d}")
             return True
         
-        self.timer_source_id = GLib.timeout_add_seconds(1, tick)
+        # Every minute while hidden, often enough for the idle gap detection
+        self.timer_job = PeriodicScheduler.get_initial().add(
+            tick,
+            1,
+            hidden_interval=60,
+            battery_interval=1,
+            widget=self.timer_display,
+            name="tracker-timer",
+        )
         tick()  # Update immediately
 
     def refresh_timer_display(self):
@@ -973,15 +982,17 @@ class Tracker(Box):
 
     def start_reminder_tick_loop(self):
         """Periodically refresh reminder display to keep time-left current."""
-        if self.reminder_tick_id:
-            GLib.source_remove(self.reminder_tick_id)
-            self.reminder_tick_id = None
+        if self.reminder_tick_job:
+            self.reminder_tick_job.remove()
+            self.reminder_tick_job = None
 
         def tick():
             self.refresh_reminders()
             return True
 
-        self.reminder_tick_id = GLib.timeout_add_seconds(1, tick)
+        self.reminder_tick_job = PeriodicScheduler.get_initial().add(
+            tick, 1, widget=self.reminders_box, name="tracker-reminders"
+        )
     
     # === Chart Functions ===
     def get_theme_color(self, widget, color_name="primary"):
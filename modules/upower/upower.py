@@ -1,4 +1,6 @@
-import dbus
+from utils.lazy_import import lazy_import
+
+dbus = lazy_import("dbus")
 
 class UPowerManager():
 
@@ -1,9 +1,10 @@
 import colorsys
-import concurrent.futures
 import hashlib
+import json
 import os
 import random  # <--- AÑADIDO
 import shutil
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 
 from fabric.utils.helpers import exec_shell_command_async
@@ -12,16 +13,38 @@ from fabric.widgets.button import Button
 from fabric.widgets.entry import Entry
 from fabric.widgets.label import Label
 from fabric.widgets.scrolledwindow import ScrolledWindow
-from gi.repository import Gdk, GdkPixbuf, Gio, GLib, Gtk, Pango
-from PIL import Image
+from gi.repository import Gdk, GdkPixbuf, GLib, Gtk, Pango
 
 import config.config
 import config.data as data
 import modules.icons as icons
+from services.wallpaper_library import WallpaperLibrary, normalize_name
+from utils.palette import (
+    extract_palette,
+    hue_sort_key,
+    palette_matches_hue,
+    parse_hue_query,
+    pick_accent,
+)
+from utils.lazy_import import lazy_import, load
+from utils.scheme_cache import apply_color_scheme, apply_image_scheme
+
+# Only needed to create thumbnails
+Image = lazy_import("PIL.Image")
 
 
 class WallpaperSelector(Box):
     CACHE_DIR = f"{data.CACHE_DIR}/thumbs"  # Changed from wallpapers to thumbs
+    THUMBNAIL_SIZE = 96
+    # Items loaded before and after the visible range so scrolling stays smooth
+    PREFETCH_MARGIN = 24
+    # Upper bound for decoded thumbnails kept in memory (bytes)
+    THUMBNAIL_MEMORY_BUDGET = 24 * 1024 * 1024
+    MANIFEST_FILE = f"{CACHE_DIR}/manifest.json"
+    # Palettes indexed during a color search are refiltered in batches (ms)
+    REFILTER_DELAY = 250
+    SORT_BY_NAME = 1
+    SORT_BY_COLOR = 2
 
     def __init__(self, **kwargs):
         # Delete the old cache directory if it exists
@@ -39,23 +62,70 @@ class WallpaperSelector(Box):
         )
         os.makedirs(self.CACHE_DIR, exist_ok=True)
 
-        self.files = []
-        GLib.idle_add(self._load_wallpapers_async().__next__)
-        self.thumbnails = []
+        self.library = WallpaperLibrary.get_initial()
         self.thumbnail_queue = []
+        # Imported here, the lazy imports are not thread-safe (see
+        # utils/lazy_import.py) and the workers below use them concurrently
+        load(Image)
+        load(lazy_import("numpy"))
         self.executor = ThreadPoolExecutor(max_workers=4)  # Shared executor
+        # Background palette indexing runs on its own worker so it never
+        # delays thumbnails for the visible range
+        self.index_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Per-wallpaper palette info: file_name -> {"mtime", "palette", "accent"}
+        self._manifest = self._load_manifest()
+        self._manifest_save_id = None
+        self._query_hue = None
+        self._refilter_id = None
+
+        # Decoded thumbnails, least recently used first: file_name -> pixbuf
+        self._thumbnail_cache = OrderedDict()
+        self._thumbnail_cache_bytes = 0
+        # Thumbnails currently being generated: file_name -> future
+        self._pending_thumbnails = {}
+        # Rows of the base store (ListStore iters persist): file_name -> iter
+        self._rows = {}
+        self._visible_update_id = None
+        self._query = ""
+
+        self._placeholder = GdkPixbuf.Pixbuf.new(
+            GdkPixbuf.Colorspace.RGB, True, 8, self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE
+        )
+        self._placeholder.fill(0x00000000)
 
         # Variable to control the selection (similar to AppLauncher)
         self.selected_index = -1
 
+        # Every wallpaper has a row in the store; filtering happens in the
+        # TreeModelFilter so typing never rebuilds the store.
+        # Columns: thumbnail, file name, color sort key
+        self.store = Gtk.ListStore(GdkPixbuf.Pixbuf, str, float)
+        self.filter_model = self.store.filter_new()
+        self.filter_model.set_visible_func(self._filter_func)
+        self.sort_model = Gtk.TreeModelSort(model=self.filter_model)
+        self.sort_model.set_sort_func(
+            self.SORT_BY_NAME,
+            lambda model, a, b, _: (model[a][1].lower() > model[b][1].lower())
+            - (model[a][1].lower() < model[b][1].lower()),
+        )
+        self.sort_model.set_sort_func(
+            self.SORT_BY_COLOR,
+            lambda model, a, b, _: (model[a][2] > model[b][2])
+            - (model[a][2] < model[b][2]),
+        )
+        self.sort_model.set_sort_column_id(self.SORT_BY_NAME, Gtk.SortType.ASCENDING)
+
         # Initialize UI components
         self.viewport = Gtk.IconView(name="wallpaper-icons")
-        self.viewport.set_model(Gtk.ListStore(GdkPixbuf.Pixbuf, str))
+        self.viewport.set_model(self.sort_model)
         self.viewport.set_pixbuf_column(0)
         # Hide text column so only the image is shown
         self.viewport.set_text_column(-1)
         self.viewport.set_item_width(0)
         self.viewport.connect("item-activated", self.on_wallpaper_selected)
+        self.viewport.connect("motion-notify-event", self.on_viewport_motion)
+        self.viewport.connect("leave-notify-event", lambda *_: self._set_preview(None))
         # self.viewport.connect("selection-changed", self._on_selection_changed) # Removed connection
 
         self.scrolled_window = ScrolledWindow(
@@ -69,10 +139,14 @@ class WallpaperSelector(Box):
             propagate_width=False,
             propagate_height=False,
         )
+        self.scrolled_window.get_vadjustment().connect(
+            "value-changed", lambda *_: self._schedule_visible_update()
+        )
+        self.viewport.connect("size-allocate", lambda *_: self._schedule_visible_update())
 
         self.search_entry = Entry(
             name="search-entry-walls",
-            placeholder="Search Wallpapers...",
+            placeholder="Search Wallpapers or colors (blue, #ff8800, hue:200)...",
             h_expand=True,
             h_align="fill",
             notify_text=lambda entry, *_: self.arrange_viewport(entry.get_text()),
@@ -136,6 +210,20 @@ class WallpaperSelector(Box):
         )
         self.random_wall.connect("clicked", self.set_random_wallpaper)  # <--- AÑADIDO
 
+        self.sort_button = Button(
+            name="sort-wall-button",
+            child=Label(name="sort-wall-label", markup=icons.sort),
+            tooltip_text="Sort by color",
+        )
+        self.sort_button.connect("clicked", self.on_sort_clicked)
+
+        # Palette of the hovered wallpaper, drawn without running matugen
+        self._preview_palette = []
+        self.palette_preview = Gtk.DrawingArea(name="palette-preview")
+        self.palette_preview.set_size_request(48, -1)
+        self.palette_preview.set_valign(Gtk.Align.FILL)
+        self.palette_preview.connect("draw", self.on_palette_preview_draw)
+
         # Add the switcher to the header_box's start_children
         self.header_box = Box(
             name="header-box",
@@ -143,7 +231,9 @@ class WallpaperSelector(Box):
             orientation="h",
             children=[
                 self.random_wall,
+                self.sort_button,
                 self.search_entry,
+                self.palette_preview,
                 self.scheme_dropdown,
                 self.matugen_switcher,
             ],
@@ -198,62 +288,35 @@ class WallpaperSelector(Box):
 
         # Removed the old main_content_box and its add
 
-        self._start_thumbnail_thread()
         self.connect("map", self.on_map)
-        self.setup_file_monitor()
+        self.library.connect("ready", lambda *_: self._populate_store())
+        self.library.connect("added", self._on_wallpaper_added)
+        self.library.connect("removed", self._on_wallpaper_removed)
+        self.library.connect("changed", self._on_wallpaper_changed)
+        if self.library.is_ready:
+            self._populate_store()
         self.show_all()
         self.randomize_dice_icon()
         # Ensure the search entry gets focus when starting
         self.search_entry.grab_focus()
 
-    def _load_wallpapers_async(self):
-        """Non-blocking wallpaper processing."""
-
-        # Process old wallpapers: use os.scandir for efficiency and only loop
-        # over image files that actually need renaming (they're not already lowercase
-        # and with hyphens instead of spaces)
-        with os.scandir(data.WALLPAPERS_DIR) as entries:
-            for entry in entries:
-                if entry.is_file() and self._is_image(entry.name):
-                    # Check if the file needs renaming: file should be lowercase and have hyphens instead of spaces
-                    if entry.name != entry.name.lower() or " " in entry.name:
-                        new_name = entry.name.lower().replace(" ", "-")
-                        full_path = os.path.join(data.WALLPAPERS_DIR, entry.name)
-                        new_full_path = os.path.join(data.WALLPAPERS_DIR, new_name)
-                        try:
-                            os.rename(full_path, new_full_path)
-                            print(
-                                f"Renamed old wallpaper '{full_path}' to '{new_full_path}'"
-                            )
-                        except Exception as e:
-                            print(f"Error renaming file {full_path}: {e}")
-                        yield
-
-        # Process files in small batches to keep UI responsive
-        file_list = os.listdir(data.WALLPAPERS_DIR)
-        batch_size = 20
-
-        # Process files in batches
-        for i in range(0, len(file_list), batch_size):
-            batch = file_list[i : i + batch_size]
-            for filename in batch:
-                if self._is_image(filename):
-                    self.files.append(filename)
-
-            # Sort the current batch to maintain order
-            self.files.sort()
-
-            # Yield to let the main loop process events
-            yield True
-
-        # Final sort of the complete list
-        self.files.sort()
-
-        # Start thumbnail loading after files are processed
-        self._start_thumbnail_thread()
-
-        # Return False to stop the idle callback
-        yield False
+    @property
+    def files(self) -> list:
+        """Wallpaper paths relative to the wallpapers directory, sorted."""
+        return self.library.files
+
+    def _populate_store(self):
+        """Fill the store with one placeholder row per wallpaper; thumbnails load once visible."""
+        self.viewport.set_model(None)
+        self.store.clear()
+        self._rows.clear()
+        for path in self.files:
+            self._rows[path] = self.store.append(
+                [self._placeholder, path, self._get_sort_key(path)]
+            )
+        self.viewport.set_model(self.sort_model)
+        self._schedule_visible_update()
+        self._start_palette_indexing()
 
     def randomize_dice_icon(self):
         dice_icons = [
@@ -275,7 +338,7 @@ class WallpaperSelector(Box):
             return
 
         file_name = random.choice(self.files)
-        full_path = os.path.join(data.WALLPAPERS_DIR, file_name)
+        full_path = self.library.full_path(file_name)
         selected_scheme = self.scheme_dropdown.get_active_id()
         current_wall = os.path.expanduser(f"~/.current.wall")
 
@@ -286,10 +349,9 @@ class WallpaperSelector(Box):
         os.symlink(full_path, current_wall)
 
         if self.matugen_switcher.get_active():
-            # Try matugen first and fall back to awww if it fails (common when matugen errors silently)
-            exec_shell_command_async(
-                f"sh -c 'matugen image \"{full_path}\" -t {selected_scheme} || awww img \"{full_path}\" -t outer --transition-duration 1.5 --transition-step 255 --transition-fps 60 -f Nearest'"
-            )
+            # Reuse a cached scheme when possible; matugen runs only on a miss
+            # and awww is the fallback if it fails
+            apply_image_scheme(full_path, selected_scheme)
         else:
             exec_shell_command_async(
                 f'awww img "{full_path}" -t outer --transition-duration 1.5 --transition-step 255 --transition-fps 60 -f Nearest'
@@ -304,62 +366,57 @@ class WallpaperSelector(Box):
 
         self.randomize_dice_icon()
 
-    def setup_file_monitor(self):
-        gfile = Gio.File.new_for_path(data.WALLPAPERS_DIR)
-        self.file_monitor = gfile.monitor_directory(Gio.FileMonitorFlags.NONE, None)
-        self.file_monitor.connect("changed", self.on_directory_changed)
-
-    def on_directory_changed(self, monitor, file, other_file, event_type):
-        file_name = file.get_basename()
-        if event_type == Gio.FileMonitorEvent.DELETED:
-            if file_name in self.files:
-                self.files.remove(file_name)
-                cache_path = self._get_cache_path(file_name)
-                if os.path.exists(cache_path):
-                    try:
-                        os.remove(cache_path)
-                    except Exception as e:
-                        print(f"Error deleting cache {cache_path}: {e}")
-                self.thumbnails = [(p, n) for p, n in self.thumbnails if n != file_name]
-                GLib.idle_add(self.arrange_viewport, self.search_entry.get_text())
-        elif event_type == Gio.FileMonitorEvent.CREATED:
-            if self._is_image(file_name):
-                # Convert filename to lowercase and replace spaces with "-"
-                new_name = file_name.lower().replace(" ", "-")
-                full_path = os.path.join(data.WALLPAPERS_DIR, file_name)
-                new_full_path = os.path.join(data.WALLPAPERS_DIR, new_name)
-                if new_name != file_name:
-                    try:
-                        os.rename(full_path, new_full_path)
-                        file_name = new_name
-                        print(f"Renamed file '{full_path}' to '{new_full_path}')")
-                    except Exception as e:
-                        print(f"Error renaming file {full_path}: {e}")
-                if file_name not in self.files:
-                    self.files.append(file_name)
-                    self.files.sort()
-                    self.executor.submit(self._process_file, file_name)
-        elif event_type == Gio.FileMonitorEvent.CHANGED:
-            if self._is_image(file_name) and file_name in self.files:
-                cache_path = self._get_cache_path(file_name)
-                if os.path.exists(cache_path):
-                    try:
-                        os.remove(cache_path)
-                    except Exception as e:
-                        print(f"Error deleting cache for changed file {file_name}: {e}")
-                self.executor.submit(self._process_file, file_name)
+    def _remove_cached_thumbnail(self, file_name: str):
+        cache_path = self._get_cache_path(file_name)
+        if os.path.exists(cache_path):
+            try:
+                os.remove(cache_path)
+            except Exception as e:
+                print(f"Error deleting cache {cache_path}: {e}")
+
+    def _on_wallpaper_added(self, library, file_name, position):
+        # The library and the store share the same ordering
+        self._rows[file_name] = self.store.insert(
+            position, [self._placeholder, file_name, self._get_sort_key(file_name)]
+        )
+        self._schedule_visible_update()
+        self.index_executor.submit(self._index_file, file_name)
+
+    def _on_wallpaper_removed(self, library, file_name):
+        self._remove_cached_thumbnail(file_name)
+        self._drop_thumbnail(file_name)
+        row = self._rows.pop(file_name, None)
+        if row is not None:
+            self.store.remove(row)
+        if self._manifest.pop(file_name, None) is not None:
+            self._schedule_manifest_save()
+        self._schedule_visible_update()
+
+    def _on_wallpaper_changed(self, library, file_name):
+        self._remove_cached_thumbnail(file_name)
+        self._drop_thumbnail(file_name)
+        self._schedule_visible_update()
+        self.index_executor.submit(self._index_file, file_name)
+
+    def _filter_func(self, model, tree_iter, _data):
+        if not self._query:
+            return True
+        file_name = model[tree_iter][1]
+        # Paths include the collection (sub-folder), so it is searchable too
+        if self._query in normalize_name(file_name):
+            return True
+        # A color word like "red" also matches wallpapers of that hue
+        if self._query_hue is not None:
+            entry = self._manifest.get(file_name)
+            return bool(entry) and palette_matches_hue(entry["palette"], self._query_hue)
+        return False
 
     def arrange_viewport(self, query: str = ""):
         model = self.viewport.get_model()
-        model.clear()
-        filtered_thumbnails = [
-            (thumb, name)
-            for thumb, name in self.thumbnails
-            if query.casefold() in name.casefold()
-        ]
-        filtered_thumbnails.sort(key=lambda x: x[1].lower())
-        for pixbuf, file_name in filtered_thumbnails:
-            model.append([pixbuf, file_name])
+        self._query = normalize_name(query.strip())
+        self._query_hue = parse_hue_query(query)
+        self.filter_model.refilter()
+        self._schedule_visible_update()
         # If the search entry is empty, no icon is selected; otherwise, select the first one.
         if query.strip() == "":
             self.viewport.unselect_all()
@@ -370,17 +427,16 @@ class WallpaperSelector(Box):
     def on_wallpaper_selected(self, iconview, path):
         model = iconview.get_model()
         file_name = model[path][1]
-        full_path = os.path.join(data.WALLPAPERS_DIR, file_name)
+        full_path = self.library.full_path(file_name)
         selected_scheme = self.scheme_dropdown.get_active_id()
         current_wall = os.path.expanduser(f"~/.current.wall")
         if os.path.isfile(current_wall) or os.path.islink(current_wall):
             os.remove(current_wall)
         os.symlink(full_path, current_wall)
         if self.matugen_switcher.get_active():
-            # Try matugen first and fall back to awww if it fails (common when matugen errors silently)
-            exec_shell_command_async(
-                f"sh -c 'matugen image \"{full_path}\" -t {selected_scheme} || awww img \"{full_path}\" -t outer --transition-duration 1.5 --transition-step 255 --transition-fps 60 -f Nearest'"
-            )
+            # Reuse a cached scheme when possible; matugen runs only on a miss
+            # and awww is the fallback if it fails
+            apply_image_scheme(full_path, selected_scheme)
         else:
             # Matugen is disabled: run the alternative awww command.
             exec_shell_command_async(
@@ -520,19 +576,73 @@ class WallpaperSelector(Box):
         )  # Ensure the selected icon is visible
         self.selected_index = new_index
 
-    def _start_thumbnail_thread(self):
-        thread = GLib.Thread.new("thumbnail-loader", self._preload_thumbnails, None)
+    def _schedule_visible_update(self):
+        if self._visible_update_id is None:
+            self._visible_update_id = GLib.idle_add(self._update_visible_thumbnails)
 
-    def _preload_thumbnails(self, _data):
-        futures = [
-            self.executor.submit(self._process_file, file_name)
-            for file_name in self.files
-        ]
-        concurrent.futures.wait(futures)
-        GLib.idle_add(self._process_batch)
+    def _get_wanted_files(self) -> list:
+        """File names in the visible range plus the prefetch margin, visible first."""
+        total = len(self.sort_model)
+        if total == 0:
+            return []
 
-    def _process_file(self, file_name):
-        full_path = os.path.join(data.WALLPAPERS_DIR, file_name)
+        visible_range = self.viewport.get_visible_range()
+        if visible_range:
+            start = visible_range[0].get_indices()[0]
+            end = visible_range[1].get_indices()[0]
+        else:
+            # Not realized yet: warm up the first screen only
+            start, end = 0, min(total - 1, self.PREFETCH_MARGIN)
+
+        order = list(range(start, end + 1))
+        for offset in range(1, self.PREFETCH_MARGIN + 1):
+            if end + offset < total:
+                order.append(end + offset)
+            if start - offset >= 0:
+                order.append(start - offset)
+
+        return [self.sort_model[index][1] for index in order]
+
+    def _update_visible_thumbnails(self):
+        self._visible_update_id = None
+        wanted = self._get_wanted_files()
+        wanted_set = set(wanted)
+
+        # Drop queued work that scrolled out of range before it started
+        for file_name, future in list(self._pending_thumbnails.items()):
+            if file_name not in wanted_set and future.cancel():
+                del self._pending_thumbnails[file_name]
+
+        for file_name in wanted:
+            if file_name in self._thumbnail_cache:
+                self._thumbnail_cache.move_to_end(file_name)
+            elif file_name not in self._pending_thumbnails:
+                self._pending_thumbnails[file_name] = self.executor.submit(
+                    self._process_file, file_name
+                )
+
+        self._evict_thumbnails(wanted_set)
+        return False
+
+    def _evict_thumbnails(self, keep: set):
+        """Swap least recently used off-screen thumbnails back to the placeholder."""
+        for file_name in list(self._thumbnail_cache):
+            if self._thumbnail_cache_bytes <= self.THUMBNAIL_MEMORY_BUDGET:
+                break
+            if file_name not in keep:
+                self._drop_thumbnail(file_name)
+
+    def _drop_thumbnail(self, file_name: str):
+        pixbuf = self._thumbnail_cache.pop(file_name, None)
+        if pixbuf is not None:
+            self._thumbnail_cache_bytes -= pixbuf.get_byte_length()
+        row = self._rows.get(file_name)
+        if row is not None:
+            self.store.set_value(row, 0, self._placeholder)
+
+    def _ensure_thumbnail(self, file_name):
+        """Create the cached thumbnail if needed and return its path (None on error)."""
+        full_path = self.library.full_path(file_name)
         cache_path = self._get_cache_path(file_name)
         if not os.path.exists(cache_path):
             try:
@@ -544,38 +654,188 @@ class WallpaperSelector(Box):
                     right = left + side
                     bottom = top + side
                     img_cropped = img.crop((left, top, right, bottom))
-                    img_cropped.thumbnail((96, 96), Image.Resampling.LANCZOS)
+                    img_cropped.thumbnail(
+                        (self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE),
+                        Image.Resampling.LANCZOS,
+                    )
                     img_cropped.save(cache_path, "PNG")
             except Exception as e:
                 print(f"Error processing {file_name}: {e}")
-                return
+                return None
+        return cache_path
+
+    def _process_file(self, file_name):
+        cache_path = self._ensure_thumbnail(file_name)
+        if cache_path is None:
+            # Not pending anymore, it is tried again when next shown
+            GLib.idle_add(self._drop_pending_thumbnail, file_name)
+            return
+        self._index_palette(file_name, cache_path)
         self.thumbnail_queue.append((cache_path, file_name))
         GLib.idle_add(self._process_batch)
 
+    def _drop_pending_thumbnail(self, file_name):
+        self._pending_thumbnails.pop(file_name, None)
+        return False
+
+    def _index_file(self, file_name):
+        """Background indexing: thumbnail and palette, without decoding a pixbuf."""
+        cache_path = self._ensure_thumbnail(file_name)
+        if cache_path is not None:
+            self._index_palette(file_name, cache_path)
+
+    def _index_palette(self, file_name, cache_path):
+        """Compute the palette from the thumbnail unless the manifest is up to date."""
+        try:
+            mtime = os.path.getmtime(self.library.full_path(file_name))
+        except OSError:
+            return
+        entry = self._manifest.get(file_name)
+        if entry and entry.get("mtime") == mtime:
+            return
+        try:
+            with Image.open(cache_path) as img:
+                palette = extract_palette(img)
+        except Exception as e:
+            print(f"Error extracting palette for {file_name}: {e}")
+            return
+        entry = {"mtime": mtime, "palette": palette, "accent": pick_accent(palette)}
+        GLib.idle_add(self._on_palette_ready, file_name, entry)
+
+    def _on_palette_ready(self, file_name, entry):
+        self._manifest[file_name] = entry
+        row = self._rows.get(file_name)
+        if row is not None:
+            self.store.set_value(row, 2, hue_sort_key(entry["accent"]))
+        self._schedule_manifest_save()
+        if self._query_hue is not None:
+            # The new palette may match the color being searched
+            self._schedule_refilter()
+        return False
+
+    def _schedule_refilter(self):
+        if self._refilter_id is None:
+            self._refilter_id = GLib.timeout_add(self.REFILTER_DELAY, self._refilter)
+
+    def _refilter(self):
+        self._refilter_id = None
+        self.filter_model.refilter()
+        self._schedule_visible_update()
+        return False
+
+    def _start_palette_indexing(self):
+        known = set(self.files)
+        stale = [name for name in self._manifest if name not in known]
+        for name in stale:
+            del self._manifest[name]
+        if stale:
+            self._schedule_manifest_save()
+        for file_name in self.files:
+            if file_name not in self._manifest:
+                self.index_executor.submit(self._index_file, file_name)
+
+    def _get_sort_key(self, file_name: str) -> float:
+        entry = self._manifest.get(file_name)
+        return hue_sort_key(entry["accent"] if entry else None)
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self.MANIFEST_FILE, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Error reading thumbnail manifest: {e}")
+            return {}
+
+    def _schedule_manifest_save(self):
+        if self._manifest_save_id is None:
+            self._manifest_save_id = GLib.timeout_add_seconds(2, self._save_manifest)
+
+    def _save_manifest(self):
+        self._manifest_save_id = None
+        tmp_path = f"{self.MANIFEST_FILE}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self._manifest, f)
+            os.replace(tmp_path, self.MANIFEST_FILE)
+        except Exception as e:
+            print(f"Error writing thumbnail manifest: {e}")
+        return False
+
+    def on_sort_clicked(self, button):
+        column, _ = self.sort_model.get_sort_column_id()
+        if column == self.SORT_BY_COLOR:
+            self.sort_model.set_sort_column_id(self.SORT_BY_NAME, Gtk.SortType.ASCENDING)
+            button.set_tooltip_text("Sort by color")
+        else:
+            self.sort_model.set_sort_column_id(self.SORT_BY_COLOR, Gtk.SortType.ASCENDING)
+            button.set_tooltip_text("Sort by name")
+        self._schedule_visible_update()
+
+    def on_viewport_motion(self, widget, event):
+        path = self.viewport.get_path_at_pos(int(event.x), int(event.y))
+        entry = None
+        if path is not None:
+            entry = self._manifest.get(self.sort_model[path][1])
+        self._set_preview(entry)
+        return False
+
+    def _set_preview(self, entry):
+        """Show the accent color followed by the palette of the hovered wallpaper."""
+        palette = []
+        if entry and entry["palette"]:
+            accent = entry["accent"]
+            palette = [accent] + [c for c in entry["palette"] if c != accent]
+        if palette != self._preview_palette:
+            self._preview_palette = palette
+            self.palette_preview.queue_draw()
+
+    def on_palette_preview_draw(self, widget, cr):
+        if not self._preview_palette:
+            return False
+        width = widget.get_allocated_width()
+        height = widget.get_allocated_height()
+        # Accent takes the top half, the rest of the palette shares the bottom
+        rest = self._preview_palette[1:] or self._preview_palette
+        for index, color in enumerate([self._preview_palette[0]] + rest):
+            rgba = Gdk.RGBA()
+            rgba.parse(color)
+            cr.set_source_rgb(rgba.red, rgba.green, rgba.blue)
+            if index == 0:
+                cr.rectangle(0, 0, width, height / 2)
+            else:
+                slot = width / len(rest)
+                cr.rectangle((index - 1) * slot, height / 2, slot, height / 2)
+            cr.fill()
+        return False
+
     def _process_batch(self):
         batch = self.thumbnail_queue[:10]
         del self.thumbnail_queue[:10]
         for cache_path, file_name in batch:
+            self._pending_thumbnails.pop(file_name, None)
+            row = self._rows.get(file_name)
+            if row is None or file_name in self._thumbnail_cache:
+                continue
             try:
                 pixbuf = GdkPixbuf.Pixbuf.new_from_file(cache_path)
-                self.thumbnails.append((pixbuf, file_name))
-                self.viewport.get_model().append([pixbuf, file_name])
             except Exception as e:
                 print(f"Error loading thumbnail {cache_path}: {e}")
+                continue
+            self._thumbnail_cache[file_name] = pixbuf
+            self._thumbnail_cache_bytes += pixbuf.get_byte_length()
+            self.store.set_value(row, 0, pixbuf)
         if self.thumbnail_queue:
             GLib.idle_add(self._process_batch)
+        elif self._thumbnail_cache_bytes > self.THUMBNAIL_MEMORY_BUDGET:
+            self._evict_thumbnails(set(self._get_wanted_files()))
         return False
 
     def _get_cache_path(self, file_name: str) -> str:
         file_hash = hashlib.md5(file_name.encode("utf-8")).hexdigest()
         return os.path.join(self.CACHE_DIR, f"{file_hash}.png")
 
-    @staticmethod
-    def _is_image(file_name: str) -> bool:
-        return file_name.lower().endswith(
-            (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp")
-        )
-
     def on_search_entry_focus_out(self, widget, event):
         if self.get_mapped():
             widget.grab_focus()
@@ -585,6 +845,7 @@ class WallpaperSelector(Box):
         """Handles the map signal to set initial visibility of the color selector."""
         # Set visibility based on the loaded state when the widget becomes visible
         self.custom_color_selector_box.set_visible(not self.matugen_enabled)
+        self._schedule_visible_update()
 
     def hsl_to_rgb_hex(self, h: float, s: float = 1.0, l: float = 0.5) -> str:
         """Converts HSL color value to RGB HEX string."""
@@ -621,10 +882,8 @@ class WallpaperSelector(Box):
         hex_color = self.hsl_to_rgb_hex(hue_value)  # Convert HSL(hue, 1.0, 0.5) to HEX
         print(f"Applying color from slider: H={hue_value}, HEX={hex_color}")
         selected_scheme = self.scheme_dropdown.get_active_id()
-        # Run matugen with the chosen hex color and selected scheme
-        exec_shell_command_async(
-            f'matugen color hex "{hex_color}" -t {selected_scheme}'
-        )
+        # Run matugen with the chosen hex color and selected scheme (cached)
+        apply_color_scheme(hex_color, selected_scheme)
         # Optionally save the chosen color to config if needed later
         # config.config.bind_vars["matugen_hex_color"] = hex_color
         # config.config.save_config() # Removed as save_config doesn't exist
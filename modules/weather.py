@@ -9,6 +9,7 @@ from gi.repository import GLib
 gi.require_version("Gtk", "3.0")
 import config.data as data
 import modules.icons as icons
+from services.scheduler import PeriodicScheduler
 
 
 class Weather(Button):
@@ -20,8 +21,8 @@ class Weather(Button):
         self.enabled = False  # Will be set by apply_component_props
         self.has_weather_data = False
         self.fetching = False  # Prevent concurrent fetches
-        # Fetch weather every 10 minutes (600 seconds)
-        GLib.timeout_add_seconds(600, self.fetch_weather)
+        # Fetch weather every 10 minutes (600 seconds), every 20 on battery
+        PeriodicScheduler.get_initial().add(self.fetch_weather, 600, name="weather")
         # Delay initial fetch to allow visibility config to be applied first (runs only once)
         GLib.timeout_add(100, self._initial_fetch)
 
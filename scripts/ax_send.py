@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+"""
+Send a command to the running shell over its command socket.
+
+    python -S ax_send.py open-notch launcher
+
+Only the standard library is used, so it can run with `python -S` and
+start as fast as the interpreter allows. The commands are registered in
+main.py; `ping` answers `pong`.
+"""
+
+import os
+import socket
+import sys
+
+APP_NAME = "ax-shell"  # config.data.APP_NAME, not imported to keep this script light
+
+
+def socket_path() -> str:
+    # Keep in sync with services/command_server.py
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"{APP_NAME}.sock")
+    return f"/tmp/{APP_NAME}-{os.getuid()}.sock"
+
+
+def send(command: str, timeout: float = 2.0) -> str:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path())
+        sock.sendall(command.encode() + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(4096)
+            if not chunk:
+                break
+            reply += chunk
+    return reply.decode().strip()
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(f"Usage: {sys.argv[0]} COMMAND [ARGS...]", file=sys.stderr)
+        sys.exit(2)
+    try:
+        reply = send(" ".join(sys.argv[1:]))
+    except OSError as e:
+        print(f"{APP_NAME} is not running: {e}", file=sys.stderr)
+        sys.exit(1)
+    if reply.startswith("error"):
+        print(reply, file=sys.stderr)
+        sys.exit(1)
+    if reply != "ok":
+        print(reply)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+"""
+Latency of sending a command to the running shell.
+
+Compares, with the shell running:
+
+- socket: a `ping` round trip over the command socket, in process,
+- ax_send: spawning `python -S ax_send.py ping`, as the keybinds do,
+- fabric-cli: spawning `fabric-cli exec ax-shell 'None'`, the old way (if installed).
+
+Usage: python scripts/command_latency.py [--runs N]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ax_send import APP_NAME, send
+
+AX_SEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ax_send.py")
+
+
+def time_runs(runs: int, action) -> list:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{name:<12} median {statistics.median(timings):>7.2f} ms"
+        f"   p95 {p95:>7.2f} ms   max {timings[-1]:>7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure command latency")
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    try:
+        send("ping")
+    except OSError as e:
+        print(f"{APP_NAME} is not running: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    report("socket", time_runs(args.runs, lambda: send("ping")))
+    report(
+        "ax_send",
+        time_runs(
+            args.runs,
+            lambda: subprocess.run([sys.executable, "-S", AX_SEND, "ping"], capture_output=True),
+        ),
+    )
+    if shutil.which("fabric-cli"):
+        report(
+            "fabric-cli",
+            time_runs(
+                args.runs,
+                lambda: subprocess.run(
+                    ["fabric-cli", "exec", APP_NAME, "None"], capture_output=True
+                ),
+            ),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Import-time budget check for main.py.
+
+Imports main.py under `python -X importtime` (the `if __name__ == "__main__"`
+block does not run, so no window is created), then fails if:
+
+- the whole import graph takes longer than the budget, or
+- a dependency that must be imported lazily (see utils/lazy_import.py)
+  shows up in the graph.
+
+Usage: python scripts/import_budget.py [--budget-ms N] [--runs N] [--forbid MODULE ...]
+The exit status is 0 within budget, 1 over budget and 2 if main.py can't be imported.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time of main.py, in milliseconds
+TOTAL_BUDGET_MS = 750
+# Heavy dependencies that must stay out of the startup import graph
+FORBIDDEN_MODULES = ["numpy", "PIL.Image", "requests", "psutil", "dbus"]
+SUMMARY_ROWS = 15
+
+
+def measure() -> dict:
+    """Run one import of main.py; return {module: (self_us, cumulative_us, depth)}.
+
+    Modules imported by the interpreter itself (site, encodings) are included;
+    the entry of main covers everything main.py pulls in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=REPO_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        errors = [l for l in result.stderr.splitlines() if not l.startswith("import time:")]
+        print("Importing main.py failed:", file=sys.stderr)
+        print("\n".join(errors[-20:]), file=sys.stderr)
+        sys.exit(2)
+
+    modules = {}
+    for line in result.stderr.splitlines():
+        # "import time:      self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        modules[name.strip()] = (int(fields[0]), int(fields[1]), depth)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of main.py")
+    parser.add_argument("--budget-ms", type=float, default=TOTAL_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=3, help="best of N runs")
+    parser.add_argument("--forbid", nargs="*", default=FORBIDDEN_MODULES)
+    args = parser.parse_args()
+
+    # Keep the fastest of several runs to filter out disk cache and scheduler noise
+    runs = [measure() for _ in range(max(args.runs, 1))]
+    best = min(runs, key=lambda m: m["main"][1])
+    total_ms = best["main"][1] / 1000
+
+    print(f"{'self ms':>9} {'cumul ms':>9}  module")
+    for name, (self_us, cumulative_us, _depth) in sorted(
+        best.items(), key=lambda item: -item[1][0]
+    )[:SUMMARY_ROWS]:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}  {name}")
+    print(f"\nTotal import time of main.py: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"Over budget by {total_ms - args.budget_ms:.1f} ms")
+        failed = True
+    for name in args.forbid:
+        if name in best:
+            print(f"{name} is imported at startup ({best[name][1] / 1000:.1f} ms); import it lazily")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
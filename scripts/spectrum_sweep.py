@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+"""
+Sine-sweep check of the built-in visualizer's spectrum analyzer.
+
+Feeds pure tones, log-spaced between the low and high cutoffs, through
+utils/spectrum.py's SpectrumAnalyzer and checks that the loudest bar is the
+band containing the tone (or a neighbour, since a windowed tone leaks into
+the adjacent bins).
+
+Usage: python scripts/spectrum_sweep.py [--bars N] [--rate HZ] [--tones N]
+The exit status is 0 when every tone lands in its band, 1 otherwise.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.spectrum import FFT_SIZE, SpectrumAnalyzer, np
+
+LOW_CUTOFF = 50
+HIGH_CUTOFF = 8000
+# Bars the peak may be off by: a Hann window spreads a tone over 3 bins
+TOLERANCE = 1
+
+
+def expected_band(analyzer: SpectrumAnalyzer, frequency: float, rate: int) -> int:
+    """Index of the band whose FFT bins contain `frequency`."""
+    fft_bin = round(frequency * FFT_SIZE / rate)
+    for index, (start, stop) in enumerate(zip(analyzer._starts, analyzer._stops)):
+        if start <= fft_bin < stop:
+            return index
+    return len(analyzer._starts) - 1
+
+
+def peak_band(bars: int, rate: int, frequency: float) -> tuple:
+    """Return (peak band, expected band) for one tone."""
+    analyzer = SpectrumAnalyzer(
+        bars,
+        rate=rate,
+        low_cutoff=LOW_CUTOFF,
+        high_cutoff=HIGH_CUTOFF,
+        integral=0,
+        autosens=False,
+    )
+    t = np.arange(FFT_SIZE) / rate
+    samples = (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    output = analyzer.process(samples)
+    return int(np.argmax(output)), expected_band(analyzer, frequency, rate)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the spectrum analyzer with a sine sweep")
+    parser.add_argument("--bars", type=int, default=32)
+    parser.add_argument("--rate", type=int, default=44100)
+    parser.add_argument("--tones", type=int, default=24)
+    args = parser.parse_args()
+
+    failures = 0
+    # Slightly inside the cutoffs, the outer bands are only partly covered
+    for frequency in np.geomspace(LOW_CUTOFF * 1.5, HIGH_CUTOFF / 1.5, args.tones):
+        peak, expected = peak_band(args.bars, args.rate, frequency)
+        ok = abs(peak - expected) <= TOLERANCE
+        failures += not ok
+        print(f"{frequency:>8.0f} Hz   peak bar {peak:>3}   expected {expected:>3}   {'ok' if ok else 'FAIL'}")
+
+    if failures:
+        print(f"{failures} of {args.tones} tones peaked in the wrong band", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,38 @@
 import os
-import subprocess
-import re
-import time
 
 from fabric.core.service import Property, Service, Signal
-from fabric.utils import exec_shell_command_async, monitor_file
-from gi.repository import GLib
+from fabric.utils import exec_shell_command_async
+from gi.repository import Gio, GLib
 from loguru import logger
 
 import utils.functions as helpers
+from services.ddc import BRIGHTNESS, DdcManager
 from utils.colors import Colors
+from utils.monitor_manager import get_monitor_manager
 
 
 class Brightness(Service):
-    """Service for controlling screen brightness using ddcutil or brightnessctl backends.
+    """Service for controlling screen brightness using the backlight or ddcutil backends.
 
     The service works with RAW values (0 to max_screen) for both backends:
-    - brightnessctl: raw values are device-specific (e.g., 0-96000)
+    - backlight: raw values are device-specific (e.g., 0-96000)
     - ddcutil: raw values are percentages (0-100)
 
+    Backlight writes go through logind's Session.SetBrightness over D-Bus,
+    one call at a time with the latest value, falling back to brightnessctl
+    if logind refuses. Changes made elsewhere are picked up by watching the
+    device's actual_brightness file.
+
+    With ddcutil, the display of the focused monitor is controlled through
+    its DdcDisplay worker (services/ddc.py); other monitors can be set
+    through the monitor manager.
+
     The 'screen' signal emits percentage values (0-100) for UI display.
     """
 
     instance = None
-    DDCUTIL_PARAMS = "--disable-dynamic-sleep --sleep-multiplier=0.05"
     MIN_CHANGE_THRESHOLD = 2  # Minimum brightness change to apply (percent)
-    CACHE_INTERVAL = 3  # Cache duration in seconds
-    POLL_INTERVAL = 500  # File polling interval in ms
+    BACKLIGHT_DIR = "/sys/class/backlight"
 
     @staticmethod
     def get_initial():
@@ -44,13 +50,13 @@ class Brightness(Service):
         """Initialize service with automatic backend detection."""
         super().__init__(**kwargs)
         self._pending_raw = None
-        self._timer_id = None
-        self._poll_timer_id = None
         self._lock = GLib.Mutex()
         self._last_percent = -1
         self._last_raw = -1
-        self._last_update_time = 0
-        self._last_file_mtime = 0
+        self._screen_device = None
+        self._monitor = None
+        self._writing = False
+        self._use_logind = True
 
         # Detect backend
         self.backend = self._detect_backend(backend)
@@ -59,61 +65,51 @@ class Brightness(Service):
 
         if self.backend:
             if self.backend == "ddcutil":
-                # Initialize brightness cache
-                GLib.timeout_add(100, lambda: self._update_brightness_cache())
+                DdcManager.get_initial().connect(self._on_ddc_value)
+                # Follow the focused monitor
+                get_monitor_manager().notch_focus_changed.connect(self._on_focus_changed)
             else:
-                # Setup polling for brightness file
-                self._setup_polling()
-
-    def _setup_polling(self):
-        """Setup periodic polling of brightness file."""
+                self._setup_monitor()
+
+    def _setup_monitor(self):
+        """Watch actual_brightness for changes made outside the shell."""
+        file_path = f"{self.BACKLIGHT_DIR}/{self._get_screen_device()}/actual_brightness"
+        self._last_raw = self._read_backlight()
+        if self._last_raw != -1 and self.max_screen > 0:
+            self._last_percent = int((self._last_raw / self.max_screen) * 100)
         try:
-            file_path = f"/sys/class/backlight/{self._get_screen_device()}/brightness"
-            if os.path.exists(file_path):
-                # Initialize cache with current value
-                with open(file_path) as f:
-                    self._last_raw = int(f.readline().strip())
-                    self._last_percent = (
-                        int((self._last_raw / self.max_screen) * 100)
-                        if self.max_screen > 0
-                        else 0
-                    )
-
-                self._last_file_mtime = os.path.getmtime(file_path)
-                self._poll_timer_id = GLib.timeout_add(
-                    self.POLL_INTERVAL, self._check_brightness_file
-                )
-        except Exception as e:
-            logger.error(f"Error setting up brightness polling: {e}")
+            self._monitor = Gio.File.new_for_path(file_path).monitor_file(
+                Gio.FileMonitorFlags.NONE, None
+            )
+            self._monitor.connect("changed", self._on_brightness_file_changed)
+        except GLib.Error as e:
+            logger.error(f"Cannot watch {file_path}: {e}")
 
-    def _check_brightness_file(self):
-        """Periodically check brightness file for changes."""
+    def _read_backlight(self):
         try:
-            file_path = f"/sys/class/backlight/{self._get_screen_device()}/brightness"
-            if os.path.exists(file_path):
-                current_mtime = os.path.getmtime(file_path)
-                if current_mtime > self._last_file_mtime:
-                    self._last_file_mtime = current_mtime
-                    with open(file_path) as f:
-                        raw = int(f.readline().strip())
-
-                    if raw != self._last_raw:
-                        self._last_raw = raw
-                        percent = (
-                            int((raw / self.max_screen) * 100)
-                            if self.max_screen > 0
-                            else 0
-                        )
-                        if (
-                            abs(percent - self._last_percent)
-                            >= self.MIN_CHANGE_THRESHOLD
-                        ):
-                            self._last_percent = percent
-                            self.emit("screen", percent)
-            return True
+            with open(
+                f"{self.BACKLIGHT_DIR}/{self._get_screen_device()}/actual_brightness"
+            ) as f:
+                return int(f.readline().strip())
         except Exception as e:
-            logger.error(f"Error checking brightness file: {e}")
-            return True
+            logger.error(f"Error reading brightness file: {e}")
+            return -1
+
+    def _on_brightness_file_changed(self, monitor, file, other_file, event):
+        if event != Gio.FileMonitorEvent.CHANGED:
+            return
+        # Our own writes are already cached; intermediate values would make
+        # a dragged slider jump back
+        if self._writing or self._pending_raw is not None:
+            return
+        raw = self._read_backlight()
+        if raw == -1 or raw == self._last_raw:
+            return
+        self._last_raw = raw
+        percent = int((raw / self.max_screen) * 100) if self.max_screen > 0 else 0
+        if abs(percent - self._last_percent) >= self.MIN_CHANGE_THRESHOLD:
+            self._last_percent = percent
+            self.emit("screen", percent)
 
     def _detect_backend(self, backend):
         """Detect appropriate backend for brightness control."""
@@ -121,23 +117,20 @@ class Brightness(Service):
             logger.info(f"Using forced backend: {backend}")
             return backend
 
-        # Try brightnessctl first (preferred for laptop internal displays)
-        if helpers.executable_exists("brightnessctl"):
-            device = self._get_screen_device()
-            if device:  # Non-empty string means device found
-                logger.info(f"Using brightnessctl backend with device: {device}")
-                return "brightnessctl"
-            else:
-                logger.debug(
-                    "brightnessctl is available but no backlight devices found in /sys/class/backlight/"
-                )
+        # Try the backlight first (preferred for laptop internal displays)
+        device = self._get_screen_device()
+        if device:  # Non-empty string means device found
+            logger.info(f"Using backlight backend with device: {device}")
+            return "backlight"
+        else:
+            logger.debug("No backlight devices found in /sys/class/backlight/")
 
         # Try ddcutil for external monitors (via DDC/CI protocol)
         if helpers.executable_exists("ddcutil"):
-            bus = self._detect_ddcutil_bus()
-            if bus != -1:
-                self.ddcutil_bus = bus
-                logger.info(f"Using ddcutil backend with I2C bus: {bus}")
+            displays = DdcManager.get_initial().displays
+            if displays:
+                buses = ", ".join(str(display.bus) for display in displays)
+                logger.info(f"Using ddcutil backend with I2C buses: {buses}")
                 return "ddcutil"
             else:
                 logger.debug(
@@ -150,127 +143,54 @@ class Brightness(Service):
         return None
 
     def _get_screen_device(self):
-        """Return first backlight device from sysfs."""
-        try:
-            return os.listdir("/sys/class/backlight")[0]
-        except Exception:
-            return ""
+        """Return first backlight device from sysfs, looked up once."""
+        if self._screen_device is None:
+            try:
+                self._screen_device = sorted(os.listdir(self.BACKLIGHT_DIR))[0]
+            except Exception:
+                self._screen_device = ""
+        return self._screen_device
 
-    def _detect_ddcutil_bus(self):
-        """Detect I2C bus number for ddcutil."""
-        try:
-            process = subprocess.run(
-                ["ddcutil", "detect"], text=True, capture_output=True, timeout=2
-            )
-            if process.returncode == 0:
-                match = re.search(r"I2C bus:\s*/dev/i2c-(\d+)", process.stdout)
-                return int(match.group(1)) if match else -1
-            return -1
-        except Exception:
-            return -1
+    def _ddc_display(self):
+        """DDC/CI worker of the focused monitor, or of the first display."""
+        monitors = get_monitor_manager()
+        display = monitors.get_ddc_display(monitors.get_focused_monitor_id())
+        return display or DdcManager.get_initial().get_display()
 
     def _read_max_brightness(self):
         """Read maximum brightness value"""
         if self.backend:
             if self.backend == "ddcutil":
-                try:
-                    process = subprocess.run(
-                        [
-                            "ddcutil",
-                            "--bus",
-                            str(self.ddcutil_bus),
-                            *self.DDCUTIL_PARAMS.split(),
-                            "getvcp",
-                            "10",
-                        ],
-                        text=True,
-                        capture_output=True,
-                        timeout=2,
-                    )
-
-                    if process.returncode == 0:
-                        match = re.search(
-                            r"current value\s*=\s*(\d+)\s*,\s*max value\s*=\s*(\d+)",
-                            process.stdout,
-                        )
-                        if match:
-                            return int(match.group(2))
-                except Exception as e:
-                    logger.error(f"Error executing ddcutil: {e}")
+                value = self._ddc_display().get(BRIGHTNESS)
+                return value[1] if value else None
             else:
                 try:
                     with open(
-                        f"/sys/class/backlight/{self._get_screen_device()}/max_brightness"
+                        f"{self.BACKLIGHT_DIR}/{self._get_screen_device()}/max_brightness"
                     ) as f:
                         return int(f.readline().strip())
                 except Exception:
                     return None
 
-    def _update_brightness_cache(self):
-        """Update brightness cache with current value."""
-        if self.backend == "ddcutil":
-            self.screen_brightness  # This will update the cache
-        return False
-
     @Property(int, "read-write")
     def screen_brightness(self):
         """Getter returns current brightness in RAW value (0 to max_screen)."""
         if not self.backend:
             return -1
 
-        if self.backend == "brightnessctl":
-            # Return cached raw value if available
-            if self._last_raw != -1:
-                return self._last_raw
-
-            try:
-                with open(
-                    f"/sys/class/backlight/{self._get_screen_device()}/brightness"
-                ) as f:
-                    raw = int(f.readline().strip())
-                self._last_raw = raw
-                return raw
-            except Exception as e:
-                logger.error(f"Error reading brightness file: {e}")
-                return -1
+        if self.backend == "backlight":
+            # Kept current by the file monitor and our own writes
+            if self._last_raw == -1:
+                self._last_raw = self._read_backlight()
+            return self._last_raw
         elif self.backend == "ddcutil":
-            # Use cached value if recent enough
-            if (
-                time.time() - self._last_update_time < self.CACHE_INTERVAL
-                and self._last_raw != -1
-            ):
-                return self._last_raw
-
-            try:
-                process = subprocess.run(
-                    [
-                        "ddcutil",
-                        "--bus",
-                        str(self.ddcutil_bus),
-                        *self.DDCUTIL_PARAMS.split(),
-                        "getvcp",
-                        "10",
-                    ],
-                    text=True,
-                    capture_output=True,
-                    timeout=2,
-                )
-
-                if process.returncode == 0:
-                    match = re.search(
-                        r"current value\s*=\s*(\d+)\s*,\s*max value\s*=\s*(\d+)",
-                        process.stdout,
-                    )
-                    if match:
-                        current = int(match.group(1))
-                        # For ddcutil, raw value IS the current value (0-100)
-                        self._last_raw = current
-                        self._last_update_time = time.time()
-                        return current
-            except Exception as e:
-                logger.error(f"Error executing ddcutil: {e}")
-
-            return self._last_raw if self._last_raw != -1 else -1
+            # Served from the worker's cache, never from the bus
+            display = self._ddc_display()
+            value = display.get(BRIGHTNESS) if display else None
+            if value is None:
+                return -1
+            self._last_raw = value[0]
+            return self._last_raw
 
     @screen_brightness.setter
     def screen_brightness(self, value: int):
@@ -298,24 +218,22 @@ class Brightness(Service):
 
             self._pending_raw = value
 
-            # Use a single timer for applying changes
-            if self._timer_id:
-                GLib.source_remove(self._timer_id)
-            self._timer_id = GLib.timeout_add(50, self._apply_brightness)
+            # Sent right away, or by the write in flight when it completes
+            if not self._writing:
+                GLib.idle_add(self._apply_brightness)
         finally:
             self._lock.unlock()
 
     def _apply_brightness(self):
-        """Apply pending brightness change with optimized debouncing."""
+        """Apply the latest pending brightness change."""
         self._lock.lock()
         try:
             if self._pending_raw is None:
-                self._timer_id = None
                 return False
 
             raw = self._pending_raw
             self._pending_raw = None
-            self._timer_id = None
+            self._writing = self.backend == "backlight"
         finally:
             self._lock.unlock()
 
@@ -326,32 +244,77 @@ class Brightness(Service):
             # Calculate percentage for signal emission
             percent = int((raw / self.max_screen) * 100) if self.max_screen > 0 else 0
 
-            if self.backend == "brightnessctl":
+            if self.backend == "backlight":
+                self._last_percent = percent
                 self.emit("screen", percent)
-                exec_shell_command_async(
-                    f"brightnessctl --device '{self._get_screen_device()}' set {raw}"
-                )
+                self._write_backlight(raw)
             elif self.backend == "ddcutil":
-                self._last_update_time = time.time()
+                self._last_percent = percent
                 self.emit("screen", percent)
-                exec_shell_command_async(
-                    f"ddcutil --bus {self.ddcutil_bus} {self.DDCUTIL_PARAMS} --terse setvcp 10 {raw}",
-                    lambda exit_code, stdout, stderr: logger.error(
-                        f"ddcutil error (code {exit_code}): {stderr}"
-                    )
-                    if exit_code != 0
-                    else None,
-                )
+                # The worker collapses writes queued while the bus is busy
+                self._ddc_display().set(BRIGHTNESS, raw)
         except Exception as e:
+            self._writing = False
             logger.error(f"Error setting brightness: {e}")
         return False
 
+    def _write_backlight(self, raw: int):
+        if not self._use_logind:
+            exec_shell_command_async(
+                f"brightnessctl --device '{self._get_screen_device()}' set {raw}"
+            )
+            self._on_write_done()
+            return
+        Gio.bus_get_sync(Gio.BusType.SYSTEM, None).call(
+            "org.freedesktop.login1",
+            "/org/freedesktop/login1/session/auto",
+            "org.freedesktop.login1.Session",
+            "SetBrightness",
+            GLib.Variant("(ssu)", ("backlight", self._get_screen_device(), int(raw))),
+            None,
+            Gio.DBusCallFlags.NONE,
+            -1,
+            None,
+            self._on_logind_reply,
+            raw,
+        )
+
+    def _on_logind_reply(self, bus, result, raw):
+        try:
+            bus.call_finish(result)
+        except GLib.Error as e:
+            # No session, or a logind older than v243
+            logger.warning(f"logind SetBrightness failed, using brightnessctl: {e.message}")
+            self._use_logind = False
+            self._write_backlight(raw)
+            return
+        self._on_write_done()
+
+    def _on_write_done(self):
+        self._writing = False
+        if self._pending_raw is not None:
+            self._apply_brightness()
+
+    def _on_ddc_value(self, display, code, current, maximum):
+        if code != BRIGHTNESS or display is not self._ddc_display():
+            return
+        self._emit_ddc_value(current)
+
+    def _on_focus_changed(self, old_monitor, new_monitor):
+        display = self._ddc_display()
+        value = display.get(BRIGHTNESS) if display else None
+        if value is not None:
+            self._emit_ddc_value(value[0])
+
+    def _emit_ddc_value(self, raw: int):
+        if raw == self._last_raw:
+            return
+        self._last_raw = raw
+        self._last_percent = int((raw / self.max_screen) * 100) if self.max_screen > 0 else 0
+        self.emit("screen", self._last_percent)
+
     def cleanup(self):
         """Clean up resources when service is stopped."""
-        if self._timer_id:
-            GLib.source_remove(self._timer_id)
-            self._timer_id = None
-
-        if self._poll_timer_id:
-            GLib.source_remove(self._poll_timer_id)
-            self._poll_timer_id = None
+        if self._monitor is not None:
+            self._monitor.cancel()
+            self._monitor = None
@@ -0,0 +1,100 @@
+import os
+
+from gi.repository import Gio, GLib
+from loguru import logger
+
+import config.data as data
+
+
+def socket_path() -> str:
+    # Keep in sync with scripts/ax_send.py
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir:
+        return os.path.join(runtime_dir, f"{data.APP_NAME}.sock")
+    return f"/tmp/{data.APP_NAME}-{os.getuid()}.sock"
+
+
+class CommandServer:
+    """Unix socket accepting one-line commands from scripts/ax_send.py.
+
+    A command is a verb followed by space separated arguments, e.g.
+    ``open-notch launcher``. It is dispatched on the main loop to the
+    callback registered for the verb, without evaluating any code, and
+    answered with one line: ``ok``, the string returned by the callback,
+    or ``error: <reason>``.
+    """
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the CommandServer instance."""
+        if CommandServer.instance is None:
+            CommandServer.instance = CommandServer()
+        return CommandServer.instance
+
+    def __init__(self, path: str = None):
+        self.path = path or socket_path()
+        self._handlers = {"ping": lambda: "pong"}
+        self._service = None
+
+    def register(self, verb: str, callback):
+        """Run `callback(*arguments)` for `verb`."""
+        self._handlers[verb] = callback
+
+    def start(self):
+        # Left behind by a previous instance; restarting replaces the shell anyway
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._service = Gio.SocketService()
+        try:
+            self._service.add_address(
+                Gio.UnixSocketAddress.new(self.path),
+                Gio.SocketType.STREAM,
+                Gio.SocketProtocol.DEFAULT,
+                None,
+            )
+            os.chmod(self.path, 0o600)
+        except (GLib.Error, OSError) as e:
+            logger.error(f"Cannot listen on {self.path}: {e}")
+            self._service = None
+            return
+        self._service.connect("incoming", self._on_incoming)
+        self._service.start()
+
+    def stop(self):
+        if self._service is not None:
+            self._service.stop()
+            self._service.close()
+            self._service = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    def _on_incoming(self, service, connection, _source_object):
+        stream = Gio.DataInputStream.new(connection.get_input_stream())
+        stream.read_line_async(GLib.PRIORITY_HIGH, None, self._on_line, connection)
+        return True
+
+    def _on_line(self, stream, result, connection):
+        try:
+            line, _length = stream.read_line_finish_utf8(result)
+            reply = self.dispatch(line or "")
+            connection.get_output_stream().write_all(f"{reply}\n".encode(), None)
+        except GLib.Error as e:
+            logger.warning(f"Command connection failed: {e}")
+        finally:
+            connection.close(None)
+
+    def dispatch(self, line: str) -> str:
+        words = line.split()
+        if not words:
+            return "error: empty command"
+        handler = self._handlers.get(words[0])
+        if handler is None:
+            return f"error: unknown command {words[0]}"
+        try:
+            result = handler(*words[1:])
+        except Exception as e:
+            logger.error(f"Command '{line}' failed: {e}")
+            return f"error: {e}"
+        return result if isinstance(result, str) else "ok"
@@ -0,0 +1,185 @@
+import json
+import os
+
+from fabric.core.service import Service, Signal
+from gi.repository import Gio, GLib
+from loguru import logger
+
+import config.data as data
+from config.settings_constants import DEFAULTS
+
+_MISSING = object()
+
+
+class ConfigService(Service):
+    """In-memory view of config.json, kept in sync with the file.
+
+    The file is parsed once and then watched with Gio, so reads never touch
+    the disk and always see the current settings, including changes written
+    by the settings window. Every changed key is emitted as `changed(key)`
+    and delivered to the callbacks registered for it with `connect_key`.
+
+    `set` updates memory right away; the file is rewritten atomically once
+    the writes settle, merging only the keys changed here.
+    """
+
+    instance = None
+    RELOAD_DELAY = 100  # ms, writers often touch the file several times
+    SAVE_DELAY = 500  # ms
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the ConfigService instance."""
+        if ConfigService.instance is None:
+            ConfigService.instance = ConfigService()
+        return ConfigService.instance
+
+    @Signal
+    def changed(self, key: str) -> None:
+        """Emitted when the value of `key` changes."""
+
+    def __init__(self, path: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path or data.CONFIG_FILE
+        self._values = self._read() or {}
+        self._typed = {}  # (key, type) -> validated value
+        self._key_callbacks = {}
+        self._dirty = set()
+        self._reload_id = None
+        self._save_id = None
+        self._monitor = None
+        try:
+            gfile = Gio.File.new_for_path(self.path)
+            self._monitor = gfile.monitor_file(Gio.FileMonitorFlags.NONE, None)
+            self._monitor.connect("changed", self._on_file_changed)
+        except GLib.Error as e:
+            logger.warning(f"Cannot watch {self.path}: {e}")
+
+    # --- Reads ---
+
+    def get(self, key: str, default=None):
+        if key in self._values:
+            return self._values[key]
+        return DEFAULTS.get(key, default)
+
+    def snapshot(self) -> dict:
+        return dict(self._values)
+
+    def _get_typed(self, key: str, kind: type):
+        cache_key = (key, kind)
+        if cache_key in self._typed:
+            return self._typed[cache_key]
+        value = self.get(key)
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            fallback = DEFAULTS.get(key)
+            logger.warning(
+                f"Config value of {key} is not a {kind.__name__}, using default"
+            )
+            value = fallback if isinstance(fallback, kind) else kind()
+        self._typed[cache_key] = value
+        return value
+
+    def get_bool(self, key: str) -> bool:
+        return self._get_typed(key, bool)
+
+    def get_int(self, key: str) -> int:
+        return self._get_typed(key, int)
+
+    def get_str(self, key: str) -> str:
+        return self._get_typed(key, str)
+
+    def get_list(self, key: str) -> list:
+        """The returned list is shared; copy it before modifying."""
+        return self._get_typed(key, list)
+
+    def get_dict(self, key: str) -> dict:
+        """The returned dict is shared; copy it before modifying."""
+        return self._get_typed(key, dict)
+
+    def connect_key(self, key: str, callback):
+        """Call `callback(value)` whenever `key` changes."""
+        self._key_callbacks.setdefault(key, []).append(callback)
+
+    # --- Writes ---
+
+    def set(self, key: str, value):
+        if self._values.get(key, _MISSING) == value:
+            return
+        self._values[key] = value
+        self._dirty.add(key)
+        if self._save_id is None:
+            self._save_id = GLib.timeout_add(self.SAVE_DELAY, self._save)
+        self._notify([key])
+
+    def _save(self):
+        self._save_id = None
+        # Merge into the file as it is now, so keys written by others survive
+        values = self._read()
+        if values is None:
+            values = dict(self._values)
+        for key in self._dirty:
+            if key in self._values:
+                values[key] = self._values[key]
+        self._dirty.clear()
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(values, f, indent=4)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.error(f"Error saving config: {e}")
+        return False
+
+    # --- Watching ---
+
+    def _read(self) -> dict | None:
+        """Parse the file; None if it can't be read right now."""
+        try:
+            with open(self.path, "r") as f:
+                values = json.load(f)
+            if isinstance(values, dict):
+                return values
+            logger.error(f"Ignoring {self.path}: not a JSON object")
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f"Error loading config: {e}")
+        return None
+
+    def _on_file_changed(self, monitor, file, other_file, event_type):
+        if event_type == Gio.FileMonitorEvent.ATTRIBUTE_CHANGED:
+            return
+        if self._reload_id is None:
+            self._reload_id = GLib.timeout_add(self.RELOAD_DELAY, self._reload)
+
+    def _reload(self):
+        self._reload_id = None
+        values = self._read()
+        if values is None:
+            # Probably caught mid-write; the next event reloads again
+            return False
+        # Local changes not saved yet win over the file
+        for key in self._dirty:
+            if key in self._values:
+                values[key] = self._values[key]
+        changed = [
+            key
+            for key in set(values) | set(self._values)
+            if values.get(key, _MISSING) != self._values.get(key, _MISSING)
+        ]
+        self._values = values
+        self._notify(changed)
+        return False
+
+    def _notify(self, keys):
+        if not keys:
+            return
+        self._typed = {k: v for k, v in self._typed.items() if k[0] not in keys}
+        for key in keys:
+            self.emit("changed", key)
+            for callback in self._key_callbacks.get(key, []):
+                try:
+                    callback(self.get(key))
+                except Exception as e:
+                    logger.error(f"Error in config callback for {key}: {e}")
@@ -0,0 +1,278 @@
+import json
+import os
+import re
+import subprocess
+import threading
+
+from gi.repository import GLib
+from loguru import logger
+
+import config.data as data
+
+BRIGHTNESS = 0x10
+DDCUTIL_PARAMS = ["--disable-dynamic-sleep", "--sleep-multiplier=0.05"]
+DDCUTIL_TIMEOUT = 5  # seconds, a busy I2C bus is slow
+
+
+class DdcDisplay:
+    """One DDC/CI capable display, driven by its own worker thread.
+
+    The worker is the only user of the display's I2C bus, so ddcutil runs
+    never overlap. Writes queued for a VCP code collapse into the latest
+    value while the bus is busy, and are applied before queued reads. The
+    last known value of every VCP code is cached and served without
+    touching the bus; `connect` callbacks get `(code, current, maximum)` on
+    the main loop when a read finds a new value.
+    """
+
+    def __init__(self, bus: int, connector: str = "", model: str = "", values: dict = None):
+        self.bus = bus
+        self.connector = connector
+        self.model = model
+        # DRM connectors are named like card1-DP-1, Hyprland calls it DP-1
+        self.name = re.sub(r"^card\d+-", "", connector)
+        self._values = dict(values or {})  # code -> (current, maximum)
+        self._writes = {}  # code -> latest value
+        # code -> number of set() calls, reads started before one are stale
+        self._generations = {}
+        self._reads = set()
+        self._callbacks = []
+        self._cond = threading.Condition()
+        self._bus_lock = threading.Lock()
+        threading.Thread(target=self._run, name=f"ddc-{bus}", daemon=True).start()
+
+    def connect(self, callback):
+        self._callbacks.append(callback)
+
+    def get(self, code: int = BRIGHTNESS) -> tuple | None:
+        """Cached (current, maximum), None if never read."""
+        return self._values.get(code)
+
+    def read(self, code: int = BRIGHTNESS):
+        """Queue a read; callbacks are notified if the value changed."""
+        with self._cond:
+            self._reads.add(code)
+            self._cond.notify()
+
+    def read_now(self, code: int = BRIGHTNESS) -> tuple | None:
+        """Read on the calling thread, for when nothing is cached yet."""
+        with self._bus_lock:
+            value = self._getvcp(code)
+            if value is not None:
+                self._values[code] = value
+            return value
+
+    def set(self, code: int, value: int):
+        value = int(value)
+        current = self._values.get(code)
+        with self._cond:
+            self._values[code] = (value, current[1] if current else 100)
+            self._generations[code] = self._generations.get(code, 0) + 1
+            self._writes[code] = value
+            self._cond.notify()
+
+    def to_dict(self) -> dict:
+        return {
+            "bus": self.bus,
+            "connector": self.connector,
+            "model": self.model,
+            "values": {str(code): list(value) for code, value in self._values.items()},
+        }
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._writes and not self._reads:
+                    self._cond.wait()
+                if self._writes:
+                    code = next(iter(self._writes))
+                    value = self._writes.pop(code)
+                else:
+                    code, value = self._reads.pop(), None
+                generation = self._generations.get(code, 0)
+            # Writes queued meanwhile replace each other until the next turn
+            with self._bus_lock:
+                if value is not None:
+                    ok = self._setvcp(code, value)
+                else:
+                    result = self._getvcp(code)
+            if value is not None:
+                if not ok:
+                    # Resync the cache with what the display actually has
+                    self.read(code)
+            elif result is not None:
+                with self._cond:
+                    # A value set meanwhile is newer than what was read
+                    if (
+                        code in self._writes
+                        or self._generations.get(code, 0) != generation
+                        or result == self._values.get(code)
+                    ):
+                        continue
+                    self._values[code] = result
+                GLib.idle_add(self._notify, code, *result)
+
+    def _notify(self, code: int, current: int, maximum: int):
+        for callback in self._callbacks:
+            callback(code, current, maximum)
+        return False
+
+    def _ddcutil(self, *args) -> subprocess.CompletedProcess | None:
+        try:
+            return subprocess.run(
+                ["ddcutil", "--bus", str(self.bus), *DDCUTIL_PARAMS, *args],
+                text=True,
+                capture_output=True,
+                timeout=DDCUTIL_TIMEOUT,
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"ddcutil on bus {self.bus} failed: {e}")
+            return None
+
+    def _getvcp(self, code: int) -> tuple | None:
+        process = self._ddcutil("--terse", "getvcp", f"{code:02x}")
+        if process is None or process.returncode != 0:
+            return None
+        # "VCP 10 C 50 100": continuous value, current and maximum
+        match = re.search(r"VCP\s+[0-9a-fA-F]+\s+C\s+(\d+)\s+(\d+)", process.stdout)
+        return (int(match.group(1)), int(match.group(2))) if match else None
+
+    def _setvcp(self, code: int, value: int) -> bool:
+        process = self._ddcutil("--noverify", "setvcp", f"{code:02x}", str(value))
+        if process is not None and process.returncode != 0:
+            logger.error(f"ddcutil error (code {process.returncode}): {process.stderr}")
+        return process is not None and process.returncode == 0
+
+
+class DdcManager:
+    """The DDC/CI capable displays, each with its DdcDisplay worker.
+
+    `ddcutil detect` takes seconds, so the displays and their last values
+    are cached on disk and the detection is only repeated in the background.
+    Only the very first run detects and reads on the calling thread.
+    """
+
+    instance = None
+    CACHE_FILE = os.path.join(data.CACHE_DIR, "ddc_displays.json")
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the DdcManager instance."""
+        if DdcManager.instance is None:
+            DdcManager.instance = DdcManager()
+        return DdcManager.instance
+
+    def __init__(self):
+        self.displays = []
+        self._callbacks = []
+        cached = self._load_cache()
+        if cached is None:
+            self._set_displays(self.detect() or [])
+            for display in self.displays:
+                display.read_now(BRIGHTNESS)
+            self._save_cache()
+        else:
+            self._set_displays(cached)
+            for display in self.displays:
+                display.read(BRIGHTNESS)
+            GLib.Thread.new("ddc-detect", lambda _: self._detect_in_background(), None)
+
+    def connect(self, callback):
+        """Call `callback(display, code, current, maximum)` when a display reports a new value."""
+        self._callbacks.append(callback)
+
+    def get_display(self, name: str = None) -> DdcDisplay | None:
+        """The display on connector `name` (e.g. DP-1), or the first one."""
+        if name is None:
+            return self.displays[0] if self.displays else None
+        for display in self.displays:
+            if display.name == name:
+                return display
+        # ddcutil before 2.0 doesn't report connectors
+        if len(self.displays) == 1 and not self.displays[0].name:
+            return self.displays[0]
+        return None
+
+    @staticmethod
+    def detect() -> list[dict] | None:
+        """The DDC/CI capable displays, None if ddcutil failed."""
+        try:
+            process = subprocess.run(
+                ["ddcutil", "detect", "--terse"], text=True, capture_output=True, timeout=10
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error(f"ddcutil detect failed: {e}")
+            return None
+        if process.returncode != 0:
+            logger.error(f"ddcutil detect error (code {process.returncode}): {process.stderr}")
+            return None
+        displays = []
+        # One block per display; invalid displays start with "Invalid display"
+        for block in re.split(r"\n\s*\n", process.stdout):
+            if not block.startswith("Display"):
+                continue
+            bus = re.search(r"I2C bus:\s*/dev/i2c-(\d+)", block)
+            if bus is None:
+                continue
+            connector = re.search(r"DRM connector:\s*(\S+)", block)
+            model = re.search(r"Monitor:\s*(.+)", block)
+            displays.append({
+                "bus": int(bus.group(1)),
+                "connector": connector.group(1) if connector else "",
+                "model": model.group(1).strip() if model else "",
+            })
+        return displays
+
+    def _set_displays(self, infos: list[dict]):
+        # Keep the workers of displays still on the same bus and connector
+        existing = {(d.bus, d.connector): d for d in self.displays}
+        self.displays = []
+        for info in infos:
+            display = existing.get((info["bus"], info.get("connector", "")))
+            if display is None:
+                values = {int(code): tuple(value) for code, value in info.get("values", {}).items()}
+                display = DdcDisplay(info["bus"], info.get("connector", ""), info.get("model", ""), values)
+                display.connect(lambda *args, display=display: self._on_value(display, *args))
+            self.displays.append(display)
+
+    def _detect_in_background(self):
+        infos = self.detect()
+        GLib.idle_add(self._on_detected, infos)
+
+    def _on_detected(self, infos: list[dict] | None):
+        # A failed or empty detection is more likely a busy bus than
+        # displays that went away: keep the ones already known
+        if not infos:
+            return False
+        known = [(d.bus, d.connector) for d in self.displays]
+        if [(info["bus"], info["connector"]) for info in infos] != known:
+            logger.info(f"DDC/CI displays changed: {[info['model'] for info in infos]}")
+            # Workers of displays that went away just stay idle
+            self._set_displays(infos)
+            for display in self.displays:
+                display.read(BRIGHTNESS)
+            self._save_cache()
+        return False
+
+    def _on_value(self, display: DdcDisplay, code: int, current: int, maximum: int):
+        self._save_cache()
+        for callback in self._callbacks:
+            callback(display, code, current, maximum)
+
+    def _load_cache(self) -> list[dict] | None:
+        try:
+            with open(self.CACHE_FILE) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_cache(self):
+        if not self.displays and self._load_cache():
+            # Never forget known displays because of one empty detection
+            return
+        try:
+            os.makedirs(os.path.dirname(self.CACHE_FILE), exist_ok=True)
+            with open(self.CACHE_FILE, "w") as f:
+                json.dump([display.to_dict() for display in self.displays], f)
+        except OSError as e:
+            logger.warning(f"Cannot save {self.CACHE_FILE}: {e}")
@@ -0,0 +1,174 @@
+import hashlib
+import os
+from collections import Counter, OrderedDict
+
+from gi.repository import GdkPixbuf
+from loguru import logger
+
+import config.data as data
+
+NOTIFICATION_IMAGES_DIR = f"{data.DATA_DIR}/notifications/images"
+IMAGE_SIZE = 48
+
+
+class NotificationImageCache:
+    """Content-addressed, reference-counted store for notification images.
+
+    Images are scaled to 48x48 and saved as `<sha1 of the pixels>.png`, so a
+    player sending the same album art many times produces a single file.
+
+    References come from two owners:
+
+    - live popups (`acquire` / `release`), kept in memory only,
+    - history entries (`promote` moves a popup reference to the history).
+
+    History references are kept per note id and rebuilt from the live notes
+    after every store compaction (`sync_history`), merged with the notes
+    promoted or released since the previous sync, which the compacted
+    snapshot may have missed. The images of notes the compaction dropped,
+    from this session or an earlier one, are deleted once unreferenced.
+    Until the first sync references are unknown and nothing is deleted. Dropping the last reference deletes the file
+    directly, with no directory scan.
+
+    Decoded, scaled pixbufs are kept in a small LRU so history renders don't
+    re-read and re-scale PNGs.
+    """
+
+    instance = None
+    PIXBUF_CACHE_SIZE = 64
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the NotificationImageCache instance."""
+        if NotificationImageCache.instance is None:
+            NotificationImageCache.instance = NotificationImageCache()
+        return NotificationImageCache.instance
+
+    def __init__(self, directory: str = NOTIFICATION_IMAGES_DIR):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+        self._transient = Counter()
+        self._history = Counter()
+        self._history_notes = {}  # note id -> path
+        # Since the last sync: note id -> path, None once released
+        self._history_changes = {}
+        self._history_known = False
+        self._pixbufs = OrderedDict()
+
+    # --- References ---
+
+    def acquire(self, pixbuf):
+        """Store `pixbuf` for a live notification and return its cache path."""
+        try:
+            scaled = pixbuf.scale_simple(
+                IMAGE_SIZE, IMAGE_SIZE, GdkPixbuf.InterpType.BILINEAR
+            )
+            digest = hashlib.sha1(scaled.get_pixels()).hexdigest()
+            path = os.path.join(self.directory, f"{digest}.png")
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                scaled.savev(tmp_path, "png", [], [])
+                os.replace(tmp_path, path)
+                logger.debug(f"Cached notification image: {path}")
+        except Exception as e:
+            logger.error(f"Error caching notification image: {e}")
+            return None
+        self._transient[path] += 1
+        return path
+
+    def promote(self, path, note_id):
+        """Hand a live notification's reference over to its history entry."""
+        if not path:
+            return
+        if self._transient[path] > 0:
+            self._transient[path] -= 1
+        note_id = str(note_id)
+        if self._history_notes.get(note_id) != path:
+            self._history_notes[note_id] = path
+            self._history[path] += 1
+        self._history_changes[note_id] = path
+
+    def release(self, path, from_history=False, note_id=None):
+        """Drop one reference; the file is deleted with the last one."""
+        if not path:
+            return
+        if from_history:
+            note_id = str(note_id)
+            if self._history_notes.pop(note_id, None) is not None and self._history[path] > 0:
+                self._history[path] -= 1
+            self._history_changes[note_id] = None
+        elif self._transient[path] > 0:
+            self._transient[path] -= 1
+        if self._history_known and self._refcount(path) == 0:
+            self._delete(path)
+
+    def _refcount(self, path) -> int:
+        return self._transient[path] + self._history[path]
+
+    def _delete(self, path):
+        self._transient.pop(path, None)
+        self._history.pop(path, None)
+        for key in [k for k in self._pixbufs if k[0] == path]:
+            del self._pixbufs[key]
+        try:
+            os.remove(path)
+            logger.debug(f"Deleted notification image: {path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Error deleting notification image {path}: {e}")
+
+    def sync_history(self, notes, dropped=()):
+        """Rebuild history references from the live notes and delete the unreferenced images.
+
+        `dropped` are images of notes removed from the history, possibly
+        never seen this session, that are deleted too if unreferenced.
+        """
+        history_notes = {
+            str(note.get("id")): note.get("cached_image_path")
+            for note in notes
+            if note.get("cached_image_path")
+        }
+        # Promotions and releases are idempotent per note, so replaying the
+        # ones the snapshot already includes changes nothing
+        for note_id, path in self._history_changes.items():
+            if path is None:
+                history_notes.pop(note_id, None)
+            else:
+                history_notes[note_id] = path
+        candidates = set(self._history) | set(self._transient) | set(dropped) | {
+            path for path in self._history_changes.values() if path
+        }
+        self._history_changes = {}
+        self._history_notes = history_notes
+        self._history = Counter(history_notes.values())
+        self._history_known = True
+        deleted = 0
+        for path in candidates:
+            if self._refcount(path) == 0:
+                self._delete(path)
+                deleted += 1
+        if deleted:
+            logger.info(f"Removed {deleted} unreferenced notification images.")
+
+    def clear_history(self, dropped=()):
+        """Drop every history reference, after the whole history was deleted."""
+        self._history_changes = {}
+        self.sync_history([], dropped)
+
+    # --- Decoding ---
+
+    def load(self, path, width, height):
+        """Return the scaled pixbuf for `path`, decoding it at most once while cached."""
+        key = (path, width, height)
+        pixbuf = self._pixbufs.get(key)
+        if pixbuf is not None:
+            self._pixbufs.move_to_end(key)
+            return pixbuf
+        pixbuf = GdkPixbuf.Pixbuf.new_from_file(path)
+        if pixbuf.get_width() != width or pixbuf.get_height() != height:
+            pixbuf = pixbuf.scale_simple(width, height, GdkPixbuf.InterpType.BILINEAR)
+        self._pixbufs[key] = pixbuf
+        if len(self._pixbufs) > self.PIXBUF_CACHE_SIZE:
+            self._pixbufs.popitem(last=False)
+        return pixbuf
@@ -0,0 +1,338 @@
+import json
+import os
+
+from gi.repository import GLib
+from loguru import logger
+
+import config.data as data
+
+NOTIFICATIONS_DATA_DIR = f"{data.DATA_DIR}/notifications"
+HISTORY_LOG_FILE = os.path.join(NOTIFICATIONS_DATA_DIR, "history.jsonl")
+
+
+class NotificationStore:
+    """Append-only persistent notification history.
+
+    Every change is one JSON line appended to `history.jsonl`:
+
+    - ``{"op": "add", "note": {...}}`` stores a notification,
+    - ``{"op": "del", "ids": [...]}`` is a tombstone for deleted notifications,
+    - ``{"op": "del_app", "app_name": ...}`` deletes every earlier notification
+      of an app.
+
+    Inserts and deletes are O(1) writes; inserts arriving within
+    `FLUSH_DELAY` are batched into one write. Pages are read backwards from the
+    end of the log, so startup only parses the most recent notifications.
+    The log is compacted (tombstones applied, history trimmed to the
+    retention cap) in a background thread once enough garbage accumulates.
+    """
+
+    instance = None
+    READ_CHUNK = 64 * 1024
+    COMPACT_DELAY = 30  # seconds after startup
+    FLUSH_DELAY = 500  # ms
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the NotificationStore instance."""
+        if NotificationStore.instance is None:
+            NotificationStore.instance = NotificationStore()
+        return NotificationStore.instance
+
+    def __init__(self, path: str = HISTORY_LOG_FILE, retention: int = None):
+        self.path = path
+        self.retention = retention or data.NOTIFICATION_HISTORY_LIMIT
+        self._lock = GLib.Mutex()
+        self._compacting = False
+        self._on_compacted = []
+        # Lines written since the last compaction, used to trigger the next one
+        self._appended = 0
+        self._pending = []  # records not written yet
+        self._flush_id = None
+        # Notes appended since startup, already shown live rather than paged
+        self._session_ids = set()
+        self._reset_cursor()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        GLib.timeout_add_seconds(self.COMPACT_DELAY, self._start_compaction)
+
+    def connect_compacted(self, callback):
+        """Call `callback(live_notes, dropped_images)` on the main loop after each compaction.
+
+        `dropped_images` are the cached image paths of the notes the
+        compaction removed, including notes of earlier sessions.
+        """
+        self._on_compacted.append(callback)
+
+    # --- Writes ---
+
+    def _write(self, *records: dict):
+        """Write `records` after any pending ones, keeping the log in order."""
+        records = self._pending + list(records)
+        self._pending = []
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        if not records:
+            return
+        lines = "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        self._lock.lock()
+        try:
+            with open(self.path, "a") as f:
+                f.write(lines)
+        except Exception as e:
+            logger.error(f"Error writing notification history: {e}")
+        finally:
+            self._lock.unlock()
+        self._appended += len(records)
+        if self._appended >= self.retention:
+            self._start_compaction()
+
+    def _flush(self):
+        self._flush_id = None
+        self._write()
+        return False
+
+    def append(self, note: dict):
+        self._pending.append({"op": "add", "note": note})
+        self._session_ids.add(str(note.get("id")))
+        if self._flush_id is None:
+            self._flush_id = GLib.timeout_add(self.FLUSH_DELAY, self._flush)
+
+    def delete(self, note_ids):
+        note_ids = [str(i) for i in note_ids]
+        if note_ids:
+            # Also hide them from pages that are still to be read
+            self._tombstones.update(note_ids)
+            self._write({"op": "del", "ids": note_ids})
+
+    def delete_app(self, app_name: str):
+        self._deleted_apps.add(app_name)
+        self._write({"op": "del_app", "app_name": app_name})
+
+    def clear(self) -> set:
+        """Delete the whole history, returning the cached image paths of its notes."""
+        images = {
+            record["note"].get("cached_image_path")
+            for record in self._pending
+            if record.get("op") == "add"
+        }
+        self._pending = []
+        self._session_ids = set()
+        if self._flush_id is not None:
+            GLib.source_remove(self._flush_id)
+            self._flush_id = None
+        self._lock.lock()
+        try:
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get("op") == "add":
+                            images.add((record.get("note") or {}).get("cached_image_path"))
+                os.remove(self.path)
+        except Exception as e:
+            logger.error(f"Error deleting notification history: {e}")
+        finally:
+            self._lock.unlock()
+        self._appended = 0
+        self._reset_cursor()
+        images.discard(None)
+        return images
+
+    # --- Paged reads ---
+
+    def _reset_cursor(self):
+        try:
+            self._offset = os.path.getsize(self.path)
+        except OSError:
+            self._offset = 0
+        self._partial = b""
+        self._lines = []  # complete lines not consumed yet, oldest first
+        self._tombstones = set()
+        self._deleted_apps = set()
+        self._served = 0
+        self._oldest_served = None
+
+    @property
+    def exhausted(self) -> bool:
+        if self._served >= self.retention:
+            return True
+        return self._offset == 0 and not self._partial and not self._lines
+
+    def _next_line(self, f):
+        """Return the previous line of the log, reading one chunk backwards if needed."""
+        if not self._lines:
+            if self._offset == 0:
+                if not self._partial:
+                    return None
+                self._lines, self._partial = [self._partial], b""
+            else:
+                start = max(0, self._offset - self.READ_CHUNK)
+                f.seek(start)
+                block = f.read(self._offset - start) + self._partial
+                self._offset = start
+                self._lines = block.split(b"\n")
+                # The first piece may be cut mid-line unless we reached the start
+                self._partial = self._lines.pop(0) if start > 0 else b""
+        return self._lines.pop()
+
+    def load_page(self, limit: int) -> list:
+        """Return up to `limit` older live notifications, newest first.
+
+        Successive calls continue where the previous page ended. Only the
+        part of the log needed to fill the page is read.
+        """
+        notes = []
+        limit = min(limit, self.retention - self._served)
+        if limit <= 0:
+            return notes
+        try:
+            with open(self.path, "rb") as f:
+                while len(notes) < limit:
+                    line = self._next_line(f)
+                    if line is None:
+                        break
+                    note = self._parse_live(line)
+                    if note is not None:
+                        notes.append(note)
+        except FileNotFoundError:
+            self._offset, self._partial, self._lines = 0, b"", []
+        except Exception as e:
+            logger.error(f"Error loading notification history: {e}")
+        if notes:
+            self._served += len(notes)
+            self._oldest_served = notes[-1]
+        return notes
+
+    def _parse_live(self, line: bytes):
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        op = record.get("op")
+        if op == "del":
+            self._tombstones.update(record.get("ids", []))
+        elif op == "del_app":
+            self._deleted_apps.add(record.get("app_name"))
+        elif op == "add":
+            note = record.get("note") or {}
+            if (
+                str(note.get("id")) not in self._tombstones
+                and note.get("app_name") not in self._deleted_apps
+            ):
+                return note
+        return None
+
+    # --- Compaction ---
+
+    def _start_compaction(self):
+        if not self._compacting:
+            self._compacting = True
+            self._appended = 0
+            GLib.Thread.new("notification-compact", self._compact, None)
+        return False
+
+    def _compact(self, _data):
+        self._lock.lock()
+        dropped_images = set()
+        try:
+            live = {}
+            images = set()
+            if os.path.exists(self.path):
+                with open(self.path, "r") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get("op") == "add":
+                            note = record.get("note") or {}
+                            live[str(note.get("id"))] = note
+                            images.add(note.get("cached_image_path"))
+                        elif record.get("op") == "del":
+                            for note_id in record.get("ids", []):
+                                live.pop(str(note_id), None)
+                        elif record.get("op") == "del_app":
+                            app_name = record.get("app_name")
+                            live = {
+                                k: n for k, n in live.items() if n.get("app_name") != app_name
+                            }
+
+                kept = list(live.values())[-self.retention :]
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w") as f:
+                    for note in kept:
+                        f.write(json.dumps({"op": "add", "note": note}, separators=(",", ":")) + "\n")
+                os.replace(tmp_path, self.path)
+                live_notes = kept
+                dropped_images = images - {note.get("cached_image_path") for note in kept}
+                dropped_images.discard(None)
+                logger.debug(
+                    f"Compacted notification history: {len(live)} live, {len(kept)} kept"
+                )
+            else:
+                live_notes = []
+        except Exception as e:
+            logger.error(f"Error compacting notification history: {e}")
+            live_notes = None
+        finally:
+            self._lock.unlock()
+        GLib.idle_add(self._finish_compaction, live_notes, dropped_images)
+
+    def _finish_compaction(self, live_notes, dropped_images):
+        self._compacting = False
+        # The file was rewritten, so byte offsets of a partially read history
+        # are stale: continue right after the oldest note already served, or
+        # before the notes of this session if none was.
+        served, oldest = self._served, self._oldest_served
+        self._reset_cursor()
+        self._seek_past(oldest)
+        self._served, self._oldest_served = served, oldest
+        if live_notes is not None:
+            for callback in self._on_compacted:
+                callback(live_notes, dropped_images)
+        return False
+
+    def _seek_past(self, oldest: dict | None):
+        """Skip every line of the log that is not older than `oldest`.
+
+        Without `oldest`, skip the notes appended this session.
+        """
+        if oldest is not None:
+            oldest_id = str(oldest.get("id"))
+            oldest_ts = oldest.get("timestamp") or ""
+        try:
+            with open(self.path, "rb") as f:
+                while True:
+                    line = self._next_line(f)
+                    if line is None:
+                        return
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("op") != "add":
+                        # Tombstones still apply to the notes read after them
+                        self._parse_live(line)
+                        continue
+                    note = record.get("note") or {}
+                    if oldest is None:
+                        if str(note.get("id")) not in self._session_ids:
+                            self._lines.append(line)
+                            return
+                        continue
+                    if str(note.get("id")) == oldest_id:
+                        return
+                    if (note.get("timestamp") or "") < oldest_ts:
+                        self._lines.append(line)
+                        return
+        except FileNotFoundError:
+            self._offset, self._partial, self._lines = 0, b"", []
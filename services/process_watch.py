@@ -0,0 +1,180 @@
+import os
+
+from gi.repository import GLib
+from loguru import logger
+
+from services.scheduler import PeriodicScheduler
+
+
+def _read(path: str) -> bytes:
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        # The process exited while scanning
+        return b""
+
+
+class ProcessWatcher:
+    """Tells subscribers whether named processes are running.
+
+    One scan of /proc in a background thread, every INTERVAL seconds,
+    serves every watched name, instead of a pgrep fork per name and widget.
+    Like pgrep, a name is matched against the process name, or against the
+    whole command line with `full=True`. Once a process is found, its exit
+    is noticed right away through a pidfd where the kernel supports it.
+
+    Callbacks get `running` on the main loop when they subscribe and then
+    only when it changes, or when `confirm` re-checks it.
+    """
+
+    instance = None
+    INTERVAL = 2  # seconds
+    CONFIRM_DELAY = 500  # ms for a spawned or killed process to start or exit
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the ProcessWatcher instance."""
+        if ProcessWatcher.instance is None:
+            ProcessWatcher.instance = ProcessWatcher()
+        return ProcessWatcher.instance
+
+    def __init__(self):
+        self._watches = {}  # (name, full) -> {"running", "callbacks", "pidfd", "source"}
+        self._job = None
+        self._scanning = False
+        self._rescan = False
+        self._confirm = False
+
+    def watch(self, name: str, callback, full: bool = False):
+        """Call `callback(running)` now if known, and whenever it changes."""
+        entry = self._watches.setdefault(
+            (name, full), {"running": None, "callbacks": [], "pidfd": None, "source": None}
+        )
+        entry["callbacks"].append(callback)
+        if entry["running"] is not None:
+            callback(entry["running"])
+        if self._job is None:
+            self._job = PeriodicScheduler.get_initial().add(
+                self.refresh, self.INTERVAL, name="process-watch"
+            )
+        self.refresh()
+
+    def unwatch(self, name: str, callback, full: bool = False):
+        entry = self._watches.get((name, full))
+        if entry is None or callback not in entry["callbacks"]:
+            return
+        entry["callbacks"].remove(callback)
+        if not entry["callbacks"]:
+            self._close_pidfd(entry)
+            del self._watches[(name, full)]
+        if not self._watches and self._job is not None:
+            self._job.remove()
+            self._job = None
+
+    def is_running(self, name: str, full: bool = False) -> bool | None:
+        """Last known state, None before the first scan."""
+        entry = self._watches.get((name, full))
+        return entry["running"] if entry else None
+
+    def confirm(self):
+        """Re-check every watched name shortly after starting or killing one.
+
+        Callbacks get the result even if nothing changed, so a state shown
+        ahead of a spawn or kill that failed is put back.
+        """
+        GLib.timeout_add(self.CONFIRM_DELAY, self._on_confirm)
+
+    def _on_confirm(self):
+        self.refresh(confirm=True)
+        return False
+
+    def refresh(self, confirm: bool = False):
+        """Scan now; with `confirm`, also names held by a pidfd, notifying every result."""
+        if confirm:
+            self._confirm = True
+        if self._scanning:
+            self._rescan = True
+            return True
+        confirm, self._confirm = self._confirm, False
+        # Running processes held by a pidfd report their own exit
+        keys = [
+            key for key, entry in self._watches.items() if confirm or entry["pidfd"] is None
+        ]
+        if keys:
+            self._scanning = True
+            GLib.Thread.new("process-watch", lambda _: self._scan(keys, confirm), None)
+        return True
+
+    def _scan(self, keys: list, confirm: bool):
+        names = [name for name, full in keys if not full]
+        patterns = [name for name, full in keys if full]
+        found = {}
+        try:
+            pids = [pid for pid in os.listdir("/proc") if pid.isdigit()]
+        except OSError as e:
+            logger.error(f"Cannot list /proc: {e}")
+            pids = []
+        for pid in pids:
+            if len(found) == len(keys):
+                break
+            if names:
+                comm = _read(f"/proc/{pid}/comm").decode(errors="replace").strip()
+                for name in names:
+                    if name in comm:
+                        found.setdefault((name, False), int(pid))
+            if patterns:
+                cmdline = _read(f"/proc/{pid}/cmdline").replace(b"\0", b" ")
+                cmdline = cmdline.decode(errors="replace")
+                for pattern in patterns:
+                    if pattern in cmdline:
+                        found.setdefault((pattern, True), int(pid))
+        GLib.idle_add(self._apply, {key: found.get(key) for key in keys}, confirm)
+
+    def _apply(self, results: dict, confirm: bool):
+        self._scanning = False
+        for key, pid in results.items():
+            entry = self._watches.get(key)
+            if entry is None:
+                continue
+            if pid is not None and entry["pidfd"] is None:
+                self._open_pidfd(key, entry, pid)
+            running = pid is not None
+            if running != entry["running"] or confirm:
+                entry["running"] = running
+                for callback in list(entry["callbacks"]):
+                    callback(running)
+        if self._rescan:
+            self._rescan = False
+            self.refresh()
+        return False
+
+    def _open_pidfd(self, key: tuple, entry: dict, pid: int):
+        if not hasattr(os, "pidfd_open"):
+            return
+        try:
+            fd = os.pidfd_open(pid)
+        except OSError:
+            # Already gone, or pidfd unsupported by the kernel
+            return
+        entry["pidfd"] = fd
+        entry["source"] = GLib.unix_fd_add_full(
+            GLib.PRIORITY_DEFAULT, fd, GLib.IOCondition.IN, self._on_exit, key
+        )
+
+    def _close_pidfd(self, entry: dict):
+        if entry["source"] is not None:
+            GLib.source_remove(entry["source"])
+        if entry["pidfd"] is not None:
+            os.close(entry["pidfd"])
+        entry["pidfd"] = entry["source"] = None
+
+    def _on_exit(self, _fd, _condition, key):
+        entry = self._watches.get(key)
+        if entry is not None:
+            # Removed by returning False
+            entry["source"] = None
+            self._close_pidfd(entry)
+        # Another matching process may still be running
+        self.refresh()
+        return False
@@ -0,0 +1,232 @@
+import math
+from collections import deque
+
+from gi.repository import Gio, GLib, Gtk
+from loguru import logger
+
+PAUSED = None
+
+
+def _now() -> float:
+    return GLib.get_monotonic_time() / 1_000_000
+
+
+class PeriodicJob:
+    """A callback run by the PeriodicScheduler, see `PeriodicScheduler.add`."""
+
+    def __init__(
+        self,
+        scheduler: "PeriodicScheduler",
+        callback,
+        interval: float,
+        hidden_interval: float | None,
+        battery_interval: float | None,
+        tolerance: float,
+        name: str,
+    ):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.interval = interval
+        self.hidden_interval = hidden_interval
+        self.battery_interval = battery_interval
+        self.tolerance = tolerance
+        self.name = name
+        self.visible = True
+        self.runs = 0
+        self.due = None
+
+    def current_interval(self) -> float | None:
+        """Seconds between runs in the current state, None while paused."""
+        if not self.visible:
+            return self.hidden_interval
+        if self.scheduler.on_battery:
+            return self.battery_interval
+        return self.interval
+
+    def deadline(self) -> float:
+        return self.due + self.tolerance * self.current_interval()
+
+    def set_visible(self, visible: bool):
+        if visible == self.visible:
+            return
+        self.visible = visible
+        # Catch up right away when shown, the state may be stale
+        self.due = _now() if visible else self._next_due(_now())
+        self.scheduler._reschedule()
+
+    def track_widget(self, widget: Gtk.Widget):
+        """Use the hidden rate while `widget` is not mapped."""
+        self.visible = widget.get_mapped()
+        self.due = self._next_due(_now())
+        widget.connect("map", lambda *_: self.set_visible(True))
+        widget.connect("unmap", lambda *_: self.set_visible(False))
+
+    def run_now(self):
+        """Run at the next wakeup instead of waiting for the next tick."""
+        self.due = _now()
+        self.scheduler._reschedule()
+
+    def remove(self):
+        self.scheduler.remove(self)
+
+    def _next_due(self, now: float) -> float | None:
+        interval = self.current_interval()
+        if interval is None:
+            return None
+        # Aligned to multiples of the interval, so jobs with the same rate
+        # share their wakeups wherever they were added
+        return (math.floor(now / interval) + 1) * interval
+
+    def _run(self, now: float):
+        self.runs += 1
+        try:
+            result = self.callback()
+        except Exception as e:
+            logger.exception(f"Periodic job {self.name} failed: {e}")
+            result = None
+        if result is False:
+            self.remove()
+        else:
+            self.due = self._next_due(now)
+
+
+class PeriodicScheduler:
+    """Runs the periodic polling of every module from one shared timer.
+
+    Each job is due on multiples of its interval and may run up to
+    `tolerance` intervals late, so one wakeup serves every job whose window
+    is open, like `timeout_add_seconds` but across the whole shell. Each job
+    has a rate when visible, when hidden (paused by default) and on battery
+    (half the visible rate by default); `wakeups_per_second` tells how often
+    the shell actually wakes up.
+    """
+
+    instance = None
+    DEFAULT_TOLERANCE = 0.25  # fraction of the interval
+    BATTERY_SLOWDOWN = 2
+    STATS_WINDOW = 60  # seconds
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the PeriodicScheduler instance."""
+        if PeriodicScheduler.instance is None:
+            PeriodicScheduler.instance = PeriodicScheduler()
+        return PeriodicScheduler.instance
+
+    def __init__(self):
+        self._jobs = []
+        self._timeout_id = None
+        self._wakeups = deque()
+        self._started = _now()
+        self.on_battery = False
+        self._upower = None
+        Gio.DBusProxy.new_for_bus(
+            Gio.BusType.SYSTEM,
+            Gio.DBusProxyFlags.NONE,
+            None,
+            "org.freedesktop.UPower",
+            "/org/freedesktop/UPower",
+            "org.freedesktop.UPower",
+            None,
+            self._on_upower_proxy,
+        )
+
+    def add(
+        self,
+        callback,
+        interval: float,
+        hidden_interval: float | None = PAUSED,
+        battery_interval: float | None = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+        widget: Gtk.Widget | None = None,
+        name: str | None = None,
+    ) -> PeriodicJob:
+        """Run `callback()` every `interval` seconds until it returns False.
+
+        With `widget`, the job is hidden while the widget is not mapped and
+        runs every `hidden_interval` seconds, or not at all if PAUSED.
+        `battery_interval` defaults to BATTERY_SLOWDOWN times `interval`.
+        """
+        if battery_interval is None:
+            battery_interval = interval * self.BATTERY_SLOWDOWN
+        job = PeriodicJob(
+            self,
+            callback,
+            interval,
+            hidden_interval,
+            battery_interval,
+            tolerance,
+            name or getattr(callback, "__qualname__", repr(callback)),
+        )
+        job.due = job._next_due(_now())
+        if widget is not None:
+            job.track_widget(widget)
+        self._jobs.append(job)
+        self._reschedule()
+        return job
+
+    def remove(self, job: PeriodicJob):
+        if job in self._jobs:
+            self._jobs.remove(job)
+            self._reschedule()
+
+    def _reschedule(self):
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+            self._timeout_id = None
+        deadlines = [job.deadline() for job in self._jobs if job.due is not None]
+        if not deadlines:
+            return
+        delay = max(min(deadlines) - _now(), 0)
+        self._timeout_id = GLib.timeout_add(math.ceil(delay * 1000), self._on_wakeup)
+
+    def _on_wakeup(self):
+        self._timeout_id = None
+        now = _now()
+        self._wakeups.append(now)
+        while self._wakeups[0] < now - self.STATS_WINDOW:
+            self._wakeups.popleft()
+        for job in list(self._jobs):
+            if job in self._jobs and job.due is not None and job.due <= now:
+                job._run(now)
+        self._reschedule()
+        return False
+
+    def _on_upower_proxy(self, _source, result):
+        try:
+            self._upower = Gio.DBusProxy.new_for_bus_finish(result)
+        except GLib.Error as e:
+            logger.warning(f"UPower unavailable, battery rates disabled: {e}")
+            return
+        self._upower.connect("g-properties-changed", lambda *_: self._update_power())
+        self._update_power()
+
+    def _update_power(self):
+        value = self._upower.get_cached_property("OnBattery")
+        on_battery = bool(value.unpack()) if value is not None else False
+        if on_battery == self.on_battery:
+            return
+        self.on_battery = on_battery
+        now = _now()
+        for job in self._jobs:
+            job.due = job._next_due(now)
+        self._reschedule()
+
+    def wakeups_per_second(self) -> float:
+        window = min(self.STATS_WINDOW, max(_now() - self._started, 1))
+        return len(self._wakeups) / window
+
+    def stats(self) -> dict:
+        return {
+            "wakeups_per_second": round(self.wakeups_per_second(), 3),
+            "on_battery": self.on_battery,
+            "jobs": [
+                {
+                    "name": job.name,
+                    "interval": job.current_interval(),
+                    "visible": job.visible,
+                    "runs": job.runs,
+                }
+                for job in self._jobs
+            ],
+        }
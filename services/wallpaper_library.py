@@ -0,0 +1,258 @@
+import bisect
+import json
+import os
+
+from fabric.core.service import Service, Signal
+from gi.repository import Gio, GLib
+from loguru import logger
+
+import config.data as data
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".gif", ".webp")
+
+
+def is_image(file_name: str) -> bool:
+    return file_name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def normalize_name(path: str) -> str:
+    """Search/sort form of a wallpaper path. Files on disk are never renamed."""
+    return path.lower().replace(" ", "-")
+
+
+class WallpaperLibrary(Service):
+    """Recursive, persistently indexed view of the wallpapers directory.
+
+    Wallpapers are identified by their path relative to the wallpapers
+    directory; sub-folders act as collections. The scan state of every
+    directory (its mtime, image files and sub-folders) is saved to disk, so a
+    rescan only lists directories whose mtime changed. The file list is kept
+    sorted by normalized name using sorted insertion.
+    """
+
+    instance = None
+    INDEX_FILE = f"{data.CACHE_DIR}/wallpaper_index.json"
+    SAVE_DELAY = 2  # seconds
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the WallpaperLibrary instance."""
+        if WallpaperLibrary.instance is None:
+            WallpaperLibrary.instance = WallpaperLibrary()
+        return WallpaperLibrary.instance
+
+    @Signal
+    def ready(self) -> None:
+        """Emitted once the initial scan has finished."""
+
+    @Signal
+    def added(self, path: str, position: int) -> None:
+        """Emitted when a wallpaper appears, with its sorted position."""
+
+    @Signal
+    def removed(self, path: str) -> None:
+        """Emitted when a wallpaper disappears."""
+
+    @Signal
+    def changed(self, path: str) -> None:
+        """Emitted when the contents of a wallpaper change."""
+
+    def __init__(self, root: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.root = root or data.WALLPAPERS_DIR
+        self.files = []
+        self.is_ready = False
+        self._keys = []  # normalized names, parallel to self.files
+        self._dirs = {}  # relative dir -> {"mtime", "files", "subdirs"}
+        self._monitors = {}
+        self._save_id = None
+        GLib.Thread.new("wallpaper-index", self._initial_scan, None)
+
+    # --- Public API ---
+
+    def full_path(self, path: str) -> str:
+        return os.path.join(self.root, path)
+
+    @staticmethod
+    def collection_of(path: str) -> str:
+        return os.path.dirname(path)
+
+    def collections(self) -> list:
+        return sorted(rel for rel in self._dirs if rel)
+
+    # --- Scanning ---
+
+    def _load_index(self) -> dict:
+        try:
+            with open(self.INDEX_FILE, "r") as f:
+                index = json.load(f)
+            if index.get("root") == self.root:
+                return index.get("dirs", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Discarding wallpaper index: {e}")
+        return {}
+
+    def _scan_dir(self, rel: str, cached: dict | None) -> dict | None:
+        """Return the scan state of a directory, reusing `cached` if its mtime is unchanged."""
+        try:
+            mtime = os.stat(self.full_path(rel)).st_mtime_ns
+        except OSError:
+            return None
+        if cached and cached.get("mtime") == mtime:
+            return cached
+
+        files, subdirs = [], []
+        try:
+            with os.scandir(self.full_path(rel)) as entries:
+                for entry in entries:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir():
+                        subdirs.append(entry.name)
+                    elif entry.is_file() and is_image(entry.name):
+                        files.append(entry.name)
+        except OSError as e:
+            logger.warning(f"Error scanning {rel or self.root}: {e}")
+        return {"mtime": mtime, "files": files, "subdirs": subdirs}
+
+    def _scan_tree(self, start: str, cached_dirs: dict) -> dict:
+        dirs = {}
+        stack = [start]
+        while stack:
+            rel = stack.pop()
+            state = self._scan_dir(rel, cached_dirs.get(rel))
+            if state is None:
+                continue
+            dirs[rel] = state
+            stack.extend(os.path.join(rel, name) for name in state["subdirs"])
+        return dirs
+
+    def _initial_scan(self, _data):
+        dirs = self._scan_tree("", self._load_index())
+        files = [
+            os.path.join(rel, name) for rel, state in dirs.items() for name in state["files"]
+        ]
+        files.sort(key=normalize_name)
+        GLib.idle_add(self._finish_initial_scan, dirs, files)
+
+    def _finish_initial_scan(self, dirs, files):
+        self._dirs = dirs
+        self.files = files
+        self._keys = [normalize_name(path) for path in files]
+        for rel in dirs:
+            self._watch(rel)
+        self.is_ready = True
+        self._schedule_save()
+        self.emit("ready")
+        return False
+
+    # --- Incremental updates ---
+
+    def _insert(self, path: str):
+        key = normalize_name(path)
+        position = bisect.bisect_left(self._keys, key)
+        if position < len(self.files) and self.files[position] == path:
+            return
+        self._keys.insert(position, key)
+        self.files.insert(position, path)
+        self.emit("added", path, position)
+
+    def _remove(self, path: str):
+        position = bisect.bisect_left(self._keys, normalize_name(path))
+        while position < len(self.files) and self._keys[position] == normalize_name(path):
+            if self.files[position] == path:
+                del self.files[position]
+                del self._keys[position]
+                self.emit("removed", path)
+                return
+            position += 1
+
+    def _watch(self, rel: str):
+        if rel in self._monitors:
+            return
+        try:
+            gfile = Gio.File.new_for_path(self.full_path(rel))
+            monitor = gfile.monitor_directory(Gio.FileMonitorFlags.NONE, None)
+        except GLib.Error as e:
+            logger.warning(f"Cannot watch {rel or self.root}: {e}")
+            return
+        monitor.connect("changed", self._on_directory_changed, rel)
+        self._monitors[rel] = monitor
+
+    def _refresh_dir_mtime(self, rel: str):
+        state = self._dirs.get(rel)
+        if state is not None:
+            try:
+                state["mtime"] = os.stat(self.full_path(rel)).st_mtime_ns
+            except OSError:
+                pass
+
+    def _add_tree(self, rel: str):
+        for sub_rel, state in self._scan_tree(rel, {}).items():
+            self._dirs[sub_rel] = state
+            self._watch(sub_rel)
+            for name in state["files"]:
+                self._insert(os.path.join(sub_rel, name))
+
+    def _remove_tree(self, rel: str):
+        for sub_rel in [d for d in self._dirs if d == rel or d.startswith(rel + os.sep)]:
+            state = self._dirs.pop(sub_rel)
+            monitor = self._monitors.pop(sub_rel, None)
+            if monitor is not None:
+                monitor.cancel()
+            for name in state["files"]:
+                self._remove(os.path.join(sub_rel, name))
+
+    def _on_directory_changed(self, monitor, file, other_file, event_type, rel):
+        name = file.get_basename()
+        if name.startswith("."):
+            return
+        path = os.path.join(rel, name)
+        state = self._dirs.get(rel)
+        if state is None:
+            return
+
+        if event_type == Gio.FileMonitorEvent.CREATED:
+            if os.path.isdir(self.full_path(path)):
+                if name not in state["subdirs"]:
+                    state["subdirs"].append(name)
+                    self._add_tree(path)
+            elif is_image(name) and name not in state["files"]:
+                state["files"].append(name)
+                self._insert(path)
+        elif event_type == Gio.FileMonitorEvent.DELETED:
+            if name in state["subdirs"]:
+                state["subdirs"].remove(name)
+                self._remove_tree(path)
+            elif name in state["files"]:
+                state["files"].remove(name)
+                self._remove(path)
+        elif event_type == Gio.FileMonitorEvent.CHANGES_DONE_HINT:
+            if name in state["files"]:
+                self.emit("changed", path)
+            return
+        else:
+            return
+
+        self._refresh_dir_mtime(rel)
+        self._schedule_save()
+
+    # --- Persistence ---
+
+    def _schedule_save(self):
+        if self._save_id is None:
+            self._save_id = GLib.timeout_add_seconds(self.SAVE_DELAY, self._save)
+
+    def _save(self):
+        self._save_id = None
+        tmp_path = f"{self.INDEX_FILE}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.INDEX_FILE), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"root": self.root, "dirs": self._dirs}, f)
+            os.replace(tmp_path, self.INDEX_FILE)
+        except Exception as e:
+            logger.error(f"Error saving wallpaper index: {e}")
+        return False
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import cast
 
 import fabric
@@ -5,6 +6,177 @@ from fabric import Property, Service, Signal
 from gi.repository import GLib, Gtk
 
 
+class CubicBezier:
+    """CSS `cubic-bezier(x1, y1, x2, y2)` timing function.
+
+    Progress is mapped through the curve by solving x(t) = time for t and
+    returning y(t). The solver starts from a small lookup table of x
+    samples and refines with Newton-Raphson, falling back to bisection
+    where the curve is too flat.
+    """
+
+    TABLE_SIZE = 11
+    NEWTON_ITERATIONS = 4
+    NEWTON_MIN_SLOPE = 0.001
+    SUBDIVISION_PRECISION = 1e-7
+    SUBDIVISION_MAX_ITERATIONS = 10
+
+    def __init__(self, x1: float, y1: float, x2: float, y2: float):
+        self.x1, self.y1, self.x2, self.y2 = x1, y1, x2, y2
+        self.linear = x1 == y1 and x2 == y2
+        step = 1 / (self.TABLE_SIZE - 1)
+        self._table = [self._sample(i * step, x1, x2) for i in range(self.TABLE_SIZE)]
+
+    @staticmethod
+    def _sample(t: float, p1: float, p2: float) -> float:
+        # B(t) = 3(1-t)^2 t p1 + 3(1-t) t^2 p2 + t^3, in Horner form
+        return ((1 - 3 * p2 + 3 * p1) * t + (3 * p2 - 6 * p1)) * t * t + 3 * p1 * t
+
+    @staticmethod
+    def _slope(t: float, p1: float, p2: float) -> float:
+        return 3 * (1 - 3 * p2 + 3 * p1) * t * t + 2 * (3 * p2 - 6 * p1) * t + 3 * p1
+
+    def _t_for_x(self, x: float) -> float:
+        step = 1 / (self.TABLE_SIZE - 1)
+        interval = 0
+        last = self.TABLE_SIZE - 1
+        while interval < last - 1 and self._table[interval + 1] <= x:
+            interval += 1
+        start = self._table[interval]
+        span = self._table[interval + 1] - start
+        t = (interval + ((x - start) / span if span else 0)) * step
+
+        slope = self._slope(t, self.x1, self.x2)
+        if slope >= self.NEWTON_MIN_SLOPE:
+            for _ in range(self.NEWTON_ITERATIONS):
+                slope = self._slope(t, self.x1, self.x2)
+                if slope == 0:
+                    break
+                t -= (self._sample(t, self.x1, self.x2) - x) / slope
+            return t
+        if slope == 0:
+            return t
+
+        low, high = interval * step, (interval + 1) * step
+        for _ in range(self.SUBDIVISION_MAX_ITERATIONS):
+            t = (low + high) / 2
+            error = self._sample(t, self.x1, self.x2) - x
+            if abs(error) <= self.SUBDIVISION_PRECISION:
+                break
+            if error > 0:
+                high = t
+            else:
+                low = t
+        return t
+
+    def ease(self, time: float) -> float:
+        if self.linear or time <= 0 or time >= 1:
+            return time
+        return self._sample(self._t_for_x(time), self.y1, self.y2)
+
+
+@lru_cache(maxsize=32)
+def get_cubic_bezier(curve: tuple[float, float, float, float]) -> CubicBezier:
+    return CubicBezier(*curve)
+
+
+class AnimationScheduler:
+    """Drives every playing Animator from a single callback.
+
+    The callback is the frame clock of a mapped tick widget when any playing
+    animator has one, so updates are aligned to the display refresh, and a
+    single timer otherwise. It is removed as soon as nothing is playing.
+    """
+
+    instance = None
+    FALLBACK_INTERVAL = 16  # ms
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the AnimationScheduler instance."""
+        if AnimationScheduler.instance is None:
+            AnimationScheduler.instance = AnimationScheduler()
+        return AnimationScheduler.instance
+
+    def __init__(self):
+        self._animators = []
+        self._ticking = False
+        self._widget = None
+        self._tick_id = None
+        self._unmap_id = None
+        self._timeout_id = None
+
+    def add(self, animator: "Animator"):
+        if animator in self._animators:
+            return
+        self._animators.append(animator)
+        if self._timeout_id is not None and self._find_tick_widget() is not None:
+            # Move from the fallback timer to a frame clock
+            self._stop_driver()
+        if self._tick_id is None and self._timeout_id is None:
+            self._start_driver()
+
+    def remove(self, animator: "Animator"):
+        if animator in self._animators:
+            self._animators.remove(animator)
+        # While ticking, the tick callback stops itself when idle
+        if not self._animators and not self._ticking:
+            self._stop_driver()
+
+    def _find_tick_widget(self) -> Gtk.Widget | None:
+        for animator in self._animators:
+            widget = animator._tick_widget
+            if widget is not None and widget.get_mapped():
+                return widget
+        return None
+
+    def _start_driver(self):
+        widget = self._find_tick_widget()
+        if widget is not None:
+            self._widget = widget
+            self._tick_id = widget.add_tick_callback(self._on_frame)
+            self._unmap_id = widget.connect("unmap", self._on_widget_unmap)
+        else:
+            self._timeout_id = GLib.timeout_add(self.FALLBACK_INTERVAL, self._on_timeout)
+
+    def _stop_driver(self):
+        if self._tick_id is not None:
+            self._widget.remove_tick_callback(self._tick_id)
+        if self._timeout_id is not None:
+            GLib.source_remove(self._timeout_id)
+        self._forget_driver()
+
+    def _forget_driver(self):
+        if self._unmap_id is not None:
+            self._widget.disconnect(self._unmap_id)
+        self._widget = self._tick_id = self._unmap_id = self._timeout_id = None
+
+    def _on_widget_unmap(self, *_):
+        # An unmapped widget's frame clock stops ticking
+        self._stop_driver()
+        if self._animators:
+            self._start_driver()
+
+    def _on_frame(self, widget, frame_clock):
+        return self._tick(frame_clock.get_frame_time() / 1_000_000)
+
+    def _on_timeout(self):
+        return self._tick(GLib.get_monotonic_time() / 1_000_000)
+
+    def _tick(self, now: float) -> bool:
+        self._ticking = True
+        try:
+            for animator in list(self._animators):
+                animator.do_update_value(now)
+        finally:
+            self._ticking = False
+        if self._animators:
+            return True
+        # Returning False removes the callback
+        self._forget_driver()
+        return False
+
+
 class Animator(Service):
     @Signal
     def finished(self) -> None: ...
@@ -90,7 +262,7 @@ class Animator(Service):
 
         self.playing = False
         self._start_time = None
-        self._tick_handler = None
+        self._scheduled = False
         self._timeline_pos = 0
         self._tick_widget = tick_widget
 
@@ -101,13 +273,7 @@ class Animator(Service):
         return start + (end - start) * time
 
     def do_interpolate_cubic_bezier(self, time: float) -> float:
-        y_points = (0, self.bezier_curve[1], self.bezier_curve[3], 1)
-        return (
-            (1 - time) ** 3 * y_points[0]
-            + 3 * (1 - time) ** 2 * time * y_points[1]
-            + 3 * (1 - time) * time**2 * y_points[2]
-            + time**3 * y_points[3]
-        )
+        return get_cubic_bezier(tuple(self.bezier_curve)).ease(time)
 
     def do_ease(self, time: float) -> float:
         return self.do_lerp(
@@ -120,7 +286,8 @@ class Animator(Service):
 
         elapsed_time = delta_time - cast(float, self._start_time)
 
-        self._timeline_pos = min(1, elapsed_time / self.duration)
+        # Frame clock time may be a little behind the monotonic start time
+        self._timeline_pos = max(0, min(1, elapsed_time / self.duration))
 
         self.value = self.do_ease(self._timeline_pos)
 
@@ -143,12 +310,9 @@ class Animator(Service):
         return True
 
     def do_remove_tick_handlers(self):
-        if self._tick_handler:
-            if self._tick_widget:
-                self._tick_widget.remove_tick_callback(self._tick_handler)
-            else:
-                GLib.source_remove(self._tick_handler)
-        self._tick_handler = None
+        if self._scheduled:
+            AnimationScheduler.get_initial().remove(self)
+        self._scheduled = False
         return
 
     def play(self):
@@ -156,16 +320,11 @@ class Animator(Service):
             return
 
         self._start_time = self.do_get_time_now()
-
-        if not self._tick_handler:
-            if self._tick_widget:
-                self._tick_handler = self._tick_widget.add_tick_callback(
-                    self.do_handle_tick
-                )
-            else:
-                self._tick_handler = GLib.timeout_add(16, self.do_handle_tick)
-
         self.playing = True
+
+        if not self._scheduled:
+            self._scheduled = True
+            AnimationScheduler.get_initial().add(self)
         return
 
     def pause(self):
@@ -173,7 +332,7 @@ class Animator(Service):
         return self.do_remove_tick_handlers()
 
     def stop(self):
-        if not self._tick_handler:
+        if not self._scheduled:
             self._timeline_pos = 0
             self.playing = False
             return
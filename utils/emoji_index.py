@@ -0,0 +1,213 @@
+"""
+Compiled emoji index for the emoji picker.
+
+`assets/emoji.json` is compiled once into a cache file holding the emoji,
+their names and groups, and sorted token tables (words of the name and
+slug, words of the group) with the ids of the emoji using each token.
+Later runs load that file with `marshal` in about a millisecond and search
+with a binary search over the token tables instead of scanning every name.
+The cache is rebuilt whenever the JSON file changes.
+
+Recently used emoji are remembered and ranked first.
+"""
+
+import bisect
+import json
+import marshal
+import os
+import re
+
+from fabric.utils.helpers import get_relative_path
+
+import config.data as data
+
+SOURCE_FILE = get_relative_path("../assets/emoji.json")
+INDEX_FILE = f"{data.CACHE_DIR}/emoji_index.bin"
+RECENT_FILE = f"{data.CACHE_DIR}/emoji_recent.json"
+INDEX_VERSION = 1
+RECENT_LIMIT = 32
+
+# Score of a match, per query word
+EXACT_NAME_MATCH = 4
+PREFIX_NAME_MATCH = 2
+GROUP_MATCH = 1
+SUBSTRING_MATCH = 0
+# Words are only scanned for substrings when prefixes match fewer emoji than
+# this, about a page of the picker
+SUBSTRING_SCAN_BELOW = 45
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list:
+    return _WORD.findall(text.casefold())
+
+
+def _token_table(postings: dict) -> tuple:
+    tokens = sorted(postings)
+    return tokens, [tuple(postings[token]) for token in tokens]
+
+
+def compile_index(source: str = SOURCE_FILE) -> tuple:
+    """Return (chars, names, groups, name_tokens, name_postings, group_tokens, group_postings)."""
+    with open(source, "r") as f:
+        raw = json.load(f)
+    chars, names, groups = [], [], []
+    name_postings, group_postings = {}, {}
+    for emoji_id, (emoji_char, info) in enumerate(raw.items()):
+        name = info.get("name", "")
+        group = info.get("group", "")
+        chars.append(emoji_char)
+        names.append(name)
+        groups.append(group)
+        for token in set(tokenize(name) + tokenize(info.get("slug", ""))):
+            name_postings.setdefault(token, []).append(emoji_id)
+        for token in set(tokenize(group)):
+            group_postings.setdefault(token, []).append(emoji_id)
+    return (chars, names, groups, *_token_table(name_postings), *_token_table(group_postings))
+
+
+class EmojiIndex:
+    """Emoji data and search shared by the pickers of every monitor."""
+
+    instance = None
+
+    @staticmethod
+    def get_initial():
+        """Singleton to get the EmojiIndex instance."""
+        if EmojiIndex.instance is None:
+            EmojiIndex.instance = EmojiIndex()
+        return EmojiIndex.instance
+
+    def __init__(self, source: str = SOURCE_FILE, path: str = INDEX_FILE):
+        self.source = source
+        self.path = path
+        (
+            self.chars,
+            self.names,
+            self.groups,
+            self._name_tokens,
+            self._name_postings,
+            self._group_tokens,
+            self._group_postings,
+        ) = self._load()
+        self._haystack = None
+        self.recent = self._load_recent()
+
+    def __len__(self) -> int:
+        return len(self.chars)
+
+    # --- Loading ---
+
+    def _load(self) -> tuple:
+        try:
+            stat = os.stat(self.source)
+        except OSError:
+            print(f"Emoji JSON file not found at: {self.source}")
+            return [], [], [], [], [], [], []
+        key = (INDEX_VERSION, stat.st_mtime_ns, stat.st_size)
+        try:
+            with open(self.path, "rb") as f:
+                cached_key, compiled = marshal.load(f)
+            if cached_key == key:
+                return compiled
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+
+        compiled = compile_index(self.source)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                marshal.dump((key, compiled), f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"Error writing emoji index: {e}")
+        return compiled
+
+    def _load_recent(self) -> list:
+        try:
+            with open(RECENT_FILE, "r") as f:
+                recent = json.load(f)
+            return [c for c in recent if isinstance(c, str)][:RECENT_LIMIT]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Error reading recent emojis: {e}")
+            return []
+
+    # --- Search ---
+
+    @staticmethod
+    def _prefix_matches(tokens: list, postings: list, term: str):
+        """Yield (exact, ids) for every token starting with `term`."""
+        for position in range(bisect.bisect_left(tokens, term), len(tokens)):
+            token = tokens[position]
+            if not token.startswith(term):
+                break
+            yield token == term, postings[position]
+
+    def _term_scores(self, term: str) -> dict:
+        scores = {}
+        for exact, ids in self._prefix_matches(self._name_tokens, self._name_postings, term):
+            score = EXACT_NAME_MATCH if exact else PREFIX_NAME_MATCH
+            for emoji_id in ids:
+                if scores.get(emoji_id, -1) < score:
+                    scores[emoji_id] = score
+        for _exact, ids in self._prefix_matches(self._group_tokens, self._group_postings, term):
+            for emoji_id in ids:
+                scores.setdefault(emoji_id, GROUP_MATCH)
+        if len(scores) >= SUBSTRING_SCAN_BELOW:
+            return scores
+        # Too few prefix hits: also match inside words ("rin" -> grinning),
+        # below every prefix hit
+        if self._haystack is None:
+            self._haystack = [
+                f"{name} {group}".casefold() for name, group in zip(self.names, self.groups)
+            ]
+        for emoji_id, text in enumerate(self._haystack):
+            if term in text:
+                scores.setdefault(emoji_id, SUBSTRING_MATCH)
+        return scores
+
+    def search(self, query: str = "") -> list:
+        """Ids of the emoji matching every word of `query`, best first.
+
+        Recently used emoji come first, then the rest by score and in the
+        original order. An empty query returns every emoji.
+        """
+        scores = None
+        for term in tokenize(query):
+            term_scores = self._term_scores(term)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {i: s + term_scores[i] for i, s in scores.items() if i in term_scores}
+            if not scores:
+                return []
+        if scores is None:
+            scores = dict.fromkeys(range(len(self.chars)), 0)
+        recent_rank = {emoji_char: rank for rank, emoji_char in enumerate(self.recent)}
+        not_recent = len(recent_rank)
+        return sorted(
+            scores,
+            key=lambda i: (recent_rank.get(self.chars[i], not_recent), -scores[i], i),
+        )
+
+    # --- Recently used ---
+
+    def mark_used(self, emoji_char: str):
+        if self.recent and self.recent[0] == emoji_char:
+            return
+        if emoji_char in self.recent:
+            self.recent.remove(emoji_char)
+        self.recent.insert(0, emoji_char)
+        del self.recent[RECENT_LIMIT:]
+        tmp_path = f"{RECENT_FILE}.tmp"
+        try:
+            os.makedirs(os.path.dirname(RECENT_FILE), exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.recent, f)
+            os.replace(tmp_path, RECENT_FILE)
+        except Exception as e:
+            print(f"Error saving recent emojis: {e}")
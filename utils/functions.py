@@ -5,13 +5,15 @@ import subprocess
 from typing import Dict, List, Literal
 
 import gi
-import psutil
 from fabric.utils import exec_shell_command, exec_shell_command_async, get_relative_path
 from gi.repository import Gdk, GLib, Gtk
 from loguru import logger
 
 from .colors import Colors
 from .icons import distro_text_icons
+from .lazy_import import lazy_import
+
+psutil = lazy_import("psutil")
 
 gi.require_version("Gtk", "3.0")
 
@@ -0,0 +1,46 @@
+"""
+Deferred imports for heavy dependencies.
+
+`np = lazy_import("numpy")` returns a module object right away, but the
+module only executes the first time one of its attributes is used. Imports
+of numpy, PIL, requests, psutil and dbus therefore stay off the startup
+path of modules that only need them in rarely used code (the calculator,
+thumbnails, currency conversion, ...).
+
+importlib's LazyLoader is not thread-safe before Python 3.12: two threads
+touching a lazy module for the first time at once can both execute it.
+Call `load()` on the main thread before handing a lazy module to worker
+threads.
+
+Check the effect with scripts/import_budget.py.
+"""
+
+import importlib.util
+import sys
+
+
+def lazy_import(name: str):
+    """Return module `name`, executing it on first attribute access.
+
+    A module that is already imported is returned as is. Parent packages
+    of dotted names are imported normally (that is how their loaders are found).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def load(module):
+    """Execute the lazy `module` now, if it has not been yet, and return it."""
+    # Any attribute access runs the deferred import
+    getattr(module, "__name__")
+    return module
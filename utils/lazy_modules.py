@@ -0,0 +1,127 @@
+"""
+On-demand construction of the pages of a Gtk.Stack.
+
+The notch and the dashboard hold many modules that are rarely all used in
+a session, and some are expensive to build (file watchers, thumbnail
+pools, large JSON indexes). `LazyModules` registers a factory per page and
+only calls it the first time the page is needed; `prewarm()` builds pages
+ahead of time from low priority idle callbacks instead.
+"""
+
+from fabric.widgets.box import Box
+from gi.repository import GLib, Gtk
+
+from utils import startup_trace
+
+
+def lazy_module(name: str, registry: str = "modules"):
+    """Attribute that returns the module `name` of `self.<registry>`, building it if needed."""
+    return property(lambda self: getattr(self, registry).get(name))
+
+
+class LazyModules:
+    """Registry of the lazily built pages of `stack`.
+
+    Pages of a titled stack (one with a Gtk.StackSwitcher) get an empty
+    placeholder right away so their switcher button exists; the placeholder
+    is swapped for the real page, at the same position, when it is shown.
+    Pages of an untitled stack are only added once built.
+    """
+
+    def __init__(self, stack: Gtk.Stack, titled: bool = False):
+        self.stack = stack
+        self.titled = titled
+        self._factories = {}
+        self._titles = {}
+        self._instances = {}
+        self._placeholders = {}
+        self._on_built = []
+        self._prewarm_queue = []
+        self._prewarm_id = None
+        self._swapping = False
+        if titled:
+            stack.connect("notify::visible-child", self._on_visible_child_changed)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def register(self, name: str, factory, title: str = None):
+        self._factories[name] = factory
+        if self.titled:
+            self._titles[name] = title or name.capitalize()
+            placeholder = Box(name=f"{name}-placeholder", visible=True)
+            self._placeholders[name] = placeholder
+            self.stack.add_titled(placeholder, name, self._titles[name])
+
+    def connect_built(self, callback):
+        """Call `callback(name, widget)` after a page has been built."""
+        self._on_built.append(callback)
+
+    def peek(self, name: str):
+        """The page if it has been built, None otherwise."""
+        return self._instances.get(name)
+
+    def built(self) -> list:
+        return list(self._instances.values())
+
+    def get(self, name: str):
+        """The page `name`, built and added to the stack on first use."""
+        widget = self._instances.get(name)
+        if widget is None:
+            widget = self._build(name)
+        return widget
+
+    def _build(self, name: str):
+        with startup_trace.span(name, "module"):
+            widget = self._factories[name]()
+        self._instances[name] = widget
+        placeholder = self._placeholders.pop(name, None)
+        if placeholder is None:
+            self.stack.add_named(widget, name)
+        else:
+            was_visible = self.stack.get_visible_child() is placeholder
+            position = self.stack.child_get_property(placeholder, "position")
+            self._swapping = True
+            try:
+                self.stack.remove(placeholder)
+                self.stack.add_titled(widget, name, self._titles[name])
+                self.stack.child_set_property(widget, "position", position)
+                if was_visible:
+                    self.stack.set_visible_child_full(name, Gtk.StackTransitionType.NONE)
+            finally:
+                self._swapping = False
+            placeholder.destroy()
+        widget.show_all()
+        for callback in self._on_built:
+            callback(name, widget)
+        return widget
+
+    def _on_visible_child_changed(self, stack, _param):
+        if self._swapping:
+            return
+        visible = stack.get_visible_child()
+        for name, placeholder in self._placeholders.items():
+            if visible is placeholder:
+                self.get(name)
+                break
+
+    # --- Prewarming ---
+
+    def prewarm(self, names):
+        """Build `names` in the background, one page per idle callback."""
+        self._prewarm_queue.extend(
+            name for name in names if name in self._factories and name not in self._instances
+        )
+        if self._prewarm_queue and self._prewarm_id is None:
+            self._prewarm_id = GLib.idle_add(self._prewarm_next, priority=GLib.PRIORITY_LOW)
+
+    def _prewarm_next(self):
+        while self._prewarm_queue:
+            name = self._prewarm_queue.pop(0)
+            if name not in self._instances:
+                self.get(name)
+                break
+        if self._prewarm_queue:
+            return True
+        self._prewarm_id = None
+        return False
@@ -297,6 +297,34 @@ class MonitorManager:
         """Get component instance from focused monitor."""
         return self.get_instance(self._focused_monitor_id, component)
     
+    def get_ddc_display(self, monitor_id: int):
+        """Get the DDC/CI worker (services.ddc.DdcDisplay) of a monitor, if it has one."""
+        monitor = self.get_monitor_by_id(monitor_id)
+        if monitor is None:
+            return None
+        from services.ddc import DdcManager
+
+        return DdcManager.get_initial().get_display(monitor['name'])
+
+    def get_brightness(self, monitor_id: int) -> int:
+        """Get the cached brightness of a monitor over DDC/CI in percent, -1 if unknown."""
+        display = self.get_ddc_display(monitor_id)
+        value = display.get() if display else None
+        if not value or value[1] <= 0:
+            return -1
+        return int(value[0] / value[1] * 100)
+
+    def set_brightness(self, monitor_id: int, percent: int) -> bool:
+        """Set the brightness of a monitor over DDC/CI; False if it doesn't support it."""
+        display = self.get_ddc_display(monitor_id)
+        if display is None:
+            return False
+        from services.ddc import BRIGHTNESS
+
+        maximum = (display.get() or (0, 100))[1]
+        display.set(BRIGHTNESS, round(max(0, min(percent, 100)) * maximum / 100))
+        return True
+
     def _on_monitor_focused(self, monitor_name: str, monitor_id: int, workspace_id: int):
         """Handle monitor focus change."""
         old_focused = self._focused_monitor_id
@@ -0,0 +1,124 @@
+"""
+Dominant color extraction for wallpaper thumbnails.
+
+Palettes are computed with a small k-means over the thumbnail pixels so they
+are cheap enough to run for every wallpaper in the background.
+"""
+
+import colorsys
+
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+PALETTE_SIZE = 5
+KMEANS_ITERATIONS = 8
+# Colors with less saturation than this are treated as grey
+MIN_SATURATION = 0.15
+
+# Named hues accepted by the wallpaper search ("blue", "orange", ...)
+COLOR_HUES = {
+    "red": 0,
+    "orange": 30,
+    "yellow": 55,
+    "green": 120,
+    "cyan": 180,
+    "blue": 220,
+    "purple": 275,
+    "pink": 320,
+}
+
+
+def extract_palette(image, size: int = PALETTE_SIZE) -> list:
+    """Return up to `size` dominant colors of a PIL image as hex strings, most common first."""
+    pixels = np.asarray(image.convert("RGB"), dtype=np.float32).reshape(-1, 3)
+    if len(pixels) == 0:
+        return []
+
+    # Deterministic seeding: spread initial centers over the luminance range
+    luminance = pixels @ np.array([0.299, 0.587, 0.114], dtype=np.float32)
+    order = np.argsort(luminance)
+    seeds = order[np.linspace(0, len(order) - 1, size).astype(int)]
+    centers = pixels[seeds].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        distances = ((pixels[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = distances.argmin(axis=1)
+        for i in range(size):
+            members = pixels[labels == i]
+            if len(members):
+                centers[i] = members.mean(axis=0)
+
+    counts = np.bincount(labels, minlength=size)
+    palette = []
+    for i in np.argsort(-counts):
+        if counts[i] == 0:
+            continue
+        r, g, b = (int(c) for c in centers[i].round())
+        color = f"#{r:02X}{g:02X}{b:02X}"
+        if color not in palette:
+            palette.append(color)
+    return palette
+
+
+def hex_to_hls(color: str) -> tuple:
+    """Convert '#RRGGBB' to (hue in degrees, lightness, saturation)."""
+    r, g, b = (int(color[i : i + 2], 16) / 255 for i in (1, 3, 5))
+    h, l, s = colorsys.rgb_to_hls(r, g, b)
+    return h * 360, l, s
+
+
+def pick_accent(palette: list) -> str | None:
+    """Pick the most prominent saturated color, falling back to the dominant one."""
+    if not palette:
+        return None
+    best, best_score = palette[0], -1.0
+    for rank, color in enumerate(palette):
+        _, lightness, saturation = hex_to_hls(color)
+        # Prefer common, colorful and mid-lightness colors
+        score = saturation * (1 - abs(lightness - 0.5)) / (rank + 1)
+        if score > best_score:
+            best, best_score = color, score
+    return best
+
+
+def hue_sort_key(accent: str | None) -> float:
+    """Sort key ordering wallpapers around the color wheel, greys last."""
+    if not accent:
+        return 1000.0
+    hue, lightness, saturation = hex_to_hls(accent)
+    if saturation < MIN_SATURATION:
+        return 360.0 + lightness
+    return hue
+
+
+def hue_distance(a: float, b: float) -> float:
+    diff = abs(a - b) % 360
+    return min(diff, 360 - diff)
+
+
+def palette_matches_hue(palette: list, hue: float, tolerance: float = 25) -> bool:
+    """Whether any saturated color of the palette is within `tolerance` degrees of `hue`."""
+    for color in palette:
+        color_hue, lightness, saturation = hex_to_hls(color)
+        if saturation < MIN_SATURATION or not 0.1 < lightness < 0.9:
+            continue
+        if hue_distance(color_hue, hue) <= tolerance:
+            return True
+    return False
+
+
+def parse_hue_query(query: str) -> float | None:
+    """Parse 'hue:210', '#3366ff' or a color name into a hue, or None for plain text."""
+    query = query.strip().casefold()
+    if query.startswith("hue:"):
+        try:
+            return float(query[4:]) % 360
+        except ValueError:
+            return None
+    if query.startswith("#") and len(query) == 7:
+        try:
+            return hex_to_hls(query)[0]
+        except ValueError:
+            return None
+    return COLOR_HUES.get(query)
@@ -0,0 +1,288 @@
+"""
+Cache of matugen-rendered color schemes.
+
+Rendering a scheme runs `matugen`, which re-renders every template and makes
+the shell reload its CSS. The rendered template outputs only depend on the
+source (image content or hex color), the scheme, the mode, the matugen
+config and the templates themselves, so they are stored per combination and
+swapped back in on the next apply without running matugen at all. What
+matugen did after rendering an entry (setting the wallpaper, reloading the
+apps of `reload_apps_list`, running the templates' post hooks) is stored
+with it and replayed on a hit.
+"""
+
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import threading
+from collections import OrderedDict
+
+import toml
+from fabric.utils.helpers import exec_shell_command_async
+from gi.repository import Gio, GLib
+
+import config.data as data
+
+SCHEME_CACHE_DIR = f"{data.CACHE_DIR}/schemes"
+MATUGEN_CONFIG = os.path.expanduser("~/.config/matugen/config.toml")
+MAX_ENTRIES = 64
+
+# Mode passed to matugen, and stored with every rendered entry
+DEFAULT_MODE = "dark"
+HASH_CACHE_SIZE = 256
+
+# What matugen runs for the apps of `reload_apps_list`; the commands are
+# resolved when an entry is rendered and stored with it
+RELOAD_SIGNALS = {"waybar": "SIGUSR2", "kitty": "SIGUSR1", "dunst": "SIGUSR2", "mako": "SIGUSR2"}
+
+AWWW_COMMAND = (
+    'awww img "{path}" -t outer --transition-duration 1.5 --transition-step 255 '
+    "--transition-fps 60 -f Nearest"
+)
+
+# Fallback when the matugen config can't be read
+DEFAULT_OUTPUTS = [
+    f"~/.config/{data.APP_NAME_CAP}/config/hypr/colors.conf",
+    f"~/.config/{data.APP_NAME_CAP}/styles/colors.css",
+]
+
+_lock = threading.Lock()
+_hash_cache = OrderedDict()  # path -> (mtime, size, digest), least recent first
+
+
+def _file_hash(path: str) -> str:
+    """SHA-1 of the file contents, memoized by path while its mtime and size match."""
+    st = os.stat(path)
+    cached = _hash_cache.get(path)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        _hash_cache.move_to_end(path)
+        return cached[2]
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _hash_cache[path] = (st.st_mtime_ns, st.st_size, digest)
+    _hash_cache.move_to_end(path)
+    if len(_hash_cache) > HASH_CACHE_SIZE:
+        _hash_cache.popitem(last=False)
+    return digest
+
+
+def _load_config() -> tuple[dict, str]:
+    """Return the matugen config and a hash of the whole file."""
+    try:
+        return toml.load(MATUGEN_CONFIG), _file_hash(MATUGEN_CONFIG)
+    except Exception:
+        return {}, "none"
+
+
+def _template_outputs(config: dict, config_hash: str) -> tuple[list, list, str]:
+    """Return the template output paths, their post hooks and a cache signature.
+
+    The signature covers the whole config file and the template inputs.
+    """
+    templates = config.get("templates", {})
+
+    outputs = []
+    hooks = []
+    signature = hashlib.sha1(config_hash.encode())
+    for name in sorted(templates):
+        template = templates[name]
+        output = template.get("output_path")
+        if not output:
+            continue
+        outputs.append(os.path.expanduser(output))
+        if template.get("post_hook"):
+            hooks.append(template["post_hook"])
+        input_path = os.path.expanduser(template.get("input_path", ""))
+        try:
+            mtime = os.stat(input_path).st_mtime_ns
+        except OSError:
+            mtime = 0
+        signature.update(f"{name}:{input_path}:{mtime}:{output};".encode())
+
+    if not outputs:
+        outputs = [os.path.expanduser(p) for p in DEFAULT_OUTPUTS]
+        signature.update(";".join(outputs).encode())
+    return outputs, hooks, signature.hexdigest()[:12]
+
+
+def _entry_dir(source_key: str, scheme: str, mode: str, signature: str) -> str:
+    return os.path.join(SCHEME_CACHE_DIR, f"{source_key}-{scheme}-{mode}-{signature}")
+
+
+def _restore(entry_dir: str) -> dict | None:
+    """Atomically swap cached outputs into place. Returns their post-processing, None on a miss."""
+    try:
+        with open(os.path.join(entry_dir, "manifest.json"), "r") as f:
+            manifest = json.load(f)
+        outputs = manifest["outputs"]
+        post = manifest["post"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+    for index, target in outputs.items():
+        source = os.path.join(entry_dir, index)
+        if not os.path.exists(source):
+            return None
+
+    for index, target in outputs.items():
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        tmp_path = f"{target}.ax-tmp"
+        shutil.copyfile(os.path.join(entry_dir, index), tmp_path)
+        os.replace(tmp_path, target)
+
+    # Keep recently used entries at the back of the eviction order
+    os.utime(entry_dir)
+    return post
+
+
+def _store(entry_dir: str, outputs: list, post: dict):
+    """Snapshot the freshly rendered outputs, and what followed them, into the cache."""
+    tmp_dir = f"{entry_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    stored = {}
+    for index, target in enumerate(outputs):
+        if os.path.isfile(target):
+            shutil.copyfile(target, os.path.join(tmp_dir, str(index)))
+            stored[str(index)] = target
+    with open(os.path.join(tmp_dir, "manifest.json"), "w") as f:
+        json.dump({"outputs": stored, "post": post}, f)
+    shutil.rmtree(entry_dir, ignore_errors=True)
+    os.replace(tmp_dir, entry_dir)
+    _evict()
+
+
+def _evict():
+    entries = [
+        os.path.join(SCHEME_CACHE_DIR, name)
+        for name in os.listdir(SCHEME_CACHE_DIR)
+        if not name.endswith(".tmp")
+    ]
+    if len(entries) <= MAX_ENTRIES:
+        return
+    entries.sort(key=os.path.getmtime)
+    for path in entries[: len(entries) - MAX_ENTRIES]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _reload_consumers():
+    """Reload the shell CSS when there are no post hooks to do it.
+
+    Hyprland picks up the swapped colors.conf by itself since it watches
+    sourced config files.
+    """
+    app = Gio.Application.get_default()
+    if app is not None and hasattr(app, "set_css"):
+        app.set_css()
+    return False
+
+
+def _post_processing(config: dict, hooks: list, mode: str) -> dict:
+    """What matugen did after rendering an entry with `config` in `mode`.
+
+    Stored with the entry and replayed on a cache hit: the wallpaper
+    command, the reload commands of `reload_apps_list` and the post hooks.
+    """
+    settings = config.get("config", {})
+    wallpaper = settings.get("wallpaper", {})
+    reload = []
+    apps = settings.get("reload_apps_list") or {}
+    if settings.get("reload_apps"):
+        for app, signal in RELOAD_SIGNALS.items():
+            if apps.get(app):
+                reload.append(["pkill", f"-{signal}", app])
+        if apps.get("gtk_theme"):
+            gtk_theme = ["gsettings", "set", "org.gnome.desktop.interface", "gtk-theme"]
+            reload += [[*gtk_theme, ""], [*gtk_theme, f"adw-gtk3-{mode}"]]
+    return {
+        "mode": mode,
+        "wallpaper": (
+            [wallpaper["command"], *wallpaper.get("arguments", [])]
+            if wallpaper.get("set") and wallpaper.get("command")
+            else None
+        ),
+        "reload": reload,
+        "post_hooks": hooks,
+    }
+
+
+def _replay(post: dict, wallpaper: str | None):
+    if wallpaper:
+        if post["wallpaper"]:
+            command = [*post["wallpaper"], wallpaper]
+            exec_shell_command_async(" ".join(shlex.quote(arg) for arg in command))
+        else:
+            exec_shell_command_async(AWWW_COMMAND.format(path=wallpaper))
+    for command in post["reload"]:
+        subprocess.run(command)
+    for hook in post["post_hooks"]:
+        result = subprocess.run(hook, shell=True)
+        if result.returncode != 0:
+            print(f"Post hook exited with code {result.returncode}: {hook}")
+    if not post["post_hooks"]:
+        GLib.idle_add(_reload_consumers)
+
+
+def _apply(source_key_func, matugen_args: list, scheme: str, mode: str, wallpaper: str | None):
+    with _lock:
+        try:
+            os.makedirs(SCHEME_CACHE_DIR, exist_ok=True)
+            config, config_hash = _load_config()
+            outputs, hooks, signature = _template_outputs(config, config_hash)
+            entry_dir = _entry_dir(source_key_func(), scheme, mode, signature)
+
+            # Hooks using template variables can only be run by matugen
+            cacheable = not any("{{" in hook for hook in hooks)
+            post = _restore(entry_dir) if cacheable else None
+            if post is not None:
+                print(f"Color scheme cache hit: {os.path.basename(entry_dir)}")
+                _replay(post, wallpaper)
+                return
+
+            result = subprocess.run(["matugen", *matugen_args, "-t", scheme, "-m", mode])
+            if result.returncode == 0:
+                if cacheable:
+                    _store(entry_dir, outputs, _post_processing(config, hooks, mode))
+                return
+            print(f"matugen exited with code {result.returncode}")
+        except Exception as e:
+            print(f"Error applying color scheme: {e}")
+
+        if wallpaper:
+            exec_shell_command_async(AWWW_COMMAND.format(path=wallpaper))
+
+
+def apply_image_scheme(image_path: str, scheme: str, mode: str = DEFAULT_MODE):
+    """Set `image_path` as wallpaper and apply its scheme, rendering only on a cache miss."""
+    GLib.Thread.new(
+        "scheme-cache",
+        lambda _: _apply(
+            lambda: _file_hash(image_path),
+            ["image", image_path],
+            scheme,
+            mode,
+            image_path,
+        ),
+        None,
+    )
+
+
+def apply_color_scheme(hex_color: str, scheme: str, mode: str = DEFAULT_MODE):
+    """Apply the scheme generated from `hex_color`, rendering only on a cache miss."""
+    GLib.Thread.new(
+        "scheme-cache",
+        lambda _: _apply(
+            lambda: "hex" + hex_color.lstrip("#").lower(),
+            ["color", "hex", hex_color],
+            scheme,
+            mode,
+            None,
+        ),
+        None,
+    )
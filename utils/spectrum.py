@@ -0,0 +1,112 @@
+"""
+Audio spectrum analysis for the built-in visualizer backend.
+
+Turns blocks of PCM samples into cava-like bar heights: log-spaced bands
+from an FFT, integral smoothing, gravity on falling bars and automatic
+sensitivity, all vectorized with NumPy.
+"""
+
+from utils.lazy_import import lazy_import
+
+np = lazy_import("numpy")
+
+FFT_SIZE = 2048
+# Sensitivity change per frame while auto-sensitivity adjusts
+AUTOSENS_DECREASE = 0.95
+AUTOSENS_INCREASE = 1.002
+SILENCE_LEVEL = 1e-4
+
+
+def band_edges(bars: int, rate: int, low: float, high: float, fft_size: int = FFT_SIZE):
+    """Return (start, stop) FFT bin indices of `bars` log-spaced bands.
+
+    Every band gets at least one bin, so narrow low bands are widened
+    upwards instead of collapsing onto the same bin.
+    """
+    freqs = np.fft.rfftfreq(fft_size, 1 / rate)
+    high = min(high, rate / 2)
+    edges = np.searchsorted(freqs, np.geomspace(low, high, bars + 1))
+    edges = np.maximum(edges, edges[0] + np.arange(bars + 1))
+    edges = np.minimum(edges, len(freqs))
+    return edges[:-1], np.maximum(edges[1:], edges[:-1] + 1)
+
+
+class SpectrumAnalyzer:
+    """Stateful PCM -> bar heights converter, one instance per visualizer."""
+
+    def __init__(
+        self,
+        bars: int,
+        rate: int = 44100,
+        low_cutoff: float = 50,
+        high_cutoff: float = 8000,
+        integral: float = 0.7,
+        gravity: float = 2.0,
+        framerate: int = 60,
+        autosens: bool = True,
+        sensitivity: float = 1.0,
+        fft_size: int = FFT_SIZE,
+    ):
+        self.bars = bars
+        self.fft_size = fft_size
+        self.integral = min(max(integral, 0.0), 0.99)
+        self.autosens = autosens
+        self.sensitivity = sensitivity
+
+        self._window = np.hanning(fft_size).astype(np.float32)
+        self._starts, self._stops = band_edges(bars, rate, low_cutoff, high_cutoff, fft_size)
+        freqs = np.fft.rfftfreq(fft_size, 1 / rate)
+        centers = np.sqrt(
+            freqs[self._starts].clip(min=1) * freqs[np.minimum(self._stops, len(freqs) - 1)]
+        )
+        # Music has much less energy up high; tilt the bands to look even.
+        # The magnitude of a full-scale sine with a Hann window is fft_size / 4.
+        self._weights = np.sqrt(centers / centers[0]) / (fft_size / 4)
+        # The integral filter amplifies a steady input by 1 / (1 - integral)
+        self._weights *= 1 - self.integral
+
+        # Gravity: falling bars accelerate, scaled so the fall speed doesn't
+        # depend on the frame rate
+        self._fall_step = gravity * (60 / max(framerate, 1)) ** 2 * 0.028
+
+        self._memory = np.zeros(bars, dtype=np.float32)
+        self._previous = np.zeros(bars, dtype=np.float32)
+        self._fall = np.zeros(bars, dtype=np.float32)
+        self.output = np.zeros(bars, dtype=np.float32)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Analyze the newest `fft_size` samples (floats in [-1, 1]).
+
+        Returns bar heights in [0, 1]. The same array is updated in place
+        on every call.
+        """
+        spectrum = np.abs(np.fft.rfft(samples * self._window))
+        cumulative = np.concatenate(([0.0], np.cumsum(spectrum)))
+        bands = (cumulative[self._stops] - cumulative[self._starts]) / (
+            self._stops - self._starts
+        )
+        values = bands * self._weights * self.sensitivity
+
+        # Integral smoothing
+        values += self._memory * self.integral
+        self._memory[:] = values
+
+        # Gravity
+        falling = values < self._previous
+        self._fall = np.where(falling, self._fall + self._fall_step, 0)
+        values = np.where(
+            falling,
+            np.maximum(self._previous - self._fall * self._fall, values),
+            values,
+        )
+
+        # Auto-sensitivity: back off on overshoot, creep up otherwise
+        if self.autosens:
+            if values.max(initial=0) > 1:
+                self.sensitivity *= AUTOSENS_DECREASE
+            elif np.abs(samples).max(initial=0) > SILENCE_LEVEL:
+                self.sensitivity *= AUTOSENS_INCREASE
+
+        np.clip(values, 0, 1, out=self.output)
+        self._previous[:] = self.output
+        return self.output
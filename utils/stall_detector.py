@@ -0,0 +1,147 @@
+"""
+Opt-in main-loop stall detector.
+
+Enabled with the AX_SHELL_DETECT_STALLS=1 environment variable or the
+--detect-stalls flag; AX_SHELL_STALL_MS sets the threshold (default 50 ms).
+
+A high priority heartbeat timer runs on the main loop. A sampler thread
+captures the main thread's Python stack whenever the heartbeat is late by
+more than the threshold, so a stall is attributed to the callback the main
+loop was running and to the call inside it that blocked (a subprocess, a
+file read, ...). Stalls are logged and aggregated by that pair; `stats()`
+exposes the aggregate, also as JSON through `ax_send.py stall-stats`, and
+`summary()` formats it as a table.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from gi.repository import GLib
+from loguru import logger
+
+ENV_VAR = "AX_SHELL_DETECT_STALLS"
+THRESHOLD_ENV_VAR = "AX_SHELL_STALL_MS"
+FLAG = "--detect-stalls"
+DEFAULT_THRESHOLD_MS = 50
+HEARTBEAT_MS = 10
+SUMMARY_ROWS = 15
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_enabled = False
+_threshold = DEFAULT_THRESHOLD_MS / 1000
+_main_thread_id = None
+_last_beat = 0.0
+_samples = []  # (callback, blocking call) captured during the current stall
+_stats = {}  # "callback -> blocking call" -> {"count", "total_ms", "max_ms", "stack"}
+_last_stack = {}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _describe(frame) -> str:
+    path = frame.f_code.co_filename
+    if path.startswith(REPO_DIR):
+        path = os.path.relpath(path, REPO_DIR)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def _attribute(frame):
+    """Return (callback, blocking call, stack) for a stack of the main thread.
+
+    The callback is the outermost frame of the shell below the main loop; the
+    blocking call is the innermost frame, wherever it is.
+    """
+    stack = []
+    while frame is not None:
+        stack.append(frame)
+        frame = frame.f_back
+    own = [
+        f
+        for f in stack
+        if f.f_code.co_filename.startswith(REPO_DIR)
+        and f.f_code.co_filename != os.path.abspath(__file__)
+        and f.f_code.co_name != "<module>"
+    ]
+    callback = _describe(own[-1]) if own else "unknown"
+    blocking = _describe(stack[0]) if stack else "unknown"
+    return callback, blocking, [_describe(f) for f in stack[:12]]
+
+
+def _sampler():
+    period = _threshold / 2
+    while _enabled:
+        time.sleep(period)
+        if time.monotonic() - _last_beat < _threshold:
+            continue
+        frame = sys._current_frames().get(_main_thread_id)
+        if frame is not None:
+            callback, blocking, stack = _attribute(frame)
+            _samples.append((callback, blocking))
+            _last_stack[(callback, blocking)] = stack
+        del frame
+
+
+def _heartbeat():
+    global _last_beat
+    now = time.monotonic()
+    late = now - _last_beat - HEARTBEAT_MS / 1000
+    _last_beat = now
+    if late >= _threshold:
+        samples = _samples[:]
+        del _samples[: len(samples)]
+        _record(late * 1000, samples)
+    return _enabled
+
+
+def _record(stall_ms: float, samples: list):
+    if samples:
+        callback, blocking = Counter(samples).most_common(1)[0][0]
+    else:
+        # Too short for the sampler to catch
+        callback, blocking = "unknown", "unknown"
+    key = f"{callback} -> {blocking}"
+    entry = _stats.setdefault(key, {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "stack": []})
+    entry["count"] += 1
+    entry["total_ms"] += stall_ms
+    entry["max_ms"] = max(entry["max_ms"], stall_ms)
+    entry["stack"] = _last_stack.get((callback, blocking), [])
+    logger.warning(f"Main loop stalled for {stall_ms:.0f} ms in {key}")
+
+
+def install():
+    """Start detecting stalls if requested. Call from the main thread."""
+    global _enabled, _threshold, _main_thread_id, _last_beat
+    if FLAG in sys.argv:
+        sys.argv.remove(FLAG)
+    elif os.environ.get(ENV_VAR) != "1":
+        return
+    try:
+        _threshold = float(os.environ.get(THRESHOLD_ENV_VAR, DEFAULT_THRESHOLD_MS)) / 1000
+    except ValueError:
+        logger.warning(f"Invalid {THRESHOLD_ENV_VAR}, using {DEFAULT_THRESHOLD_MS} ms")
+    _enabled = True
+    _main_thread_id = threading.get_ident()
+    _last_beat = time.monotonic()
+    GLib.timeout_add(HEARTBEAT_MS, _heartbeat, priority=GLib.PRIORITY_HIGH)
+    threading.Thread(target=_sampler, name="stall-sampler", daemon=True).start()
+    logger.info(f"Stall detector enabled, threshold {_threshold * 1000:.0f} ms")
+
+
+def stats() -> dict:
+    """Aggregated stalls by "callback -> blocking call", worst total first."""
+    return dict(sorted(_stats.items(), key=lambda item: -item[1]["total_ms"]))
+
+
+def summary(rows: int = SUMMARY_ROWS) -> str:
+    lines = [f"{'count':>6} {'total ms':>9} {'max ms':>8}  callback -> blocking call"]
+    for key, entry in list(stats().items())[:rows]:
+        lines.append(
+            f"{entry['count']:>6} {entry['total_ms']:>9.0f} {entry['max_ms']:>8.0f}  {key}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,231 @@
+"""
+Opt-in startup tracer.
+
+Enabled with the AX_SHELL_TRACE_STARTUP=1 environment variable or the
+--trace-startup flag. While enabled it records:
+
+- every module import (nested, so the cost of each dependency shows up),
+- spans wrapped with `span()`, used for component construction,
+- blocking subprocess calls,
+- the time of the first frame drawn by a window passed to `finish_on_first_frame()`.
+
+On the first frame a Chrome trace-event file (open it in chrome://tracing or
+https://ui.perfetto.dev) is written to the cache directory and a summary of
+the slowest entries is printed.
+
+This module must stay free of heavy imports: it is installed before
+anything else in main.py.
+"""
+
+import importlib.abc
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+ENV_VAR = "AX_SHELL_TRACE_STARTUP"
+FLAG = "--trace-startup"
+SUMMARY_ROWS = 25
+
+_enabled = False
+_start_ns = 0
+_events = []
+_original_subprocess = {}
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _now_us() -> float:
+    return (time.perf_counter_ns() - _start_ns) / 1000
+
+
+def _record(name: str, category: str, start_us: float, args: dict | None = None):
+    event = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start_us,
+        "dur": _now_us() - start_us,
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+    }
+    if args:
+        event["args"] = args
+    _events.append(event)
+
+
+@contextmanager
+def span(name: str, category: str = "component", **args):
+    """Record the duration of the enclosed block."""
+    if not _enabled:
+        yield
+        return
+    start = _now_us()
+    try:
+        yield
+    finally:
+        _record(name, category, start, args)
+
+
+def instant(name: str, category: str = "mark"):
+    if _enabled:
+        _events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "i",
+                "s": "g",
+                "ts": _now_us(),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+        )
+
+
+# --- Imports ---
+
+
+class _TimedLoader(importlib.abc.Loader):
+    def __init__(self, loader, fullname):
+        self._loader = loader
+        self._fullname = fullname
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = _now_us()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            _record(self._fullname, "import", start)
+
+    def __getattr__(self, name):
+        # get_resource_reader, is_package, ... of the wrapped loader
+        return getattr(self._loader, name)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimedLoader(spec.loader, fullname)
+                return spec
+        return None
+
+
+# --- Blocking subprocesses ---
+
+
+def _wrap_subprocess(name):
+    original = getattr(subprocess, name)
+    _original_subprocess[name] = original
+
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return original(*args, **kwargs)
+        command = args[0] if args else kwargs.get("args", "")
+        if not isinstance(command, str):
+            command = " ".join(str(part) for part in command)
+        with span(command.split(" ")[0] or name, "subprocess", call=name, command=command):
+            return original(*args, **kwargs)
+
+    setattr(subprocess, name, wrapper)
+
+
+# --- Lifecycle ---
+
+
+def install():
+    """Start tracing if requested. Call before importing the rest of the shell."""
+    global _enabled, _start_ns
+    if FLAG in sys.argv:
+        sys.argv.remove(FLAG)
+    elif os.environ.get(ENV_VAR) != "1":
+        return
+    _enabled = True
+    _start_ns = time.perf_counter_ns()
+    sys.meta_path.insert(0, _ImportTimer())
+    for name in ("run", "call", "check_call", "check_output", "getoutput"):
+        _wrap_subprocess(name)
+
+
+def _uninstall():
+    global _enabled
+    _enabled = False
+    sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _ImportTimer)]
+    for name, original in _original_subprocess.items():
+        setattr(subprocess, name, original)
+    _original_subprocess.clear()
+
+
+def finish_on_first_frame(window):
+    """Write the trace once `window` has drawn its first frame."""
+    if not _enabled:
+        return
+    handler_id = None
+
+    def on_draw(*_):
+        window.disconnect(handler_id)
+        instant("first frame")
+        # Let the frame finish before writing anything
+        from gi.repository import GLib
+
+        GLib.idle_add(finish)
+        return False
+
+    handler_id = window.connect("draw", on_draw)
+
+
+def finish():
+    if not _enabled:
+        return False
+    _uninstall()
+    from config.data import CACHE_DIR
+
+    path = os.path.join(CACHE_DIR, "startup-trace.json")
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": _events, "displayTimeUnit": "ms"}, f)
+    except Exception as e:
+        print(f"Error writing startup trace: {e}")
+        path = None
+    print(summary())
+    if path:
+        print(f"Startup trace written to {path}")
+    return False
+
+
+def summary(rows: int = SUMMARY_ROWS) -> str:
+    """Table of the slowest spans, with totals per category."""
+    spans = [e for e in _events if e["ph"] == "X"]
+    first_frame = next((e["ts"] for e in _events if e["name"] == "first frame"), None)
+    totals = {}
+    ends = {}
+    for event in sorted(spans, key=lambda e: e["ts"]):
+        # Nested spans (e.g. imports of imports) are part of their parent
+        if event["ts"] < ends.get(event["cat"], -1):
+            continue
+        ends[event["cat"]] = event["ts"] + event["dur"]
+        totals[event["cat"]] = totals.get(event["cat"], 0) + event["dur"]
+
+    lines = ["Startup trace summary"]
+    if first_frame is not None:
+        lines.append(f"  first frame after {first_frame / 1000:.1f} ms")
+    for category, total in sorted(totals.items(), key=lambda item: -item[1]):
+        lines.append(f"  {category:<12} {total / 1000:>9.1f} ms total")
+    lines.append("")
+    lines.append(f"  {'ms':>9}  {'category':<12} name")
+    for event in sorted(spans, key=lambda e: -e["dur"])[:rows]:
+        lines.append(f"  {event['dur'] / 1000:>9.1f}  {event['cat']:<12} {event['name']}")
+    return "\n".join(lines)
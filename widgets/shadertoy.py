@@ -1,3 +1,5 @@
+import time
+from collections import deque
 from collections.abc import Iterable
 from enum import Enum
 from typing import Literal, cast, overload
@@ -24,6 +26,18 @@ class ShadertoyCompileError(Exception): ...
 
 
 class Shadertoy(Gtk.GLArea, Widget):
+    """Shadertoy-compatible GL widget.
+
+    Rendering is scheduled from the frame clock and only while the widget is
+    mapped. `max_fps` caps the frame rate, `static` renders only when the
+    shader, the size or a uniform changes (see `queue_render`), and
+    `render_scale` renders at a fraction of the resolution and upscales the
+    result. `get_frame_stats` reports how long frames take to render.
+    """
+
+    # number of recent frames kept for the statistics
+    FRAME_STATS_SIZE = 120
+
     @Signal  # pygobject signal
     def ready(self) -> None: ...
 
@@ -105,6 +119,10 @@ class Shadertoy(Gtk.GLArea, Widget):
         h_expand: bool = False,
         v_expand: bool = False,
         size: Iterable[int] | int | None = None,
+        max_fps: float | None = None,
+        static: bool = False,
+        render_scale: float = 1.0,
+        sync_frame_stats: bool = False,
         **kwargs,
     ):
         Gtk.GLArea.__init__(
@@ -145,9 +163,78 @@ class Shadertoy(Gtk.GLArea, Widget):
         self._frame_time = self._start_time
         self._frame_count = 0
 
-        # to avoid a constant framerate we tell
-        # gtk to render a frame whenever possible
-        self._tick_id = self.add_tick_callback(lambda *_: (self.queue_draw(), True)[1])
+        # render scheduling
+        self._max_fps = max_fps
+        self._static = static
+        self._render_scale = min(max(render_scale, 0.1), 1.0)
+        self._paused = False
+        self._last_frame_time = 0.0
+        self._tick_id = 0
+        self._viewport = (0, 0)
+        self._scaled_fbo = None
+        self._scaled_texture = None
+        self._scaled_size = (0, 0)
+
+        # frame statistics, glFinish makes them include the GPU (or llvmpipe) work
+        self._sync_frame_stats = sync_frame_stats
+        self._render_times = deque(maxlen=self.FRAME_STATS_SIZE)
+        self._render_timestamps = deque(maxlen=self.FRAME_STATS_SIZE)
+
+        # the frame clock stops ticking for unmapped (and, on most
+        # compositors, occluded) surfaces, so rendering pauses with it
+        self.connect("map", lambda *_: self._update_tick())
+        self.connect("unmap", lambda *_: self._update_tick())
+
+    def _update_tick(self):
+        should_tick = (
+            self.get_mapped() and not self._paused and not self._static and self._program
+        )
+        if should_tick and not self._tick_id:
+            self._tick_id = self.add_tick_callback(self.do_handle_tick)
+        elif not should_tick and self._tick_id:
+            self.remove_tick_callback(self._tick_id)
+            self._tick_id = 0
+        return
+
+    def do_handle_tick(self, widget, frame_clock: Gdk.FrameClock):
+        if self._max_fps:
+            frame_time = frame_clock.get_frame_time() / 1e6
+            # a little slack so vsync jitter doesn't halve the frame rate
+            if frame_time - self._last_frame_time < 0.9 / self._max_fps:
+                return True
+            self._last_frame_time = frame_time
+        self.queue_draw()
+        return True
+
+    def set_paused(self, paused: bool):
+        """Stop or resume continuous rendering (e.g. while covered or on battery)."""
+        self._paused = paused
+        self._update_tick()
+        return
+
+    def set_max_fps(self, max_fps: float | None):
+        self._max_fps = max_fps
+        return
+
+    def queue_render(self):
+        """Render one frame, e.g. after changing a uniform of a static shader."""
+        self.queue_draw()
+        return
+
+    def get_frame_stats(self) -> dict:
+        """Render time statistics (in milliseconds) over the recent frames."""
+        times = sorted(self._render_times)
+        if not times:
+            return {"frames": self._frame_count, "fps": 0.0}
+        stamps = self._render_timestamps
+        span = stamps[-1] - stamps[0]
+        return {
+            "frames": self._frame_count,
+            "fps": (len(stamps) - 1) / span if span > 0 else 0.0,
+            "mean_ms": sum(times) / len(times) * 1000,
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))] * 1000,
+            "max_ms": times[-1] * 1000,
+        }
 
     def do_bake_program(self):
         try:
@@ -217,6 +304,7 @@ class Shadertoy(Gtk.GLArea, Widget):
             self.set_uniform(uname, utype, uvalue)  # type: ignore
 
         self._ready = True
+        self._update_tick()
         self.ready()
         return
 
@@ -230,23 +318,68 @@ class Shadertoy(Gtk.GLArea, Widget):
         self._frame_count += 1
         return
 
+    def do_ensure_scaled_target(self, width: int, height: int):
+        if self._scaled_fbo is None:
+            self._scaled_fbo = GL.glGenFramebuffers(1)
+            self._scaled_texture = GL.glGenTextures(1)
+        if self._scaled_size == (width, height):
+            return
+        GL.glBindTexture(GL.GL_TEXTURE_2D, self._scaled_texture)
+        GL.glTexImage2D(
+            GL.GL_TEXTURE_2D,
+            0,
+            GL.GL_RGBA8,
+            width,
+            height,
+            0,
+            GL.GL_RGBA,
+            GL.GL_UNSIGNED_BYTE,
+            None,
+        )
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MIN_FILTER, GL.GL_LINEAR)
+        GL.glTexParameteri(GL.GL_TEXTURE_2D, GL.GL_TEXTURE_MAG_FILTER, GL.GL_LINEAR)
+        GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._scaled_fbo)
+        GL.glFramebufferTexture2D(
+            GL.GL_FRAMEBUFFER,
+            GL.GL_COLOR_ATTACHMENT0,
+            GL.GL_TEXTURE_2D,
+            self._scaled_texture,
+            0,
+        )
+        self._scaled_size = (width, height)
+        return
+
     def do_render(self, ctx: Gdk.GLContext):
         if not self._program:
-            if self._tick_id:
-                self.remove_tick_callback(self._tick_id)
-            self._tick_id = 0
+            self._update_tick()
             return False
 
+        render_start = time.perf_counter()
         GL.glUseProgram(self._program)
 
-        # clear up for next frame
-        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
-
         alloc = self.get_allocation()
         width: int = alloc.width  # type: ignore
         height: int = alloc.height  # type: ignore
         mouse_pos = cast(tuple[int, int], self.get_pointer())
 
+        # render into a smaller texture, then upscale it into the area
+        scaled = self._render_scale < 1.0 and all(self._viewport)
+        if scaled:
+            target_fbo = GL.glGetIntegerv(GL.GL_DRAW_FRAMEBUFFER_BINDING)
+            scaled_width = max(1, int(self._viewport[0] * self._render_scale))
+            scaled_height = max(1, int(self._viewport[1] * self._render_scale))
+            self.do_ensure_scaled_target(scaled_width, scaled_height)
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, self._scaled_fbo)
+            GL.glViewport(0, 0, scaled_width, scaled_height)
+            mouse_pos = (
+                mouse_pos[0] * scaled_width / max(width, 1),
+                mouse_pos[1] * scaled_height / max(height, 1),
+            )
+            width, height = scaled_width, scaled_height
+
+        # clear up for next frame
+        GL.glClear(GL.GL_COLOR_BUFFER_BIT)
+
         current_time, delta_time, frame_rate = self.do_get_timing()
 
         self.set_uniform(
@@ -267,12 +400,35 @@ class Shadertoy(Gtk.GLArea, Widget):
         # paint the quad
         GL.glBindVertexArray(self._vao)
         GL.glDrawArrays(GL.GL_TRIANGLE_STRIP, 0, 4)
+
+        if scaled:
+            GL.glBindFramebuffer(GL.GL_READ_FRAMEBUFFER, self._scaled_fbo)
+            GL.glBindFramebuffer(GL.GL_DRAW_FRAMEBUFFER, target_fbo)
+            GL.glBlitFramebuffer(
+                0,
+                0,
+                width,
+                height,
+                0,
+                0,
+                *self._viewport,
+                GL.GL_COLOR_BUFFER_BIT,
+                GL.GL_LINEAR,
+            )
+            GL.glBindFramebuffer(GL.GL_FRAMEBUFFER, target_fbo)
+            GL.glViewport(0, 0, *self._viewport)
+
+        if self._sync_frame_stats:
+            GL.glFinish()
+        self._render_times.append(time.perf_counter() - render_start)
+        self._render_timestamps.append(current_time)
         self.do_post_render(current_time)
         return True
 
     def do_resize(self, width: int, height: int):
         Gtk.GLArea.do_resize(self, width, height)
         GL.glViewport(0, 0, width, height)
+        self._viewport = (width, height)
         return
 
     @overload